@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Literal, TypeVar
+
+log = logging.getLogger("verbal-bot.breaker")
+
+T = TypeVar("T")
+State = Literal["closed", "open", "half_open"]
+
+
+class ServiceUnavailable(Exception):
+    """An external service is down or too slow; callers should show a friendly notice."""
+
+    def __init__(self, service: str, reason: str) -> None:
+        super().__init__(f"{service} unavailable: {reason}")
+        self.service = service
+        self.reason = reason
+
+
+class CircuitOpen(ServiceUnavailable):
+    def __init__(self, service: str, retry_after: float) -> None:
+        super().__init__(service, f"circuit open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails fast after repeated errors instead of waiting on a dead service.
+
+    - closed: calls go through; `failure_threshold` consecutive failures open it.
+    - open: calls raise `CircuitOpen` immediately for `reset_timeout` seconds.
+    - half_open: one probe call is let through; success closes the circuit,
+      failure opens it again.
+
+    Every call is bounded by `timeout`; a timeout counts as a failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        timeout: float = 5.0,
+        is_failure: Callable[[BaseException], bool] = lambda exc: True,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timeout = timeout
+        self.is_failure = is_failure
+
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+        self.calls = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> State:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def _admit(self) -> None:
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        retry_after = self.reset_timeout - (time.monotonic() - (self._opened_at or 0))
+        raise CircuitOpen(self.name, max(retry_after, 0.0))
+
+    def _record_success(self) -> None:
+        if self._opened_at is not None:
+            log.info("%s circuit closed", self.name)
+        self._failures = 0
+        self._opened_at = None
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                self.trips += 1
+                log.warning("%s circuit opened after %d failures", self.name, self._failures)
+            # A failed half-open probe restarts the cool-down
+            self._opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[[], Awaitable[T]], timeout: float | None = None) -> T:
+        """Runs `fn()` under the breaker. Raises `ServiceUnavailable` on open circuit or timeout."""
+        self._admit()
+        self.calls += 1
+        probing = self._probing
+        try:
+            result = await asyncio.wait_for(fn(), timeout or self.timeout)
+        except asyncio.TimeoutError as exc:
+            self.timeouts += 1
+            self._record_failure()
+            raise ServiceUnavailable(self.name, "timed out") from exc
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if self.is_failure(exc):
+                self._record_failure()
+            else:
+                self._record_success()
+            raise
+        else:
+            self._record_success()
+            return result
+        finally:
+            if probing:
+                self._probing = False
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "trips": self.trips,
+        }
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+from typing import Any, Callable, Optional
+
+log = logging.getLogger("verbal-bot.charts")
+
+
+# ===== RENDERERS (run inside worker processes) =====
+
+
+def _new_figure(width: float, height: float):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(width, height), dpi=100)
+    return plt, fig, ax
+
+
+def _to_png(plt, fig) -> bytes:
+    import io
+
+    buf = io.BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def _render_poll_results(title: str, labels: list[str], counts: list[int], color: int) -> bytes:
+    plt, fig, ax = _new_figure(8, max(2.0, 0.5 * len(labels) + 1))
+    hex_color = f"#{color:06x}"
+    # Horizontal bars, first option on top
+    positions = list(range(len(labels)))[::-1]
+    ax.barh(positions, counts, color=hex_color)
+    ax.set_yticks(positions)
+    ax.set_yticklabels([lbl[:40] for lbl in labels])
+    ax.set_xlabel("Votes")
+    ax.set_title(title[:80])
+    ax.xaxis.get_major_locator().set_params(integer=True)
+    for pos, count in zip(positions, counts):
+        ax.text(count, pos, f" {count}", va="center")
+    return _to_png(plt, fig)
+
+
+def _render_weekly_trend(title: str, weeks: list[str], counts: list[int], color: int) -> bytes:
+    plt, fig, ax = _new_figure(8, 3.5)
+    hex_color = f"#{color:06x}"
+    ax.plot(weeks, counts, marker="o", color=hex_color)
+    ax.fill_between(weeks, counts, alpha=0.15, color=hex_color)
+    ax.set_ylabel("Warnings")
+    ax.set_title(title[:80])
+    ax.set_ylim(bottom=0)
+    ax.yaxis.get_major_locator().set_params(integer=True)
+    ax.tick_params(axis="x", labelrotation=45)
+    return _to_png(plt, fig)
+
+
+# ===== SERVICE =====
+
+
+class ChartRenderer:
+    """Renders PNG charts in a process pool and caches the bytes by input hash.
+
+    Rendering never runs on the event loop. Identical inputs are served from
+    the cache, and concurrent requests for the same chart share one render.
+    """
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 128) -> None:
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.available = find_spec("matplotlib") is not None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+        self.renders = 0
+        self.cache_hits = 0
+
+        if not self.available:
+            log.warning("matplotlib is not installed; charts are disabled")
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, not fork: the bot process has live event-loop and sqlite threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    @staticmethod
+    def _key(kind: str, payload: dict[str, Any]) -> str:
+        raw = json.dumps([kind, payload], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def _render(self, kind: str, fn: Callable[..., bytes], payload: dict[str, Any]) -> Optional[bytes]:
+        if not self.available:
+            return None
+
+        key = self._key(kind, payload)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.cache_hits += 1
+            try:
+                return await asyncio.shield(pending)
+            except Exception:
+                return None
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bytes] = loop.run_in_executor(self.pool, _call, fn, payload)  # type: ignore[assignment]
+        self._inflight[key] = future
+        try:
+            png = await asyncio.shield(future)
+        except Exception:
+            log.exception("Chart render failed (%s)", kind)
+            return None
+        finally:
+            self._inflight.pop(key, None)
+
+        self.renders += 1
+        self._cache[key] = png
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return png
+
+    async def poll_results(
+        self, title: str, labels: list[str], counts: list[int], color: int
+    ) -> Optional[bytes]:
+        return await self._render(
+            "poll",
+            _render_poll_results,
+            {"title": title, "labels": labels, "counts": counts, "color": color},
+        )
+
+    async def weekly_trend(
+        self, title: str, weeks: list[str], counts: list[int], color: int
+    ) -> Optional[bytes]:
+        return await self._render(
+            "trend",
+            _render_weekly_trend,
+            {"title": title, "weeks": weeks, "counts": counts, "color": color},
+        )
+
+
+def _call(fn: Callable[..., bytes], payload: dict[str, Any]) -> bytes:
+    return fn(**payload)
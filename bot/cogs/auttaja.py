@@ -1,67 +1,142 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
-from collections import Counter
-from typing import Literal
+import functools
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Literal, TypeVar
 
+import aiosqlite
 import discord
+import httpx
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
+from postgrest.exceptions import APIError
 from supabase import AsyncClient, acreate_client
 
-from bot.ui import PagedEmbedsView
+from bot.breaker import CircuitBreaker, ServiceUnavailable
+from bot.ui import StreamPagedView
+
+log = logging.getLogger("verbal-bot.auttaja")
+
+T = TypeVar("T")
 
 
 # ===== DATA CLASSES =====
 
 
+def _parse_timestamp(raw_ts: object) -> datetime.datetime | None:
+    # timestamp is stored as epoch_time float in Supabase (or as ISO string)
+    if isinstance(raw_ts, (int, float)):
+        return datetime.datetime.fromtimestamp(raw_ts, tz=datetime.timezone.utc)
+    if isinstance(raw_ts, str):
+        try:
+            return datetime.datetime.fromisoformat(raw_ts)
+        except ValueError:
+            return None
+    if isinstance(raw_ts, dict) and "epoch_time" in raw_ts:
+        # RethinkDB-style export artefact that survived into Supabase
+        return datetime.datetime.fromtimestamp(raw_ts["epoch_time"], tz=datetime.timezone.utc)
+    return None
+
+
+_UNSET = object()
+
+
+def _epoch_seconds(raw_ts: object) -> float | None:
+    """Like `_parse_timestamp(...).timestamp()`, without building a datetime for the common float case."""
+    if type(raw_ts) is float or type(raw_ts) is int:
+        return float(raw_ts)  # type: ignore[arg-type]
+    ts = _parse_timestamp(raw_ts)
+    return ts.timestamp() if ts else None
+
+
+def _normalise_action(action: str | None) -> str:
+    """The breakdown key for an action, as the mirror and the Supabase function group them."""
+    return (action or "unknown").lower()
+
+
 class AuttajaPunishment:
-    """Mirrors the `public.punishments` Supabase table."""
-
-    __slots__ = (
-        "id",
-        "guild_id",
-        "offender",
-        "punisher",
-        "reason",
-        "action",
-        "timestamp",
-        "duration",
-        "deleted",
-        "removed_by",
-        "removed_reason",
-        "resolve",
-    )
+    """Mirrors the `public.punishments` Supabase table.
+
+    Wraps the raw row and decodes fields on access; only the few rows on
+    the current page are ever rendered, so most are never decoded at all.
+    The parsed timestamp is cached after first use.
+    """
+
+    __slots__ = ("_row", "_timestamp")
 
     def __init__(self, row: dict) -> None:
-        self.id: str = str(row.get("id", ""))
-        self.guild_id: str = str(row.get("guild_id", ""))
-        self.offender: str = str(row.get("offender", ""))
-        self.punisher: str = str(row.get("punisher", ""))
-        self.reason: str = row.get("reason") or ""
-        self.action: str = row.get("action") or "unknown"
-        self.duration: str = str(row.get("duration") or "0")
-        self.deleted: bool | None = row.get("deleted")
-        self.removed_by: str | None = row.get("removed_by")
-        self.removed_reason: str | None = row.get("removed_reason")
-        self.resolve: str | None = row.get("resolve")
-
-        # timestamp is stored as epoch_time float in Supabase (or as ISO string)
-        raw_ts = row.get("timestamp")
-        if isinstance(raw_ts, (int, float)):
-            self.timestamp = datetime.datetime.fromtimestamp(raw_ts, tz=datetime.timezone.utc)
-        elif isinstance(raw_ts, str):
-            try:
-                self.timestamp = datetime.datetime.fromisoformat(raw_ts)
-            except ValueError:
-                self.timestamp = None  # type: ignore[assignment]
-        elif isinstance(raw_ts, dict) and "epoch_time" in raw_ts:
-            # RethinkDB-style export artefact that survived into Supabase
-            self.timestamp = datetime.datetime.fromtimestamp(
-                raw_ts["epoch_time"], tz=datetime.timezone.utc
-            )
-        else:
-            self.timestamp = None  # type: ignore[assignment]
+        self._row = row
+        self._timestamp: object = _UNSET
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> list[AuttajaPunishment]:
+        """Wraps many rows at once, skipping the per-instance `__init__` call."""
+        new = object.__new__
+        out = []
+        for row in rows:
+            p = new(cls)
+            p._row = row
+            p._timestamp = _UNSET
+            out.append(p)
+        return out
+
+    @property
+    def id(self) -> str:
+        return str(self._row.get("id", ""))
+
+    @property
+    def guild_id(self) -> str:
+        return str(self._row.get("guild_id", ""))
+
+    @property
+    def offender(self) -> str:
+        return str(self._row.get("offender", ""))
+
+    @property
+    def punisher(self) -> str:
+        return str(self._row.get("punisher", ""))
+
+    @property
+    def reason(self) -> str:
+        return self._row.get("reason") or ""
+
+    @property
+    def action(self) -> str:
+        return self._row.get("action") or "unknown"
+
+    @property
+    def duration(self) -> str:
+        return str(self._row.get("duration") or "0")
+
+    @property
+    def deleted(self) -> bool | None:
+        return self._row.get("deleted")
+
+    @property
+    def removed_by(self) -> str | None:
+        return self._row.get("removed_by")
+
+    @property
+    def removed_reason(self) -> str | None:
+        return self._row.get("removed_reason")
+
+    @property
+    def resolve(self) -> str | None:
+        return self._row.get("resolve")
+
+    @property
+    def timestamp(self) -> datetime.datetime | None:
+        if self._timestamp is _UNSET:
+            self._timestamp = _parse_timestamp(self._row.get("timestamp"))
+        return self._timestamp  # type: ignore[return-value]
+
+    @property
+    def epoch(self) -> float | None:
+        return _epoch_seconds(self._row.get("timestamp"))
 
     @property
     def ts_str(self) -> str:
@@ -89,19 +164,450 @@ class AuttajaPunishment:
         return " ".join(parts) if parts else "0s"
 
 
+# ===== LOCAL MIRROR =====
+
+
+_MIRROR_COLUMNS = (
+    "id",
+    "guild_id",
+    "offender",
+    "punisher",
+    "reason",
+    "action",
+    "timestamp",
+    "duration",
+    "deleted",
+    "removed_by",
+    "removed_reason",
+    "resolve",
+)
+
+
+# Full scans catch edits/removals made directly in Supabase, which the id watermark misses
+MIRROR_RECONCILE_INTERVAL = datetime.timedelta(hours=6)
+
+
+def _row_to_mirror(row: dict) -> tuple:
+    return (
+        int(row["id"]),
+        str(row.get("guild_id", "")),
+        str(row.get("offender", "")),
+        str(row.get("punisher", "")),
+        row.get("reason"),
+        row.get("action"),
+        _epoch_seconds(row.get("timestamp")),
+        None if row.get("duration") is None else str(row.get("duration")),
+        None if row.get("deleted") is None else int(bool(row.get("deleted"))),
+        row.get("removed_by"),
+        row.get("removed_reason"),
+        row.get("resolve"),
+    )
+
+
+def _mirror_to_row(row: aiosqlite.Row) -> dict:
+    out = dict(row)
+    if out["deleted"] is not None:
+        out["deleted"] = bool(out["deleted"])
+    return out
+
+
+class AuttajaMirror:
+    """Local SQLite copy of the Supabase `punishments` table.
+
+    Kept current by `sync_incremental()` (new rows past an id watermark,
+    fetched in `.range()` pages) and `reconcile()` (a full scan, paged by id
+    the same way, that also picks up edits and removals made directly in
+    Supabase). Both fetch
+    through `AuttajaDB._execute`, so they share its timeout and breaker.
+    """
+
+    PAGE_SIZE = 1000
+
+    def __init__(self, path: str = "auttaja_mirror.db") -> None:
+        self.path = path
+        self._conn: aiosqlite.Connection | None = None
+        self.watermark = 0
+        self.last_sync_at: datetime.datetime | None = None
+        self.last_full_sync_at: datetime.datetime | None = None
+
+    async def connect(self) -> None:
+        self._conn = await aiosqlite.connect(self.path)
+        self._conn.row_factory = aiosqlite.Row
+        await self._conn.execute("PRAGMA journal_mode = WAL;")
+        await self._conn.execute("PRAGMA synchronous = NORMAL;")
+        await self._conn.commit()
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    @property
+    def conn(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            raise RuntimeError("AuttajaMirror is not connected")
+        return self._conn
+
+    @property
+    def ready(self) -> bool:
+        """True once a full reconciliation has completed; until then reads go to Supabase."""
+        return self.last_full_sync_at is not None
+
+    @property
+    def lag(self) -> datetime.timedelta | None:
+        if self.last_sync_at is None:
+            return None
+        return datetime.datetime.now(datetime.timezone.utc) - self.last_sync_at
+
+    async def init_schema(self) -> None:
+        await self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS auttaja_punishments (
+                id             INTEGER PRIMARY KEY,
+                guild_id       TEXT    NOT NULL DEFAULT '',
+                offender       TEXT    NOT NULL DEFAULT '',
+                punisher       TEXT    NOT NULL DEFAULT '',
+                reason         TEXT,
+                action         TEXT,
+                timestamp      REAL,
+                duration       TEXT,
+                deleted        INTEGER,
+                removed_by     TEXT,
+                removed_reason TEXT,
+                resolve        TEXT
+            )
+            """
+        )
+        await self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS auttaja_sync_state (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+            """
+        )
+        await self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ap_offender ON auttaja_punishments(offender, timestamp)"
+        )
+        await self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ap_punisher ON auttaja_punishments(punisher, timestamp)"
+        )
+        await self.conn.commit()
+
+        cur = await self.conn.execute("SELECT key, value FROM auttaja_sync_state")
+        state = {r["key"]: r["value"] for r in await cur.fetchall()}
+        self.watermark = int(state.get("watermark", 0))
+        if "last_sync_at" in state:
+            self.last_sync_at = datetime.datetime.fromisoformat(state["last_sync_at"])
+        if "last_full_sync_at" in state:
+            self.last_full_sync_at = datetime.datetime.fromisoformat(state["last_full_sync_at"])
+
+    async def _save_state(self) -> None:
+        state = {"watermark": str(self.watermark)}
+        if self.last_sync_at is not None:
+            state["last_sync_at"] = self.last_sync_at.isoformat()
+        if self.last_full_sync_at is not None:
+            state["last_full_sync_at"] = self.last_full_sync_at.isoformat()
+        await self.conn.executemany(
+            "INSERT OR REPLACE INTO auttaja_sync_state (key, value) VALUES (?, ?)",
+            list(state.items()),
+        )
+        await self.conn.commit()
+
+    async def upsert_rows(self, rows: list[dict]) -> None:
+        await self.conn.executemany(
+            f"INSERT OR REPLACE INTO auttaja_punishments ({', '.join(_MIRROR_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _MIRROR_COLUMNS)})",
+            [_row_to_mirror(r) for r in rows],
+        )
+
+    async def apply_update(self, punishment_id: str, fields: dict[str, str]) -> None:
+        """Write-through for edits made by the bot itself."""
+        assignments = ", ".join(f"{col} = ?" for col in fields)
+        await self.conn.execute(
+            f"UPDATE auttaja_punishments SET {assignments} WHERE id = ?",
+            (*fields.values(), int(punishment_id)),
+        )
+        await self.conn.commit()
+
+    # ---- sync ----
+
+    async def sync_incremental(self, db: AuttajaDB) -> int:
+        """Pulls rows with id above the watermark. Returns the number of new rows."""
+        fetched = 0
+        while True:
+            response = await db._execute(
+                db.client.table(db.TABLE)
+                .select("*")
+                .gt("id", self.watermark)
+                .order("id")
+                .range(0, self.PAGE_SIZE - 1)
+            )
+            rows = response.data or []
+            if rows:
+                await self.upsert_rows(rows)
+                self.watermark = max(self.watermark, max(int(r["id"]) for r in rows))
+                fetched += len(rows)
+            self.last_sync_at = datetime.datetime.now(datetime.timezone.utc)
+            await self._save_state()
+            if len(rows) < self.PAGE_SIZE:
+                return fetched
+
+    async def reconcile(self, db: AuttajaDB) -> int:
+        """Full paged scan: upserts every row and drops local rows gone from Supabase."""
+        seen: set[int] = set()
+        last_id = 0
+        while True:
+            # Keyset pages: rows deleted upstream mid-scan can't shift later pages and hide live rows
+            response = await db._execute(
+                db.client.table(db.TABLE)
+                .select("*")
+                .gt("id", last_id)
+                .order("id")
+                .range(0, self.PAGE_SIZE - 1)
+            )
+            rows = response.data or []
+            if rows:
+                await self.upsert_rows(rows)
+                await self.conn.commit()
+                seen.update(int(r["id"]) for r in rows)
+                last_id = max(int(r["id"]) for r in rows)
+                self.watermark = max(self.watermark, last_id)
+            if len(rows) < self.PAGE_SIZE:
+                break
+
+        cur = await self.conn.execute("SELECT id FROM auttaja_punishments")
+        stale = [(r["id"],) for r in await cur.fetchall() if r["id"] not in seen]
+        if stale:
+            await self.conn.executemany("DELETE FROM auttaja_punishments WHERE id = ?", stale)
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.last_sync_at = now
+        self.last_full_sync_at = now
+        await self._save_state()
+        return len(seen)
+
+    # ---- reads ----
+
+    async def count(self) -> int:
+        cur = await self.conn.execute("SELECT COUNT(*) FROM auttaja_punishments")
+        row = await cur.fetchone()
+        return int(row[0])
+
+    async def search(
+        self,
+        role: Literal["offender", "punisher"],
+        user_id: str,
+        include_removed: bool = True,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[dict]:
+        removed = "" if include_removed else " AND (deleted IS NULL OR deleted = 0)"
+        cur = await self.conn.execute(
+            f"SELECT * FROM auttaja_punishments WHERE {role} = ?{removed} "
+            "ORDER BY timestamp DESC NULLS FIRST, id DESC LIMIT ? OFFSET ?",
+            (user_id, -1 if limit is None else limit, offset),
+        )
+        return [_mirror_to_row(r) for r in await cur.fetchall()]
+
+    async def get(self, punishment_id: str) -> dict | None:
+        if not punishment_id.isdigit():
+            return None
+        cur = await self.conn.execute(
+            "SELECT * FROM auttaja_punishments WHERE id = ?", (int(punishment_id),)
+        )
+        row = await cur.fetchone()
+        return _mirror_to_row(row) if row else None
+
+    async def breakdown(self, role: Literal["offender", "punisher"], user_id: str) -> tuple[dict[str, int], int]:
+        cur = await self.conn.execute(
+            f"SELECT LOWER(COALESCE(NULLIF(action, ''), 'unknown')) AS action, COUNT(*) AS cnt, "
+            f"SUM(deleted = 1) AS removed FROM auttaja_punishments WHERE {role} = ? GROUP BY 1",
+            (user_id,),
+        )
+        rows = await cur.fetchall()
+        return {r["action"]: int(r["cnt"]) for r in rows}, sum(int(r["removed"] or 0) for r in rows)
+
+    async def leaderboard(
+        self, role: Literal["offender", "punisher"], limit: int | None = None, offset: int = 0
+    ) -> tuple[list[tuple[str, int]], int]:
+        cur = await self.conn.execute(
+            f"SELECT {role} AS user_id, COUNT(*) AS cnt, COUNT(*) OVER () AS total_users "
+            f"FROM auttaja_punishments WHERE {role} != '' GROUP BY {role} "
+            "ORDER BY cnt DESC, user_id LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset),
+        )
+        rows = await cur.fetchall()
+        if not rows and offset:
+            cur = await self.conn.execute(
+                f"SELECT COUNT(DISTINCT {role}) FROM auttaja_punishments WHERE {role} != ''"
+            )
+            return [], int((await cur.fetchone())[0])
+        total = int(rows[0]["total_users"]) if rows else 0
+        return [(str(r["user_id"]), int(r["cnt"])) for r in rows], total
+
+
+# ===== QUERY CACHE =====
+
+
+class _QueryCache:
+    """TTL cache for Supabase reads with request coalescing and stale-while-revalidate.
+
+    Keys are tuples of `(kind, subject, *args)`, where `subject` is the user
+    ID (or punishment ID) the query is about, so edits can invalidate by it.
+    Entries are only evicted by size, so an expired one can still stand in
+    when a reload fails with `ServiceUnavailable`.
+
+    - Fresh entries (younger than `ttl`) are returned as-is.
+    - Stale entries (younger than `ttl + stale_ttl`) are returned immediately
+      while one background task reloads them.
+    - Concurrent misses for the same key share one in-flight load.
+    """
+
+    def __init__(self, ttl: float = 60, stale_ttl: float = 300, max_size: int = 1000) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        # key -> (loaded_at, value)
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._refreshes: set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+
+    async def get_or_load(self, key: tuple, loader: Callable[[], Awaitable[T]]) -> T:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]  # type: ignore[return-value]
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    task = asyncio.create_task(self._refresh(key, loader))
+                    self._refreshes.add(task)
+                    task.add_done_callback(self._refreshes.discard)
+                return entry[1]  # type: ignore[return-value]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        try:
+            return await self._load(key, loader)
+        except ServiceUnavailable:
+            # Past the stale window, but an old answer beats none while the service is down
+            if entry is not None:
+                self.fallbacks += 1
+                return entry[1]  # type: ignore[return-value]
+            raise
+
+    async def _load(self, key: tuple, loader: Callable[[], Awaitable[T]]) -> T:
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so waiter-less failures don't log "never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            self._store(key, value)
+        finally:
+            self._inflight.pop(key, None)
+        return value
+
+    async def _refresh(self, key: tuple, loader: Callable[[], Awaitable[T]]) -> None:
+        try:
+            await self._load(key, loader)
+        except Exception:
+            # Keep serving the stale value; the next stale hit retries
+            log.warning("Background refresh of %r failed", key, exc_info=True)
+
+    def _store(self, key: tuple, value: object) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[tuple], bool]) -> int:
+        stale = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> dict[str, float | int]:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "fallbacks": self.fallbacks,
+            "hit_rate": round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+        }
+
+
 # ===== SUPABASE CLIENT =====
 
 
+def _is_supabase_outage(exc: BaseException) -> bool:
+    # PGRST* are PostgREST client errors (bad filter, unknown RPC) — Supabase itself is fine
+    return not (isinstance(exc, APIError) and str(exc.code or "").startswith("PGRST"))
+
+
 class AuttajaDB:
-    """Thin async wrapper around the Supabase `punishments` table."""
+    """Thin async wrapper around the Supabase `punishments` table.
+
+    When a ready `AuttajaMirror` is attached, reads are served from it
+    instead of Supabase; writes always go to Supabase first. Supabase reads
+    go through a `_QueryCache`, which `update_punishment` invalidates.
+
+    Every request runs under a `CircuitBreaker` with a per-call timeout and
+    surfaces outages as `ServiceUnavailable`. While the circuit is open, a
+    partially synced mirror is preferred over failing.
+    """
 
     TABLE = "punishments"
     SCHEMA = "public"
+    LEADERBOARD_RPC = "auttaja_leaderboard"
+    BREAKDOWN_RPC = "auttaja_action_breakdown"
+    # PostgREST's default max-rows; larger reads are split into .range() pages
+    PAGE_SIZE = 1000
 
-    def __init__(self, url: str, key: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        mirror: AuttajaMirror | None = None,
+        breaker: CircuitBreaker | None = None,
+        cache_ttl: float = 60,
+        cache_stale_ttl: float = 300,
+    ) -> None:
         self._url = url
         self._key = key
         self._client: AsyncClient | None = None
+        self.mirror = mirror
+        self.cache = _QueryCache(ttl=cache_ttl, stale_ttl=cache_stale_ttl)
+        self.breaker = breaker or CircuitBreaker("Supabase")
+        self.breaker.is_failure = _is_supabase_outage
+        # RPCs from supabase/auttaja_leaderboard.sql found not to be installed
+        self._missing_rpcs: set[str] = set()
 
     async def connect(self) -> None:
         self._client = await acreate_client(self._url, self._key)
@@ -112,56 +618,179 @@ class AuttajaDB:
             raise RuntimeError("AuttajaDB.connect() has not been called yet.")
         return self._client
 
-    async def search_by_offender(self, user_id: str) -> list[AuttajaPunishment]:
-        response = (
-            await self.client.table(self.TABLE)
-            .select("*")
-            .eq("offender", user_id)
-            .order("timestamp", desc=True)
-            .execute()
-        )
-        return [AuttajaPunishment(row) for row in (response.data or [])]
-
-    async def search_by_punisher(self, user_id: str) -> list[AuttajaPunishment]:
-        response = (
-            await self.client.table(self.TABLE)
-            .select("*")
-            .eq("punisher", user_id)
+    @property
+    def _local(self) -> AuttajaMirror | None:
+        mirror = self.mirror
+        if mirror is None:
+            return None
+        if mirror.ready:
+            return mirror
+        if self.breaker.state == "open" and mirror.last_sync_at is not None:
+            return mirror
+        return None
+
+    async def _execute(self, request):
+        """Runs a PostgREST request builder under the breaker."""
+        try:
+            return await self.breaker.call(request.execute)
+        except ServiceUnavailable as exc:
+            raise ServiceUnavailable("Auttaja history", exc.reason) from exc
+        except httpx.HTTPError as exc:
+            raise ServiceUnavailable("Auttaja history", type(exc).__name__) from exc
+
+    def _user_query(
+        self, columns: str, role: Literal["offender", "punisher"], user_id: str, include_removed: bool, **select_kwargs
+    ):
+        query = self.client.table(self.TABLE).select(columns, **select_kwargs).eq(role, user_id)
+        if not include_removed:
+            # `deleted` is nullable; NULL counts as not removed
+            query = query.or_("deleted.is.null,deleted.is.false")
+        return query
+
+    async def iter_punishments(
+        self,
+        role: Literal["offender", "punisher"],
+        user_id: str,
+        include_removed: bool = True,
+        window: int = 50,
+    ) -> AsyncIterator[list[AuttajaPunishment]]:
+        """Yields a user's punishments newest-first, one `.range()` window at a time.
+
+        Nothing past the current window is requested until the caller asks
+        for it, so the first page can be shown before the rest is fetched.
+        """
+        start = 0
+        while True:
+            if self._local:
+                rows = await self._local.search(role, user_id, include_removed, limit=window, offset=start)
+            else:
+                rows = await self.cache.get_or_load(
+                    ("window", user_id, role, include_removed, start, window),
+                    functools.partial(self._fetch_window, role, user_id, include_removed, start, window),
+                )
+            if rows:
+                yield AuttajaPunishment.from_rows(rows)
+            if len(rows) < window:
+                return
+            start += window
+
+    async def _fetch_window(
+        self, role: Literal["offender", "punisher"], user_id: str, include_removed: bool, start: int, window: int
+    ) -> list[dict]:
+        response = await self._execute(
+            self._user_query("*", role, user_id, include_removed)
             .order("timestamp", desc=True)
-            .execute()
-        )
-        return [AuttajaPunishment(row) for row in (response.data or [])]
-
-    async def leaderboard_offenders(self) -> list[tuple[str, int]]:
-        """Returns (user_id, count) sorted descending."""
-        response = (
-            await self.client.table(self.TABLE)
-            .select("offender")
-            .execute()
+            .order("id", desc=True)
+            .range(start, start + window - 1)
         )
-        counts: Counter[str] = Counter(row["offender"] for row in (response.data or []))
-        return counts.most_common()
-
-    async def leaderboard_punishers(self) -> list[tuple[str, int]]:
-        """Returns (user_id, count) sorted descending."""
-        response = (
-            await self.client.table(self.TABLE)
-            .select("punisher")
-            .execute()
+        return response.data or []
+
+    async def leaderboard(
+        self, role: Literal["offender", "punisher"], limit: int | None = None, offset: int = 0
+    ) -> tuple[list[tuple[str, int]], int]:
+        """Returns (user_id, count) sorted descending, optionally one page of it, and the number of ranked users.
+
+        Counting happens in Postgres via the `auttaja_leaderboard` RPC
+        (supabase/auttaja_leaderboard.sql). If that function has not been
+        installed, falls back to streaming the column in pages.
+        """
+        if self._local:
+            return await self._local.leaderboard(role, limit, offset)
+        return await self.cache.get_or_load(
+            ("leaderboard", None, role, limit, offset),
+            functools.partial(self._leaderboard_remote, role, limit, offset),
         )
-        counts: Counter[str] = Counter(row["punisher"] for row in (response.data or []))
-        return counts.most_common()
+
+    async def iter_leaderboard(
+        self, role: Literal["offender", "punisher"], start: int = 0, window: int = 10
+    ) -> AsyncIterator[list[tuple[str, int]]]:
+        """Yields the ranking from `start` on, one `leaderboard()` page at a time, as the caller asks for it."""
+        while True:
+            ranked, _ = await self.leaderboard(role, limit=window, offset=start)
+            if ranked:
+                yield ranked
+            if len(ranked) < window:
+                return
+            start += window
+
+    async def _leaderboard_remote(
+        self, role: Literal["offender", "punisher"], limit: int | None, offset: int
+    ) -> tuple[list[tuple[str, int]], int]:
+        if self.LEADERBOARD_RPC not in self._missing_rpcs:
+            try:
+                return await self._leaderboard_rpc(role, limit, offset)
+            except APIError as exc:
+                self._rpc_not_installed(exc, self.LEADERBOARD_RPC, "counting leaderboards client-side")
+        return await self._leaderboard_scan(role, limit, offset)
+
+    def _rpc_not_installed(self, exc: APIError, name: str, fallback: str) -> None:
+        """Re-raises `exc` unless it says the function `name` is missing; then remembers that."""
+        if exc.code != "PGRST202":
+            raise exc
+        self._missing_rpcs.add(name)
+        log.warning("%s() is not installed in Supabase; %s", name, fallback)
+
+    async def _leaderboard_rpc(
+        self, role: Literal["offender", "punisher"], limit: int | None, offset: int
+    ) -> tuple[list[tuple[str, int]], int]:
+        # RPC results are still subject to PostgREST's max-rows cap, so ask in pages
+        ranked: list[tuple[str, int]] = []
+        total_users = 0
+        while limit is None or len(ranked) < limit:
+            want = self.PAGE_SIZE if limit is None else min(self.PAGE_SIZE, limit - len(ranked))
+            response = await self._execute(
+                self.client.rpc(
+                    self.LEADERBOARD_RPC,
+                    {"p_role": role, "p_limit": want, "p_offset": offset + len(ranked)},
+                )
+            )
+            rows = response.data or []
+            ranked.extend((str(r["user_id"]), int(r["count"])) for r in rows)
+            if rows:
+                total_users = int(rows[0]["total_users"])
+            if len(rows) < want:
+                break
+        if not ranked and offset:
+            # Past the end: ask for the first row just to learn the total
+            _, total_users = await self._leaderboard_rpc(role, 1, 0)
+        return ranked, total_users
+
+    async def _leaderboard_scan(
+        self, role: Literal["offender", "punisher"], limit: int | None, offset: int
+    ) -> tuple[list[tuple[str, int]], int]:
+        counts: Counter[str] = Counter()
+        start = 0
+        while True:
+            response = await self._execute(
+                self.client.table(self.TABLE)
+                .select(role)
+                .order("id")
+                .range(start, start + self.PAGE_SIZE - 1)
+            )
+            rows = response.data or []
+            counts.update(str(row[role]) for row in rows if row.get(role))
+            if len(rows) < self.PAGE_SIZE:
+                break
+            start += self.PAGE_SIZE
+        ranked = sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+        return ranked[offset:None if limit is None else offset + limit], len(ranked)
 
     async def get_punishment(self, punishment_id: str) -> AuttajaPunishment | None:
-        response = (
-            await self.client.table(self.TABLE)
-            .select("*")
-            .eq("id", punishment_id)
-            .limit(1)
-            .execute()
-        )
-        rows = response.data or []
-        return AuttajaPunishment(rows[0]) if rows else None
+        if self._local:
+            row = await self._local.get(punishment_id)
+            return AuttajaPunishment(row) if row else None
+
+        async def load() -> AuttajaPunishment | None:
+            response = await self._execute(
+                self.client.table(self.TABLE)
+                .select("*")
+                .eq("id", punishment_id)
+                .limit(1)
+            )
+            rows = response.data or []
+            return AuttajaPunishment(rows[0]) if rows else None
+
+        return await self.cache.get_or_load(("get", str(punishment_id)), load)
 
     async def update_punishment(
         self,
@@ -170,34 +799,86 @@ class AuttajaDB:
         punisher: str,
         reason: str,
         action: str,
+        previous: AuttajaPunishment | None = None,
     ) -> int:
-        response = (
-            await self.client.table(self.TABLE)
-            .update({
-                "offender": offender,
-                "punisher": punisher,
-                "reason": reason,
-                "action": action,
-            })
+        """Pass `previous` (the row before the edit) so cached lookups of the old offender/punisher are dropped too."""
+        fields = {
+            "offender": offender,
+            "punisher": punisher,
+            "reason": reason,
+            "action": action,
+        }
+        response = await self._execute(
+            self.client.table(self.TABLE)
+            .update(fields)
             .eq("id", punishment_id)
-            .execute()
         )
-        return len(response.data or [])
+        updated = len(response.data or [])
+        if updated:
+            affected = {offender, punisher, str(punishment_id)}
+            if previous is not None:
+                affected |= {previous.offender, previous.punisher}
+            self.cache.invalidate(lambda key: key[0] == "leaderboard" or key[1] in affected)
+            if self.mirror is not None:
+                await self.mirror.apply_update(punishment_id, fields)
+        return updated
 
     async def action_breakdown(self, user_id: str, role: Literal["offender", "punisher"]) -> dict[str, int]:
         """Returns {action: count} for a given user in a given role."""
-        response = (
-            await self.client.table(self.TABLE)
-            .select("action")
-            .eq(role, user_id)
-            .execute()
+        breakdown, _ = await self.action_summary(user_id, role)
+        return breakdown
+
+    async def action_summary(
+        self, user_id: str, role: Literal["offender", "punisher"]
+    ) -> tuple[dict[str, int], int]:
+        """Returns the {action: count} breakdown (removed rows included) and how many of those rows are removed.
+
+        Together they give both totals, so a history lookup needs no separate count request.
+        """
+        if self._local:
+            return await self._local.breakdown(role, user_id)
+        return await self.cache.get_or_load(
+            ("breakdown", user_id, role), functools.partial(self._breakdown_remote, user_id, role)
         )
-        counts: Counter[str] = Counter(row["action"] for row in (response.data or []))
-        return dict(counts)
+
+    async def _breakdown_remote(
+        self, user_id: str, role: Literal["offender", "punisher"]
+    ) -> tuple[dict[str, int], int]:
+        # One GROUP BY in Postgres when supabase/auttaja_leaderboard.sql is installed
+        if self.BREAKDOWN_RPC not in self._missing_rpcs:
+            try:
+                response = await self._execute(
+                    self.client.rpc(self.BREAKDOWN_RPC, {"p_role": role, "p_user_id": user_id})
+                )
+                rows = response.data or []
+                return {str(r["action"]): int(r["count"]) for r in rows}, sum(int(r["removed"]) for r in rows)
+            except APIError as exc:
+                self._rpc_not_installed(exc, self.BREAKDOWN_RPC, "counting the action column client-side")
+
+        # Otherwise read just the user's action column, in id-keyset pages (usually one)
+        counts: Counter[str] = Counter()
+        removed = 0
+        last_id = 0
+        while True:
+            response = await self._execute(
+                self._user_query("id,action,deleted", role, user_id, True)
+                .gt("id", last_id)
+                .order("id")
+                .limit(self.PAGE_SIZE)
+            )
+            rows = response.data or []
+            counts.update(_normalise_action(row.get("action")) for row in rows)
+            removed += sum(1 for row in rows if row.get("deleted"))
+            if len(rows) < self.PAGE_SIZE:
+                return dict(counts), removed
+            last_id = rows[-1]["id"]
 
 
 # ===== HELPERS =====
 
+# /auttaja lb entries per page; each page is one leaderboard request
+LEADERBOARD_PAGE_SIZE = 10
+
 ACTION_EMOJIS: dict[str, str] = {
     "ban": "🔨",
     "mute": "🔇",
@@ -216,10 +897,6 @@ def _mention(user_id: str | int) -> str:
     return f"<@{user_id}>"
 
 
-def _chunk(seq: list, size: int) -> list[list]:
-    return [seq[i : i + size] for i in range(0, len(seq), size)]
-
-
 def _parse_user_arg(raw: str) -> str | None:
     """Accept a raw string that is either a mention (<@123>) or a bare user ID."""
     raw = raw.strip().lstrip("<@").rstrip(">").strip("!")
@@ -328,6 +1005,7 @@ class EditAuttajaModal(discord.ui.Modal, title="Edit Auttaja punishment"):
             punisher=punisher,
             reason=reason,
             action=action,
+            previous=self.punishment,
         )
 
         if changed <= 0:
@@ -372,6 +1050,35 @@ class AuttajaCog(commands.Cog):
         self.log_channel_id = log_channel_id
         self.staff_role_id = staff_role_id
 
+    async def cog_load(self) -> None:
+        if self.auttaja_db.mirror is not None:
+            self.sync_mirror.start()
+
+    async def cog_unload(self) -> None:
+        self.sync_mirror.cancel()
+        if self.auttaja_db.mirror is not None:
+            await self.auttaja_db.mirror.close()
+
+    @tasks.loop(seconds=60)
+    async def sync_mirror(self) -> None:
+        mirror = self.auttaja_db.mirror
+        assert mirror is not None
+        if self.auttaja_db.breaker.state == "open":
+            return
+        try:
+            last_full = mirror.last_full_sync_at
+            now = datetime.datetime.now(datetime.timezone.utc)
+            if last_full is None or now - last_full >= MIRROR_RECONCILE_INTERVAL:
+                total = await mirror.reconcile(self.auttaja_db)
+                log.info("Auttaja mirror reconciled (%d rows)", total)
+            else:
+                new_rows = await mirror.sync_incremental(self.auttaja_db)
+                if new_rows:
+                    log.info("Auttaja mirror pulled %d new rows", new_rows)
+        except Exception:
+            # Keep serving the last good copy; the next tick retries
+            log.exception("Auttaja mirror sync failed")
+
     auttaja = app_commands.Group(name="auttaja", description="Browse historical Auttaja bot punishments")
 
     # ---- permission check ----
@@ -393,21 +1100,14 @@ class AuttajaCog(commands.Cog):
             return
         raise app_commands.CheckFailure("You do not have permission to use this command.")
 
-    # ---- /auttaja search offender ----
+    # ---- shared history lookup ----
 
-    @auttaja.command(
-        name="offender",
-        description="Show all Auttaja punishments received by a user",
-    )
-    @app_commands.describe(
-        user="User mention or user ID",
-        show_removed="Include removed/deleted punishments in the results (default: False)",
-    )
-    async def auttaja_offender(
+    async def _send_history(
         self,
         interaction: discord.Interaction,
+        role: Literal["offender", "punisher"],
         user: str,
-        show_removed: bool = False,
+        show_removed: bool,
     ) -> None:
         await self._staff_check(interaction)
 
@@ -418,42 +1118,71 @@ class AuttajaCog(commands.Cog):
             )
             return
 
-        await interaction.response.defer(ephemeral=False)
-
-        all_punishments = await self.auttaja_db.search_by_offender(user_id)
-        punishments = all_punishments if show_removed else [p for p in all_punishments if not p.deleted]
-        breakdown = await self.auttaja_db.action_breakdown(user_id, "offender")
-
-        if not punishments:
-            msg = f"No Auttaja punishments found for {_mention(user_id)} (`{user_id}`)."
-            if not show_removed and any(p.deleted for p in all_punishments):
+        # The breakdown also gives the total, so it takes the place of a count request;
+        # it and the first window are independent, so fetch them together
+        stream = self.auttaja_db.iter_punishments(role, user_id, include_removed=show_removed)
+        _, (breakdown, removed), first_window = await asyncio.gather(
+            interaction.response.defer(ephemeral=False),
+            self.auttaja_db.action_summary(user_id, role),
+            anext(stream, []),
+        )
+        total = sum(breakdown.values()) - (0 if show_removed else removed)
+
+        if total == 0 or not first_window:
+            await stream.aclose()
+            if role == "offender":
+                msg = f"No Auttaja punishments found for {_mention(user_id)} (`{user_id}`)."
+            else:
+                msg = f"No Auttaja punishments issued by {_mention(user_id)} (`{user_id}`)."
+            # The breakdown always includes removed rows
+            if not show_removed and sum(breakdown.values()) > 0:
                 msg += " (There are removed punishments — use `show_removed: True` to include them.)"
             await interaction.followup.send(msg, ephemeral=True)
             return
 
-        total = len(punishments)
-        page_count = (total - 1) // 5 + 1
         removed_note = " *(including removed)*" if show_removed else ""
-        pages: list[discord.Embed] = []
+        if role == "offender":
+            title = "Auttaja Punishments — Offender"
+            header = f"**User:** {_mention(user_id)} (`{user_id}`)\n**Total punishments:**"
+        else:
+            title = "Auttaja Punishments — Punisher"
+            header = f"**Punisher:** {_mention(user_id)} (`{user_id}`)\n**Total punishments issued:**"
 
-        for page_index, chunk in enumerate(_chunk(punishments, 5), start=1):
+        def build_page(chunk: list[AuttajaPunishment], page_index: int, page_count: int) -> discord.Embed:
             embed = discord.Embed(
-                title="Auttaja Punishments — Offender",
+                title=title,
                 color=self.embed_color,
                 description=(
-                    f"**User:** {_mention(user_id)} (`{user_id}`)\n"
-                    f"**Total punishments:** `{total}`{removed_note}\n"
+                    f"{header} `{total}`{removed_note}\n"
                     f"**Breakdown:** {_build_action_summary(breakdown)}\n"
                     f"**Page:** `{page_index}/{page_count}`"
                 ),
             )
             for p in chunk:
-                field_name, field_value = _build_punishment_field(p, show_offender=False)
+                field_name, field_value = _build_punishment_field(p, show_offender=role == "punisher")
                 embed.add_field(name=field_name, value=field_value, inline=False)
-            pages.append(embed)
+            return embed
 
-        view = PagedEmbedsView(pages, author_id=interaction.user.id)
-        await interaction.followup.send(embed=pages[0], view=view)
+        view = StreamPagedView(stream, first_window, total, build_page, author_id=interaction.user.id)
+        await interaction.followup.send(embed=view.current_embed(), view=view)
+
+    # ---- /auttaja search offender ----
+
+    @auttaja.command(
+        name="offender",
+        description="Show all Auttaja punishments received by a user",
+    )
+    @app_commands.describe(
+        user="User mention or user ID",
+        show_removed="Include removed/deleted punishments in the results (default: False)",
+    )
+    async def auttaja_offender(
+        self,
+        interaction: discord.Interaction,
+        user: str,
+        show_removed: bool = False,
+    ) -> None:
+        await self._send_history(interaction, "offender", user, show_removed)
 
     # ---- /auttaja punisher ----
 
@@ -471,51 +1200,7 @@ class AuttajaCog(commands.Cog):
         user: str,
         show_removed: bool = False,
     ) -> None:
-        await self._staff_check(interaction)
-
-        user_id = _parse_user_arg(user)
-        if user_id is None:
-            await interaction.response.send_message(
-                "Please provide a valid user mention or user ID.", ephemeral=True
-            )
-            return
-
-        await interaction.response.defer(ephemeral=False)
-
-        all_punishments = await self.auttaja_db.search_by_punisher(user_id)
-        punishments = all_punishments if show_removed else [p for p in all_punishments if not p.deleted]
-        breakdown = await self.auttaja_db.action_breakdown(user_id, "punisher")
-
-        if not punishments:
-            msg = f"No Auttaja punishments issued by {_mention(user_id)} (`{user_id}`)."
-            if not show_removed and any(p.deleted for p in all_punishments):
-                msg += " (There are removed punishments — use `show_removed: True` to include them.)"
-            await interaction.followup.send(msg, ephemeral=True)
-            return
-
-        total = len(punishments)
-        page_count = (total - 1) // 5 + 1
-        removed_note = " *(including removed)*" if show_removed else ""
-        pages: list[discord.Embed] = []
-
-        for page_index, chunk in enumerate(_chunk(punishments, 5), start=1):
-            embed = discord.Embed(
-                title="Auttaja Punishments — Punisher",
-                color=self.embed_color,
-                description=(
-                    f"**Punisher:** {_mention(user_id)} (`{user_id}`)\n"
-                    f"**Total punishments issued:** `{total}`{removed_note}\n"
-                    f"**Breakdown:** {_build_action_summary(breakdown)}\n"
-                    f"**Page:** `{page_index}/{page_count}`"
-                ),
-            )
-            for p in chunk:
-                field_name, field_value = _build_punishment_field(p, show_offender=True)
-                embed.add_field(name=field_name, value=field_value, inline=False)
-            pages.append(embed)
-
-        view = PagedEmbedsView(pages, author_id=interaction.user.id)
-        await interaction.followup.send(embed=pages[0], view=view)
+        await self._send_history(interaction, "punisher", user, show_removed)
 
     # ---- /auttaja lb ----
 
@@ -533,45 +1218,95 @@ class AuttajaCog(commands.Cog):
     ) -> None:
         await self._staff_check(interaction)
 
-        await interaction.response.defer(ephemeral=False)
-
+        # Only the first page is fetched now; later pages are fetched as the user pages to them
+        _, (first_page, total_entries) = await asyncio.gather(
+            interaction.response.defer(ephemeral=False),
+            self.auttaja_db.leaderboard(mode, limit=LEADERBOARD_PAGE_SIZE),
+        )
         if mode == "offender":
-            ranked = await self.auttaja_db.leaderboard_offenders()
             title = "🏆 Auttaja Leaderboard — Most Punished"
             suffix = "punishments"
         else:
-            ranked = await self.auttaja_db.leaderboard_punishers()
             title = "🏆 Auttaja Leaderboard — Most Active Punishers"
             suffix = "punishments issued"
 
-        if not ranked:
+        if not first_page:
             await interaction.followup.send("No punishment data found.", ephemeral=True)
             return
 
-        total_entries = len(ranked)
         medals = ["🥇", "🥈", "🥉"]
-        pages: list[discord.Embed] = []
 
-        for page_index, chunk in enumerate(_chunk(ranked, 10), start=1):
+        def build_page(chunk: list[tuple[str, int]], page_index: int, page_count: int) -> discord.Embed:
             embed = discord.Embed(
                 title=title,
                 color=self.embed_color,
                 description=(
                     f"**Total entries:** `{total_entries}`\n"
-                    f"**Page:** `{page_index}/{(total_entries - 1)//10 + 1}`"
+                    f"**Page:** `{page_index}/{page_count}`"
                 ),
             )
             lines = []
             for offset, (user_id, count) in enumerate(chunk):
-                rank = (page_index - 1) * 10 + offset + 1
+                rank = (page_index - 1) * LEADERBOARD_PAGE_SIZE + offset + 1
                 prefix = medals[rank - 1] if rank <= 3 else f"`#{rank}`"
                 lines.append(f"{prefix} <@{user_id}> — **{count}** {suffix}")
-
             embed.add_field(name="Leaderboard", value="\n".join(lines), inline=False)
-            pages.append(embed)
+            return embed
+
+        stream = self.auttaja_db.iter_leaderboard(mode, start=LEADERBOARD_PAGE_SIZE, window=LEADERBOARD_PAGE_SIZE)
+        view = StreamPagedView(
+            stream,
+            first_page,
+            total_entries,
+            build_page,
+            author_id=interaction.user.id,
+            page_size=LEADERBOARD_PAGE_SIZE,
+        )
+        await interaction.followup.send(embed=view.current_embed(), view=view)
+
+    # ---- /auttaja status ----
 
-        view = PagedEmbedsView(pages, author_id=interaction.user.id)
-        await interaction.followup.send(embed=pages[0], view=view)
+    @auttaja.command(name="status", description="Show the state of the local Auttaja mirror")
+    async def auttaja_status(self, interaction: discord.Interaction) -> None:
+        await self._staff_check(interaction)
+
+        def _ago(ts: datetime.datetime | None) -> str:
+            return f"<t:{int(ts.timestamp())}:R>" if ts else "never"
+
+        mirror = self.auttaja_db.mirror
+        embed = discord.Embed(title="📜 Auttaja Status", color=self.embed_color)
+        if mirror is None:
+            embed.description = "Local mirror is disabled — all reads go to Supabase."
+        else:
+            lag = mirror.lag
+            embed.add_field(name="Serving reads", value="Local mirror" if mirror.ready else "Supabase (initial sync pending)", inline=False)
+            embed.add_field(name="Rows", value=f"`{await mirror.count()}`", inline=True)
+            embed.add_field(name="Watermark", value=f"`#{mirror.watermark}`", inline=True)
+            embed.add_field(name="Sync lag", value=f"`{int(lag.total_seconds())}s`" if lag else "`—`", inline=True)
+            embed.add_field(name="Last sync", value=_ago(mirror.last_sync_at), inline=True)
+            embed.add_field(name="Last full reconcile", value=_ago(mirror.last_full_sync_at), inline=True)
+
+        breaker = self.auttaja_db.breaker.stats()
+        embed.add_field(
+            name="Supabase circuit",
+            value=(
+                f"`{breaker['state']}` • {breaker['consecutive_failures']} consecutive failures\n"
+                f"{breaker['timeouts']} timeouts • {breaker['rejected']} fast-failed • {breaker['trips']} trips"
+            ),
+            inline=False,
+        )
+
+        cache = self.auttaja_db.cache.stats()
+        embed.add_field(
+            name="Query cache",
+            value=(
+                f"{cache['size']} cached, {cache['hit_rate']:.0%} hit rate\n"
+                f"{cache['hits']} fresh • {cache['stale_hits']} stale • "
+                f"{cache['coalesced']} coalesced • {cache['misses']} misses • {cache['fallbacks']} outage fallbacks"
+            ),
+            inline=False,
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
     # ---- /auttaja edit ----
 
@@ -609,7 +1344,16 @@ async def setup(bot: commands.Bot) -> None:
             "or on the bot instance before loading the Auttaja cog."
         )
 
-    auttaja_db = AuttajaDB(url=supabase_url, key=supabase_key)
+    mirror = AuttajaMirror()
+    await mirror.connect()
+    await mirror.init_schema()
+
+    auttaja_db = AuttajaDB(
+        url=supabase_url,
+        key=supabase_key,
+        mirror=mirror,
+        breaker=getattr(bot, "supabase_breaker", None),
+    )
     await auttaja_db.connect()
 
     await bot.add_cog(
@@ -43,6 +43,11 @@ _COG_DATA: dict[str, tuple[str, list[tuple[str, str, str]]]] = {
                 "Show a leaderboard. `offender` = most warned users, `mod` = most warnings issued.",
                 "/verbal lb offender",
             ),
+            (
+                "/verbal trend [weeks]",
+                "Chart the number of verbal warnings logged per week (default: last 12 weeks).",
+                "/verbal trend 26",
+            ),
         ],
     ),
     "Auttaja History": (
@@ -63,6 +68,21 @@ _COG_DATA: dict[str, tuple[str, list[tuple[str, str, str]]]] = {
                 "Show a leaderboard from the Auttaja records. `offender` = most punished users, `punisher` = most active punishers.",
                 "/auttaja lb offender",
             ),
+            (
+                "/auttaja status",
+                "Show the local Auttaja mirror's row count, sync watermark and sync lag, plus Supabase query cache statistics.",
+                "/auttaja status",
+            ),
+        ],
+    ),
+    "Moderation Profile": (
+        "See everything on record for a user in one place.",
+        [
+            (
+                "/profile <user>",
+                "Show a user's verbal warnings and Auttaja punishments merged into one newest-first timeline, with per-action counts and last-30-days totals. Accepts a mention or a raw user ID.",
+                "/profile @JohnDoe",
+            ),
         ],
     ),
     "Utility": (
@@ -180,6 +200,7 @@ _COG_DATA: dict[str, tuple[str, list[tuple[str, str, str]]]] = {
 _COG_EMOJIS: dict[str, str] = {
     "Verbal Warnings": "⚠️",
     "Auttaja History": "📜",
+    "Moderation Profile": "🗂️",
     "Utility": "🔧",
     "Polls": "📊",
     "Poll Templates": "📋",
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass
 from typing import Literal, Optional
 
@@ -8,7 +9,10 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from bot.charts import ChartRenderer
+from bot.ratelimit import RateLimiter, by_user_and_message, throttle_check, throttled
 from bot.ui import PagedEmbedsView
+from bot.users import UserDirectory
 
 
 # ===== DATABASE =====
@@ -120,25 +124,44 @@ class StaffPollDatabase:
         await self.conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_ev_poll ON staffpoll_votes(poll_id)"
         )
+        # Serves per-option participant pages in vote order without a sort step
+        await self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ev_poll_option_time "
+            "ON staffpoll_votes(poll_id, option_id, voted_at)"
+        )
         await self.conn.commit()
 
     # ---- polls ----
 
-    async def create_poll(
+    async def create_poll_with_options(
         self,
         title: str,
         description: str,
         created_by: int,
+        labels: list[str],
         is_anonymous: bool = False,
         max_votes: int = 0,
-    ) -> int:
-        cur = await self.conn.execute(
-            "INSERT INTO staffpoll_polls (title, description, created_by, is_anonymous, max_votes) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (title, description, created_by, int(is_anonymous), max_votes),
-        )
-        await self.conn.commit()
-        return int(cur.lastrowid)
+    ) -> tuple[StaffPollPoll, list[StaffPollOption]]:
+        """Inserts a poll and all of its options in a single transaction."""
+        try:
+            cur = await self.conn.execute(
+                "INSERT INTO staffpoll_polls (title, description, created_by, is_anonymous, max_votes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (title, description, created_by, int(is_anonymous), max_votes),
+            )
+            poll_id = int(cur.lastrowid)
+            await self.conn.executemany(
+                "INSERT INTO staffpoll_options (poll_id, label, display_order) VALUES (?, ?, ?)",
+                [(poll_id, label, order) for order, label in enumerate(labels)],
+            )
+            await self.conn.commit()
+        except Exception:
+            await self.conn.rollback()
+            raise
+
+        poll = await self.get_poll(poll_id)
+        assert poll is not None
+        return poll, await self.get_options(poll_id)
 
     async def set_poll_message(self, poll_id: int, channel_id: int, message_id: int) -> None:
         await self.conn.execute(
@@ -200,17 +223,6 @@ class StaffPollDatabase:
 
     # ---- options ----
 
-    async def add_options(self, poll_id: int, labels: list[str]) -> list[int]:
-        ids: list[int] = []
-        for order, label in enumerate(labels):
-            cur = await self.conn.execute(
-                "INSERT INTO staffpoll_options (poll_id, label, display_order) VALUES (?, ?, ?)",
-                (poll_id, label, order),
-            )
-            ids.append(int(cur.lastrowid))
-        await self.conn.commit()
-        return ids
-
     async def get_options(self, poll_id: int) -> list[StaffPollOption]:
         cur = await self.conn.execute(
             "SELECT id, poll_id, label, display_order FROM staffpoll_options "
@@ -228,10 +240,10 @@ class StaffPollDatabase:
         ]
 
     async def update_option_labels(self, options: list[StaffPollOption], new_labels: list[str]) -> None:
-        for option, label in zip(options, new_labels):
-            await self.conn.execute(
-                "UPDATE staffpoll_options SET label = ? WHERE id = ?", (label, option.id)
-            )
+        await self.conn.executemany(
+            "UPDATE staffpoll_options SET label = ? WHERE id = ?",
+            [(label, option.id) for option, label in zip(options, new_labels)],
+        )
         await self.conn.commit()
 
     # ---- votes ----
@@ -270,13 +282,35 @@ class StaffPollDatabase:
         )
         return {int(r["option_id"]): int(r["cnt"]) for r in await cur.fetchall()}
 
-    async def get_all_votes(self, poll_id: int) -> list[tuple[int, int]]:
-        """Returns list of (user_id, option_id) ordered by vote time."""
-        cur = await self.conn.execute(
-            "SELECT user_id, option_id FROM staffpoll_votes WHERE poll_id = ? ORDER BY voted_at",
-            (poll_id,),
-        )
-        return [(int(r["user_id"]), int(r["option_id"])) for r in await cur.fetchall()]
+    async def get_option_voters(
+        self,
+        poll_id: int,
+        option_id: int,
+        limit: int,
+        after: Optional[tuple[str, int]] = None,
+    ) -> list[tuple[int, str, int]]:
+        """Returns up to `limit` (user_id, voted_at, vote_id) for one option, ordered by vote time.
+
+        `after` is the (voted_at, vote_id) of the last row of the previous page.
+        """
+        if after is None:
+            cur = await self.conn.execute(
+                "SELECT id, user_id, voted_at FROM staffpoll_votes "
+                "WHERE poll_id = ? AND option_id = ? "
+                "ORDER BY voted_at, id LIMIT ?",
+                (poll_id, option_id, limit),
+            )
+        else:
+            cur = await self.conn.execute(
+                "SELECT id, user_id, voted_at FROM staffpoll_votes "
+                "WHERE poll_id = ? AND option_id = ? AND (voted_at, id) > (?, ?) "
+                "ORDER BY voted_at, id LIMIT ?",
+                (poll_id, option_id, after[0], after[1], limit),
+            )
+        return [
+            (int(r["user_id"]), str(r["voted_at"]), int(r["id"]))
+            for r in await cur.fetchall()
+        ]
 
 
 # ===== HELPERS =====
@@ -311,13 +345,11 @@ def _progress_bar(pct: float, length: int = 10) -> str:
 
 
 async def _resolve_username(client: discord.Client, user_id: int) -> str:
-    user = client.get_user(user_id)
-    if user is None:
-        try:
-            user = await client.fetch_user(user_id)
-        except discord.NotFound:
-            return str(user_id)
-    return user.name
+    directory: Optional[UserDirectory] = getattr(client, "user_directory", None)
+    if directory is None:
+        user = client.get_user(user_id)
+        return user.name if user else str(user_id)
+    return await directory.get_name(user_id) or str(user_id)
 
 
 def _build_poll_embed(
@@ -367,58 +399,184 @@ def _build_poll_embed(
     return embed
 
 
-# ===== UI =====
+_CHART_FILENAME = "poll_results.png"
 
+# Per (user, poll message) vote throttle; burst/refill are set from Settings in setup()
+_VOTE_LIMITER = RateLimiter(burst=3, refill_every=2.0)
 
-async def _send_participants(interaction: discord.Interaction, staffpoll_db: StaffPollDatabase, poll_id: int, embed_color: int) -> None:
-    poll = await staffpoll_db.get_poll(poll_id)
-    if poll is None:
-        await interaction.response.send_message("Poll not found.", ephemeral=True)
-        return
+# Per-user throttle for commands that render charts
+_VIEW_LIMITER = RateLimiter(burst=3, refill_every=10.0)
 
-    options = await staffpoll_db.get_options(poll_id)
-    all_votes = await staffpoll_db.get_all_votes(poll_id)
 
-    by_option: dict[int, list[int]] = {o.id: [] for o in options}
-    for user_id, option_id in all_votes:
-        if option_id in by_option:
-            by_option[option_id].append(user_id)
+async def _attach_poll_chart(
+    client: discord.Client,
+    embed: discord.Embed,
+    poll: StaffPollPoll,
+    options: list[StaffPollOption],
+    vote_counts: dict[int, int],
+) -> Optional[discord.File]:
+    """Renders a results bar chart off-loop and points the embed image at it.
 
-    total = len(all_votes)
-    status = "Open" if poll.is_active else "Closed"
-    embed = discord.Embed(
-        title=f"Participants — {poll.title}",
-        color=embed_color if poll.is_active else _CLOSED_COLOR,
-        description=(
-            f"**Poll #{poll.id}** • {status} • "
-            f"**{total}** participant{'s' if total != 1 else ''}"
-        ),
+    Returns None (leaving the embed untouched) when charts are unavailable.
+    """
+    charts: Optional[ChartRenderer] = getattr(client, "charts", None)
+    if charts is None:
+        return None
+    color = embed.color.value if embed.color else _CLOSED_COLOR
+    png = await charts.poll_results(
+        poll.title,
+        [o.label for o in options],
+        [vote_counts.get(o.id, 0) for o in options],
+        color,
     )
+    if png is None:
+        return None
+    embed.set_image(url=f"attachment://{_CHART_FILENAME}")
+    return discord.File(io.BytesIO(png), filename=_CHART_FILENAME)
 
-    for option in options:
-        voters = by_option.get(option.id, [])
-        count = len(voters)
-        if voters:
-            mentions: list[str] = []
-            running = 0
-            for uid in voters:
-                mention = f"<@{uid}>"
-                if running + len(mention) + 2 > 950:
-                    mentions.append(f"*…and {count - len(mentions)} more*")
-                    break
-                mentions.append(mention)
-                running += len(mention) + 2
-            value = ", ".join(mentions)
-        else:
-            value = "*No votes yet*"
 
+# ===== UI =====
+
+
+_PARTICIPANTS_PAGE_SIZE = 30
+
+
+class StaffPollParticipantsView(discord.ui.View):
+    """Ephemeral, lazily-paged list of who voted for each option of a poll.
+
+    Only one page of voters is held at a time; pages are fetched from the
+    database on demand using a keyset cursor on (voted_at, vote id).
+    """
+
+    def __init__(
+        self,
+        staffpoll_db: StaffPollDatabase,
+        poll: StaffPollPoll,
+        options: list[StaffPollOption],
+        vote_counts: dict[int, int],
+        embed_color: int,
+        author_id: int,
+        timeout: float = 180,
+    ) -> None:
+        super().__init__(timeout=timeout)
+        self._staffpoll_db = staffpoll_db
+        self._poll = poll
+        self._options = {o.id: o for o in options}
+        self._vote_counts = vote_counts
+        self._embed_color = embed_color
+        self.author_id = author_id
+
+        # Start on the first option that actually has votes
+        self._option_id = next(
+            (o.id for o in options if vote_counts.get(o.id, 0) > 0), options[0].id
+        )
+        self._page = 0
+        self._cursors: list[Optional[tuple[str, int]]] = [None]
+        self._voters: list[tuple[int, str, int]] = []
+        self._has_next = False
+
+        self.option_select.options = [
+            discord.SelectOption(
+                label=o.label[:100],
+                value=str(o.id),
+                description=f"{vote_counts.get(o.id, 0)} vote{'s' if vote_counts.get(o.id, 0) != 1 else ''}",
+                default=o.id == self._option_id,
+            )
+            for o in options[:25]
+        ]
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+
+    async def load_page(self) -> None:
+        rows = await self._staffpoll_db.get_option_voters(
+            self._poll.id,
+            self._option_id,
+            _PARTICIPANTS_PAGE_SIZE + 1,
+            after=self._cursors[self._page],
+        )
+        self._has_next = len(rows) > _PARTICIPANTS_PAGE_SIZE
+        self._voters = rows[:_PARTICIPANTS_PAGE_SIZE]
+        self.prev_button.disabled = self._page <= 0
+        self.next_button.disabled = not self._has_next
+
+    def build_embed(self) -> discord.Embed:
+        poll = self._poll
+        option = self._options[self._option_id]
+        total = sum(self._vote_counts.values())
+        count = self._vote_counts.get(option.id, 0)
+        page_count = max(1, (count - 1) // _PARTICIPANTS_PAGE_SIZE + 1)
+        status = "Open" if poll.is_active else "Closed"
+
+        embed = discord.Embed(
+            title=f"Participants — {poll.title}",
+            color=self._embed_color if poll.is_active else _CLOSED_COLOR,
+            description=(
+                f"**Poll #{poll.id}** • {status} • "
+                f"**{total}** participant{'s' if total != 1 else ''}"
+            ),
+        )
+        first_rank = self._page * _PARTICIPANTS_PAGE_SIZE + 1
+        value = "\n".join(
+            f"`{rank}.` <@{user_id}>"
+            for rank, (user_id, _, _) in enumerate(self._voters, start=first_rank)
+        )
         embed.add_field(
             name=f"{option.label} ({count} vote{'s' if count != 1 else ''})",
-            value=value,
+            value=value or "*No votes yet*",
             inline=False,
         )
+        embed.set_footer(text=f"Page {self._page + 1}/{page_count}")
+        return embed
+
+    @discord.ui.select(placeholder="Choose an option…", row=0)
+    async def option_select(self, interaction: discord.Interaction, select: discord.ui.Select):  # type: ignore[override]
+        self._option_id = int(select.values[0])
+        for opt in select.options:
+            opt.default = opt.value == select.values[0]
+        self._page = 0
+        self._cursors = [None]
+        await self.load_page()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Prev", style=discord.ButtonStyle.secondary, row=1)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):  # type: ignore[override]
+        self._page -= 1
+        await self.load_page()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, row=1)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):  # type: ignore[override]
+        _, voted_at, vote_id = self._voters[-1]
+        del self._cursors[self._page + 1 :]
+        self._cursors.append((voted_at, vote_id))
+        self._page += 1
+        await self.load_page()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+
+async def _send_participants(interaction: discord.Interaction, staffpoll_db: StaffPollDatabase, poll_id: int, embed_color: int) -> None:
+    poll = await staffpoll_db.get_poll(poll_id)
+    if poll is None:
+        await interaction.response.send_message("Poll not found.", ephemeral=True)
+        return
+
+    options = await staffpoll_db.get_options(poll_id)
+    if not options:
+        await interaction.response.send_message("This poll has no options.", ephemeral=True)
+        return
 
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    vote_counts = await staffpoll_db.get_vote_counts(poll_id)
+    view = StaffPollParticipantsView(
+        staffpoll_db=staffpoll_db,
+        poll=poll,
+        options=options,
+        vote_counts=vote_counts,
+        embed_color=embed_color,
+        author_id=interaction.user.id,
+    )
+    await view.load_page()
+    await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
 
 
 class StaffPollVoteButton(discord.ui.Button["StaffPollVoteView"]):
@@ -533,7 +691,7 @@ class StaffPollEndedView(discord.ui.View):
             max_votes=reopened_poll.max_votes,
         )
         interaction.client.add_view(new_view)  # type: ignore[union-attr]
-        await interaction.response.edit_message(embed=embed, view=new_view)
+        await interaction.response.edit_message(embed=embed, view=new_view, attachments=[])
 
 
 class StaffPollEndPollButton(discord.ui.Button["StaffPollVoteView"]):
@@ -588,6 +746,7 @@ class StaffPollVoteView(discord.ui.View):
         if is_active:
             self.add_item(StaffPollEndPollButton(poll_id=poll_id))
 
+    @throttled(_VOTE_LIMITER, key=by_user_and_message)
     async def handle_vote(
         self, interaction: discord.Interaction, poll_id: int, option_id: int
     ) -> None:
@@ -630,8 +789,13 @@ class StaffPollVoteView(discord.ui.View):
                 created_by=poll.created_by,
                 is_anonymous=self._is_anonymous,
             )
+            # Chart rendering may outlive the 3s response window, so acknowledge first
+            await interaction.response.defer()
+            chart = await _attach_poll_chart(interaction.client, embed, ended_poll, options, vote_counts)  # type: ignore[arg-type]
             interaction.client.add_view(ended_view)  # type: ignore[union-attr]
-            await interaction.response.edit_message(embed=embed, view=ended_view)
+            await interaction.edit_original_response(
+                embed=embed, view=ended_view, attachments=[chart] if chart else []
+            )
             confirmation = (
                 f"Your vote has been cast for **{label}**. "
                 f"The poll has ended — max votes ({self._max_votes}) reached."
@@ -685,8 +849,12 @@ class StaffPollVoteView(discord.ui.View):
             embed_color=self._embed_color,
             created_by=poll.created_by,
         )
+        await interaction.response.defer()
+        chart = await _attach_poll_chart(interaction.client, embed, ended_poll, options, vote_counts)  # type: ignore[arg-type]
         interaction.client.add_view(ended_view)  # type: ignore[union-attr]
-        await interaction.response.edit_message(embed=embed, view=ended_view)
+        await interaction.edit_original_response(
+            embed=embed, view=ended_view, attachments=[chart] if chart else []
+        )
 
 
 # ===== MODALS =====
@@ -750,16 +918,12 @@ class CreateStaffPollModal(discord.ui.Modal, title="Create staff poll"):
             )
             return
 
-        poll_id = await self._staffpoll_db.create_poll(
-            title, description, interaction.user.id,
+        poll, staffpoll_options = await self._staffpoll_db.create_poll_with_options(
+            title, description, interaction.user.id, options,
             is_anonymous=self._is_anonymous, max_votes=self._max_votes,
         )
-        await self._staffpoll_db.add_options(poll_id, options)
+        poll_id = poll.id
 
-        poll = await self._staffpoll_db.get_poll(poll_id)
-        staffpoll_options = await self._staffpoll_db.get_options(poll_id)
-
-        assert poll is not None
         created_by_name = interaction.user.name
         embed = _build_poll_embed(poll, staffpoll_options, {}, self._embed_color, created_by_name)
         view = StaffPollVoteView(
@@ -1108,6 +1272,7 @@ class StaffPollCog(commands.Cog):
 
     @staffpoll.command(name="view", description="View results and details for a poll")
     @app_commands.describe(id="ID of the poll to view")
+    @throttle_check(_VIEW_LIMITER)
     async def staffpoll_view(self, interaction: discord.Interaction, id: int) -> None:
         await self._staff_check(interaction)
 
@@ -1130,7 +1295,12 @@ class StaffPollCog(commands.Cog):
                 inline=False,
             )
 
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        chart = await _attach_poll_chart(interaction.client, embed, poll, options, vote_counts)  # type: ignore[arg-type]
+        if chart is not None:
+            await interaction.followup.send(embed=embed, file=chart, ephemeral=True)
+        else:
+            await interaction.followup.send(embed=embed, ephemeral=True)
 
 
 # ===== SETUP =====
@@ -1144,6 +1314,13 @@ async def setup(bot: commands.Bot) -> None:
     embed_color: int = getattr(bot, "embed_color", 0x007FFF)
     staff_role_id: int = getattr(bot, "staff_role_id", 0)
 
+    settings = getattr(bot, "settings", None)
+    if settings is not None:
+        _VOTE_LIMITER.configure(
+            burst=settings.vote_throttle_burst,
+            refill_every=settings.vote_throttle_refill,
+        )
+
     cog = StaffPollCog(
         bot=bot,
         staffpoll_db=staffpoll_db,
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import difflib
+import logging
 from dataclasses import dataclass
 from typing import Literal, Optional
 
 import aiosqlite
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from bot.ui import PagedEmbedsView
 from bot.cogs.polls import (
@@ -17,6 +19,8 @@ from bot.cogs.polls import (
     _resolve_username,
 )
 
+log = logging.getLogger("verbal-bot.polls_template")
+
 
 # ===== DATABASE =====
 
@@ -109,22 +113,33 @@ class PollTemplateDatabase:
         )
         await self.conn.commit()
 
-    async def create_template(
+    async def create_template_with_options(
         self,
         name: str,
         description: str,
         created_by: int,
+        labels: list[str],
         is_anonymous: bool = False,
         max_votes: int = 0,
     ) -> int:
-        cur = await self.conn.execute(
-            "INSERT INTO poll_templates (name, description, created_by, is_anonymous, max_votes) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (name, description, created_by, int(is_anonymous), max_votes),
-        )
-        await self.conn.commit()
-        assert cur.lastrowid is not None
-        return cur.lastrowid
+        """Inserts a template and all of its options in a single transaction."""
+        try:
+            cur = await self.conn.execute(
+                "INSERT INTO poll_templates (name, description, created_by, is_anonymous, max_votes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (name, description, created_by, int(is_anonymous), max_votes),
+            )
+            assert cur.lastrowid is not None
+            template_id = cur.lastrowid
+            await self.conn.executemany(
+                "INSERT INTO poll_template_options (template_id, label, display_order) VALUES (?, ?, ?)",
+                [(template_id, label, order) for order, label in enumerate(labels)],
+            )
+            await self.conn.commit()
+        except Exception:
+            await self.conn.rollback()
+            raise
+        return template_id
 
     async def get_template(self, template_id: int) -> Optional[PollTemplate]:
         cur = await self.conn.execute(
@@ -160,14 +175,6 @@ class PollTemplateDatabase:
         await self.conn.commit()
         return cur.rowcount
 
-    async def add_options(self, template_id: int, labels: list[str]) -> None:
-        for order, label in enumerate(labels):
-            await self.conn.execute(
-                "INSERT INTO poll_template_options (template_id, label, display_order) VALUES (?, ?, ?)",
-                (template_id, label, order),
-            )
-        await self.conn.commit()
-
     async def get_options(self, template_id: int) -> list[PollTemplateOption]:
         cur = await self.conn.execute(
             "SELECT id, template_id, label, display_order FROM poll_template_options "
@@ -184,16 +191,116 @@ class PollTemplateDatabase:
             for r in await cur.fetchall()
         ]
 
+    async def get_all_options(self) -> dict[int, list[PollTemplateOption]]:
+        cur = await self.conn.execute(
+            "SELECT id, template_id, label, display_order FROM poll_template_options "
+            "ORDER BY template_id, display_order"
+        )
+        by_template: dict[int, list[PollTemplateOption]] = {}
+        for r in await cur.fetchall():
+            option = PollTemplateOption(
+                id=int(r["id"]),
+                template_id=int(r["template_id"]),
+                label=str(r["label"]),
+                display_order=int(r["display_order"]),
+            )
+            by_template.setdefault(option.template_id, []).append(option)
+        return by_template
+
+    async def data_version(self) -> int:
+        """Changes whenever another connection (e.g. the dashboard) commits to this file."""
+        cur = await self.conn.execute("PRAGMA data_version")
+        row = await cur.fetchone()
+        return int(row[0])
+
     async def update_option_labels(
         self, options: list[PollTemplateOption], new_labels: list[str]
     ) -> None:
-        for option, label in zip(options, new_labels):
-            await self.conn.execute(
-                "UPDATE poll_template_options SET label = ? WHERE id = ?", (label, option.id)
-            )
+        await self.conn.executemany(
+            "UPDATE poll_template_options SET label = ? WHERE id = ?",
+            [(label, option.id) for option, label in zip(options, new_labels)],
+        )
         await self.conn.commit()
 
 
+# ===== CATALOGUE =====
+
+
+class TemplateCatalogue:
+    """In-memory copy of every template and its options.
+
+    Loaded once at startup and refreshed per template after bot-side
+    writes. Writes from other processes (the dashboard) are picked up by
+    `sync()`, which reloads everything when SQLite's `data_version` moves.
+    """
+
+    def __init__(self, db: PollTemplateDatabase) -> None:
+        self.db = db
+        self._templates: dict[int, PollTemplate] = {}
+        self._options: dict[int, list[PollTemplateOption]] = {}
+        self._data_version: Optional[int] = None
+
+    async def load(self) -> None:
+        self._data_version = await self.db.data_version()
+        templates = await self.db.list_templates(include_deleted=True)
+        options = await self.db.get_all_options()
+        self._templates = {t.id: t for t in templates}
+        self._options = {t.id: options.get(t.id, []) for t in templates}
+
+    async def sync(self) -> bool:
+        """Reloads if another connection committed since the last load. Returns True if reloaded."""
+        if await self.db.data_version() == self._data_version:
+            return False
+        await self.load()
+        return True
+
+    async def refresh(self, template_id: int) -> None:
+        template = await self.db.get_template(template_id)
+        if template is None:
+            self._templates.pop(template_id, None)
+            self._options.pop(template_id, None)
+            return
+        self._templates[template_id] = template
+        self._options[template_id] = await self.db.get_options(template_id)
+
+    def get(self, template_id: int, include_deleted: bool = False) -> Optional[PollTemplate]:
+        template = self._templates.get(template_id)
+        if template is None or (template.is_deleted and not include_deleted):
+            return None
+        return template
+
+    def options(self, template_id: int) -> list[PollTemplateOption]:
+        return self._options.get(template_id, [])
+
+    def list(self, include_deleted: bool = False) -> list[PollTemplate]:
+        return sorted(
+            (t for t in self._templates.values() if include_deleted or not t.is_deleted),
+            key=lambda t: t.id,
+            reverse=True,
+        )
+
+    def search(self, query: str, include_deleted: bool = False, limit: int = 25) -> list[PollTemplate]:
+        """Fuzzy-matches templates by name (or exact ID), best matches first."""
+        templates = self.list(include_deleted)
+        q = query.strip().lower()
+        if not q:
+            return templates[:limit]
+
+        scored: list[tuple[float, PollTemplate]] = []
+        for t in templates:
+            name = t.name.lower()
+            if q == str(t.id) or name.startswith(q):
+                score = 2.0
+            elif q in name:
+                score = 1.5
+            else:
+                score = difflib.SequenceMatcher(None, q, name).ratio()
+            if score >= 0.4:
+                scored.append((score, t))
+        scored.sort(key=lambda x: (-x[0], -x[1].id))
+        return [t for _, t in scored[:limit]]
+
+
 # ===== HELPERS =====
 
 
@@ -312,9 +419,9 @@ class CreateTemplateModal(discord.ui.Modal, title="Create poll template"):
         max_length=1000,
     )
 
-    def __init__(self, template_db: PollTemplateDatabase, embed_color: int) -> None:
+    def __init__(self, catalogue: TemplateCatalogue, embed_color: int) -> None:
         super().__init__(timeout=300)
-        self._template_db = template_db
+        self._catalogue = catalogue
         self._embed_color = embed_color
 
     async def on_submit(self, interaction: discord.Interaction) -> None:
@@ -327,8 +434,10 @@ class CreateTemplateModal(discord.ui.Modal, title="Create poll template"):
             await interaction.response.send_message(error, ephemeral=True)
             return
 
-        template_id = await self._template_db.create_template(name, description, interaction.user.id)
-        await self._template_db.add_options(template_id, options)
+        template_id = await self._catalogue.db.create_template_with_options(
+            name, description, interaction.user.id, options
+        )
+        await self._catalogue.refresh(template_id)
 
         embed = discord.Embed(
             title="Template created",
@@ -359,14 +468,14 @@ class ConvertPollToTemplateModal(discord.ui.Modal, title="Convert poll to templa
 
     def __init__(
         self,
-        template_db: PollTemplateDatabase,
+        catalogue: TemplateCatalogue,
         embed_color: int,
         prefill_name: str,
         prefill_description: str,
         prefill_options: list[str],
     ) -> None:
         super().__init__(timeout=300)
-        self._template_db = template_db
+        self._catalogue = catalogue
         self._embed_color = embed_color
         self.template_name.default = prefill_name[:200]
         self.template_description.default = prefill_description[:500]
@@ -382,8 +491,10 @@ class ConvertPollToTemplateModal(discord.ui.Modal, title="Convert poll to templa
             await interaction.response.send_message(error, ephemeral=True)
             return
 
-        template_id = await self._template_db.create_template(name, description, interaction.user.id)
-        await self._template_db.add_options(template_id, options)
+        template_id = await self._catalogue.db.create_template_with_options(
+            name, description, interaction.user.id, options
+        )
+        await self._catalogue.refresh(template_id)
 
         embed = discord.Embed(
             title="Poll converted to template",
@@ -443,15 +554,11 @@ class UseTemplateModal(discord.ui.Modal, title="Create poll from template"):
             await interaction.response.send_message(error, ephemeral=True)
             return
 
-        poll_id = await self._staffpoll_db.create_poll(
-            title, description, interaction.user.id,
+        poll, staffpoll_options = await self._staffpoll_db.create_poll_with_options(
+            title, description, interaction.user.id, options,
             is_anonymous=self._is_anonymous, max_votes=self._max_votes,
         )
-        await self._staffpoll_db.add_options(poll_id, options)
-
-        poll = await self._staffpoll_db.get_poll(poll_id)
-        staffpoll_options = await self._staffpoll_db.get_options(poll_id)
-        assert poll is not None
+        poll_id = poll.id
 
         embed = _build_poll_embed(
             poll, staffpoll_options, {}, self._embed_color, interaction.user.name
@@ -496,13 +603,13 @@ class EditTemplateModal(discord.ui.Modal, title="Edit poll template"):
 
     def __init__(
         self,
-        template_db: PollTemplateDatabase,
+        catalogue: TemplateCatalogue,
         embed_color: int,
         template: PollTemplate,
         options: list[PollTemplateOption],
     ) -> None:
         super().__init__(timeout=300)
-        self._template_db = template_db
+        self._catalogue = catalogue
         self._embed_color = embed_color
         self._template = template
         self._options = options
@@ -528,8 +635,9 @@ class EditTemplateModal(discord.ui.Modal, title="Edit poll template"):
             )
             return
 
-        await self._template_db.update_template(self._template.id, name, description)
-        await self._template_db.update_option_labels(self._options, new_labels)
+        await self._catalogue.db.update_template(self._template.id, name, description)
+        await self._catalogue.db.update_option_labels(self._options, new_labels)
+        await self._catalogue.refresh(self._template.id)
         await interaction.response.send_message(
             f"Template `#{self._template.id}` updated.", ephemeral=True
         )
@@ -543,20 +651,35 @@ class PollTemplateCog(commands.Cog):
         self,
         bot: commands.Bot,
         template_db: PollTemplateDatabase,
+        catalogue: TemplateCatalogue,
         staffpoll_db: StaffPollDatabase,
         embed_color: int,
         staff_role_id: int,
     ) -> None:
         self.bot = bot
         self.template_db = template_db
+        self.catalogue = catalogue
         self.staffpoll_db = staffpoll_db
         self.embed_color = embed_color
         self.staff_role_id = staff_role_id
 
+    async def cog_load(self) -> None:
+        self.sync_catalogue.start()
+
     async def cog_unload(self) -> None:
+        self.sync_catalogue.cancel()
         await self.template_db.close()
         await self.staffpoll_db.close()
 
+    @tasks.loop(seconds=10)
+    async def sync_catalogue(self) -> None:
+        # Picks up template edits made through the dashboard
+        try:
+            await self.catalogue.sync()
+        except Exception:
+            # An exception would stop the loop for good; serve the last catalogue and retry next tick
+            log.exception("Poll template catalogue sync failed")
+
     poll_template = app_commands.Group(name="poll_template", description="Manage poll templates")
 
     async def _staff_check(self, interaction: discord.Interaction) -> None:
@@ -576,12 +699,33 @@ class PollTemplateCog(commands.Cog):
             return
         raise app_commands.CheckFailure("You do not have permission to use this command.")
 
+    # ---- autocomplete ----
+
+    def _template_choices(self, current: str, include_deleted: bool) -> list[app_commands.Choice[int]]:
+        return [
+            app_commands.Choice(
+                name=f"#{t.id} — {t.name}{' (deleted)' if t.is_deleted else ''}"[:100],
+                value=t.id,
+            )
+            for t in self.catalogue.search(current, include_deleted=include_deleted)
+        ]
+
+    async def active_template_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> list[app_commands.Choice[int]]:
+        return self._template_choices(current, include_deleted=False)
+
+    async def any_template_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> list[app_commands.Choice[int]]:
+        return self._template_choices(current, include_deleted=True)
+
     # ---- commands ----
 
     @poll_template.command(name="create", description="Create a new poll template from scratch")
     async def template_create(self, interaction: discord.Interaction) -> None:
         await self._staff_check(interaction)
-        modal = CreateTemplateModal(template_db=self.template_db, embed_color=self.embed_color)
+        modal = CreateTemplateModal(catalogue=self.catalogue, embed_color=self.embed_color)
         await interaction.response.send_modal(modal)
 
     @poll_template.command(name="from_poll", description="Convert an existing poll into a reusable template")
@@ -598,7 +742,7 @@ class PollTemplateCog(commands.Cog):
 
         options = await self.staffpoll_db.get_options(poll_id)
         modal = ConvertPollToTemplateModal(
-            template_db=self.template_db,
+            catalogue=self.catalogue,
             embed_color=self.embed_color,
             prefill_name=poll.title,
             prefill_description=poll.description,
@@ -608,38 +752,40 @@ class PollTemplateCog(commands.Cog):
 
     @poll_template.command(name="edit", description="Edit a template's name, description, or option labels")
     @app_commands.describe(id="ID of the template to edit")
+    @app_commands.autocomplete(id=active_template_autocomplete)
     async def template_edit(self, interaction: discord.Interaction, id: int) -> None:
         await self._staff_check(interaction)
 
-        template = await self.template_db.get_template(id)
-        if template is None or template.is_deleted:
+        template = self.catalogue.get(id)
+        if template is None:
             await interaction.response.send_message(
                 f"No active template found with ID `{id}`.", ephemeral=True
             )
             return
 
-        options = await self.template_db.get_options(id)
         modal = EditTemplateModal(
-            template_db=self.template_db,
+            catalogue=self.catalogue,
             embed_color=self.embed_color,
             template=template,
-            options=options,
+            options=self.catalogue.options(id),
         )
         await interaction.response.send_modal(modal)
 
     @poll_template.command(name="delete", description="Delete a poll template")
     @app_commands.describe(id="ID of the template to delete")
+    @app_commands.autocomplete(id=active_template_autocomplete)
     async def template_delete(self, interaction: discord.Interaction, id: int) -> None:
         await self._staff_check(interaction)
 
-        template = await self.template_db.get_template(id)
-        if template is None or template.is_deleted:
+        template = self.catalogue.get(id)
+        if template is None:
             await interaction.response.send_message(
                 f"No active template found with ID `{id}`.", ephemeral=True
             )
             return
 
         await self.template_db.delete_template(id)
+        await self.catalogue.refresh(id)
         await interaction.response.send_message(
             f"Template `#{id}` — **{template.name}** has been deleted.", ephemeral=True
         )
@@ -653,7 +799,7 @@ class PollTemplateCog(commands.Cog):
     ) -> None:
         await self._staff_check(interaction)
 
-        templates = await self.template_db.list_templates(include_deleted=(filter == "all"))
+        templates = self.catalogue.list(include_deleted=(filter == "all"))
         if not templates:
             label = "active " if filter == "active" else ""
             await interaction.response.send_message(
@@ -676,12 +822,11 @@ class PollTemplateCog(commands.Cog):
             )
             for t in chunk:
                 status = "Deleted" if t.is_deleted else "Active"
-                options = await self.template_db.get_options(t.id)
                 embed.add_field(
                     name=f"#{t.id} — {t.name}",
                     value=(
                         f"**Status:** {status}\n"
-                        f"**Options:** {len(options)}\n"
+                        f"**Options:** {len(self.catalogue.options(t.id))}\n"
                         f"**Created:** {t.created_at}\n"
                         f"**By:** <@{t.created_by}>"
                     ),
@@ -694,36 +839,40 @@ class PollTemplateCog(commands.Cog):
 
     @poll_template.command(name="view", description="View details and options for a poll template")
     @app_commands.describe(id="ID of the template to view")
+    @app_commands.autocomplete(id=any_template_autocomplete)
     async def template_view(self, interaction: discord.Interaction, id: int) -> None:
         await self._staff_check(interaction)
 
-        template = await self.template_db.get_template(id)
+        template = self.catalogue.get(id, include_deleted=True)
         if template is None:
             await interaction.response.send_message(
                 f"No template found with ID `{id}`.", ephemeral=True
             )
             return
 
-        options = await self.template_db.get_options(id)
         created_by_name = await _resolve_username(interaction.client, template.created_by)  # type: ignore[arg-type]
-        embed = _build_template_detail_embed(template, options, self.embed_color, created_by_name)
+        embed = _build_template_detail_embed(
+            template, self.catalogue.options(id), self.embed_color, created_by_name
+        )
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @poll_template.command(name="preview", description="Preview what a poll from this template would look like")
     @app_commands.describe(id="ID of the template to preview")
+    @app_commands.autocomplete(id=active_template_autocomplete)
     async def template_preview(self, interaction: discord.Interaction, id: int) -> None:
         await self._staff_check(interaction)
 
-        template = await self.template_db.get_template(id)
-        if template is None or template.is_deleted:
+        template = self.catalogue.get(id)
+        if template is None:
             await interaction.response.send_message(
                 f"No active template found with ID `{id}`.", ephemeral=True
             )
             return
 
-        options = await self.template_db.get_options(id)
         created_by_name = await _resolve_username(interaction.client, template.created_by)  # type: ignore[arg-type]
-        embed = _build_template_preview_embed(template, options, self.embed_color, created_by_name)
+        embed = _build_template_preview_embed(
+            template, self.catalogue.options(id), self.embed_color, created_by_name
+        )
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @poll_template.command(name="use", description="Create and post a poll from an existing template")
@@ -733,6 +882,7 @@ class PollTemplateCog(commands.Cog):
         anonymous="Override the template's anonymous setting (omit to use template default)",
         max_votes="Override the template's max votes setting (omit to use template default)",
     )
+    @app_commands.autocomplete(id=active_template_autocomplete)
     async def template_use(
         self,
         interaction: discord.Interaction,
@@ -743,8 +893,8 @@ class PollTemplateCog(commands.Cog):
     ) -> None:
         await self._staff_check(interaction)
 
-        template = await self.template_db.get_template(id)
-        if template is None or template.is_deleted:
+        template = self.catalogue.get(id)
+        if template is None:
             await interaction.response.send_message(
                 f"No active template found with ID `{id}`.", ephemeral=True
             )
@@ -763,14 +913,13 @@ class PollTemplateCog(commands.Cog):
             )
             return
 
-        template_options = await self.template_db.get_options(id)
         modal = UseTemplateModal(
             staffpoll_db=self.staffpoll_db,
             embed_color=self.embed_color,
             target_channel=target,
             prefill_name=template.name,
             prefill_description=template.description,
-            prefill_options=[o.label for o in template_options],
+            prefill_options=[o.label for o in self.catalogue.options(id)],
             is_anonymous=anonymous if anonymous is not None else template.is_anonymous,
             max_votes=max_votes if max_votes is not None else template.max_votes,
         )
@@ -785,6 +934,9 @@ async def setup(bot: commands.Bot) -> None:
     await template_db.connect()
     await template_db.init_schema()
 
+    catalogue = TemplateCatalogue(template_db)
+    await catalogue.load()
+
     # Separate connection to staffpolls.db so the `use` command can create real polls.
     # WAL mode on staffpolls.db allows concurrent readers/writers safely.
     staffpoll_db = StaffPollDatabase()
@@ -799,6 +951,7 @@ async def setup(bot: commands.Bot) -> None:
         PollTemplateCog(
             bot=bot,
             template_db=template_db,
+            catalogue=catalogue,
             staffpoll_db=staffpoll_db,
             embed_color=embed_color,
             staff_role_id=staff_role_id,
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import heapq
+import logging
+import math
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Literal, Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from bot.breaker import ServiceUnavailable
+from bot.cogs.auttaja import ACTION_EMOJIS, AuttajaDB, AuttajaPunishment
+from bot.db import Database, VerbalWarning
+from bot.ui import StreamPagedView
+
+log = logging.getLogger("verbal-bot.profile")
+
+RECENT_DAYS = 30
+# Stop counting "recent" entries past this many; shown as "250+"
+RECENT_SCAN_LIMIT = 250
+SNAPSHOT_TTL = 30.0
+SNAPSHOT_MAX_SIZE = 256
+_PAGE_SIZE = 5
+
+
+# ===== TIMELINE =====
+
+
+def _verbal_epoch(created_at: str) -> float | None:
+    # createdAt is SQLite's datetime('now'): UTC, "YYYY-MM-DD HH:MM:SS"
+    try:
+        dt = datetime.datetime.fromisoformat(created_at)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+@dataclass(slots=True)
+class ProfileEntry:
+    """One row of the merged timeline: a verbal warning or an Auttaja punishment."""
+
+    source: Literal["verbal", "auttaja"]
+    epoch: float | None
+    action: str
+    record: VerbalWarning | AuttajaPunishment
+
+    @property
+    def sort_key(self) -> float:
+        # Undated Auttaja rows come first from Supabase (DESC puts NULLs first); keep them there
+        return math.inf if self.epoch is None else self.epoch
+
+    @classmethod
+    def from_verbal(cls, w: VerbalWarning) -> ProfileEntry:
+        return cls(source="verbal", epoch=_verbal_epoch(w.createdAt), action="verbal", record=w)
+
+    @classmethod
+    def from_auttaja(cls, p: AuttajaPunishment) -> ProfileEntry:
+        return cls(source="auttaja", epoch=p.epoch, action=p.action.lower(), record=p)
+
+
+async def _flatten(windows: AsyncIterator[list], wrap: Callable[..., ProfileEntry]) -> AsyncIterator[ProfileEntry]:
+    try:
+        async for window in windows:
+            for item in window:
+                yield wrap(item)
+    finally:
+        await windows.aclose()
+
+
+async def merge_newest_first(*streams: AsyncIterator[ProfileEntry]) -> AsyncIterator[ProfileEntry]:
+    """k-way merge of streams that are each already sorted newest-first.
+
+    Holds one pending entry per stream in a heap, so memory stays O(k) and
+    a stream is only advanced when its head has been emitted. The first
+    entry of every stream is fetched concurrently.
+    """
+    heads = await asyncio.gather(*(anext(s, None) for s in streams))
+    # (negated key, stream index) is unique per heap entry, so entries are never compared
+    heap = [(-entry.sort_key, i, entry) for i, entry in enumerate(heads) if entry is not None]
+    heapq.heapify(heap)
+    try:
+        while heap:
+            _, i, entry = heap[0]
+            yield entry
+            nxt = await anext(streams[i], None)
+            if nxt is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (-nxt.sort_key, i, nxt))
+    finally:
+        for s in streams:
+            await s.aclose()
+
+
+async def _windowed(entries: AsyncIterator[ProfileEntry], size: int, skip: int = 0) -> AsyncIterator[list[ProfileEntry]]:
+    """Groups a flat stream into lists of `size`, after lazily discarding the first `skip` entries."""
+    batch: list[ProfileEntry] = []
+    try:
+        async for entry in entries:
+            if skip:
+                skip -= 1
+                continue
+            batch.append(entry)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        await entries.aclose()
+
+
+# ===== SNAPSHOT CACHE =====
+
+
+@dataclass(slots=True)
+class ProfileSnapshot:
+    """Counts plus the already-merged head of the timeline for one user."""
+
+    user_id: str
+    verbal_total: int
+    auttaja_total: Optional[int]  # None while Auttaja history is unavailable
+    actions: dict[str, int]
+    recent: Counter[str]
+    recent_truncated: bool
+    head: list[ProfileEntry]
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def total(self) -> int:
+        return self.verbal_total + (self.auttaja_total or 0)
+
+
+class _SnapshotCache:
+    def __init__(self, ttl: float = SNAPSHOT_TTL, max_size: int = SNAPSHOT_MAX_SIZE) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, ProfileSnapshot] = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[ProfileSnapshot]:
+        snap = self._entries.get(user_id)
+        if snap is None:
+            return None
+        if time.monotonic() - snap.created_at > self.ttl:
+            del self._entries[user_id]
+            return None
+        return snap
+
+    def put(self, snap: ProfileSnapshot) -> None:
+        self._entries[snap.user_id] = snap
+        self._entries.move_to_end(snap.user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+# ===== HELPERS =====
+
+
+def _mention(user_id: str | int) -> str:
+    return f"<@{user_id}>"
+
+
+def _parse_user_arg(raw: str) -> str | None:
+    """Accept a raw string that is either a mention (<@123>) or a bare user ID."""
+    raw = raw.strip().lstrip("<@").rstrip(">").strip("!")
+    if raw.isdigit():
+        return raw
+    return None
+
+
+def _action_emoji(action: str) -> str:
+    if action == "verbal":
+        return "🗣️"
+    return ACTION_EMOJIS.get(action, "📋")
+
+
+def _format_counts(counts: dict[str, int]) -> str:
+    if not counts:
+        return "None."
+    return "  ".join(
+        f"{_action_emoji(act)} **{act.upper()}**: `{cnt}`"
+        for act, cnt in sorted(counts.items(), key=lambda x: -x[1])
+    )
+
+
+def _build_entry_field(entry: ProfileEntry) -> tuple[str, str]:
+    when = f"<t:{int(entry.epoch)}:f>" if entry.epoch is not None else "Unknown date"
+    if isinstance(entry.record, VerbalWarning):
+        w = entry.record
+        name = f"{_action_emoji('verbal')} `VERBAL` • ID `{w.id}` • {when}"
+        value = f"**Mod:** {_mention(w.modId)}\n**Evidence:** {w.evidenceLink}\n**Reason:** {w.reason}"
+        return name, value[:1024]
+
+    p = entry.record
+    name = f"{_action_emoji(entry.action)} `{p.action.upper()}` • Auttaja ID `{p.id}` • {when}"
+    lines = [f"**Punisher:** {_mention(p.punisher)}"]
+    if p.reason:
+        lines.append(f"**Reason:** {p.reason[:300]}{'…' if len(p.reason) > 300 else ''}")
+    if p.duration and entry.action in ("mute", "tempban"):
+        lines.append(f"**Duration:** {p.duration_str}")
+    if p.deleted:
+        lines.append(f"🗑️ **Removed by:** {_mention(p.removed_by)} — _{p.removed_reason}_")
+    return name, "\n".join(lines)
+
+
+# ===== COG =====
+
+
+class ProfileCog(commands.Cog):
+    def __init__(
+        self,
+        bot: commands.Bot,
+        db: Database,
+        embed_color: int,
+        staff_role_id: int,
+    ) -> None:
+        self.bot = bot
+        self.db = db
+        self.embed_color = embed_color
+        self.staff_role_id = staff_role_id
+        self.snapshots = _SnapshotCache()
+
+    @property
+    def auttaja_db(self) -> Optional[AuttajaDB]:
+        # The Auttaja cog is optional; without it the profile shows verbal warnings only
+        cog = self.bot.get_cog("AuttajaCog")
+        return getattr(cog, "auttaja_db", None)
+
+    async def _staff_check(self, interaction: discord.Interaction) -> None:
+        if not interaction.guild:
+            raise app_commands.CheckFailure("This command can only be used in a server.")
+        member = interaction.user
+        if not isinstance(member, discord.Member):
+            raise app_commands.CheckFailure("Member context required.")
+        if member.guild_permissions.administrator:
+            return
+        staff_role = interaction.guild.get_role(self.staff_role_id)
+        if staff_role is None:
+            raise app_commands.CheckFailure("STAFF_ROLE_ID is invalid (role not found).")
+        if staff_role in member.roles:
+            return
+        if any(r.position >= staff_role.position for r in member.roles):
+            return
+        raise app_commands.CheckFailure("You do not have permission to use this command.")
+
+    # ---- timeline ----
+
+    def _timeline(self, user_id: str, include_auttaja: bool) -> AsyncIterator[ProfileEntry]:
+        streams = [_flatten(self.db.iter_by_user(int(user_id)), ProfileEntry.from_verbal)]
+        auttaja_db = self.auttaja_db
+        if include_auttaja and auttaja_db is not None:
+            streams.append(
+                _flatten(auttaja_db.iter_punishments("offender", user_id, include_removed=True), ProfileEntry.from_auttaja)
+            )
+        return merge_newest_first(*streams)
+
+    async def _auttaja_counts(self, user_id: str) -> tuple[Optional[int], dict[str, int]]:
+        auttaja_db = self.auttaja_db
+        if auttaja_db is None:
+            return None, {}
+        try:
+            breakdown = await auttaja_db.action_breakdown(user_id, "offender")
+        except ServiceUnavailable as exc:
+            log.warning("Profile for %s without Auttaja history: %s", user_id, exc)
+            return None, {}
+        # The breakdown includes removed rows, so it sums to the full count
+        return sum(breakdown.values()), breakdown
+
+    async def _load_snapshot(self, user_id: str) -> tuple[ProfileSnapshot, AsyncIterator[ProfileEntry]]:
+        """Builds a fresh snapshot and returns it with the timeline positioned just past its head."""
+        verbal_total, (auttaja_total, breakdown) = await asyncio.gather(
+            self.db.count_by_user(int(user_id)),
+            self._auttaja_counts(user_id),
+        )
+
+        timeline = self._timeline(user_id, include_auttaja=auttaja_total is not None)
+        cutoff = time.time() - RECENT_DAYS * 86400
+        head: list[ProfileEntry] = []
+        recent: Counter[str] = Counter()
+        truncated = False
+        # Read only as far as the 30-day boundary (and at least one page) — never the whole history
+        async for entry in timeline:
+            head.append(entry)
+            if entry.sort_key >= cutoff:
+                recent[entry.action] += 1
+                if len(head) >= RECENT_SCAN_LIMIT:
+                    truncated = True
+                    break
+            elif len(head) >= _PAGE_SIZE:
+                break
+
+        actions = dict(breakdown)
+        if verbal_total:
+            actions["verbal"] = verbal_total
+        snap = ProfileSnapshot(
+            user_id=user_id,
+            verbal_total=verbal_total,
+            auttaja_total=auttaja_total,
+            actions=actions,
+            recent=recent,
+            recent_truncated=truncated,
+            head=head,
+        )
+        # Don't pin a partial profile for the whole TTL while Supabase is down
+        if auttaja_total is not None or self.auttaja_db is None:
+            self.snapshots.put(snap)
+        return snap, timeline
+
+    # ---- /profile ----
+
+    @app_commands.command(name="profile", description="Show a user's verbal warnings and Auttaja punishments as one timeline")
+    @app_commands.describe(user="User mention or user ID")
+    async def profile(self, interaction: discord.Interaction, user: str) -> None:
+        await self._staff_check(interaction)
+
+        user_id = _parse_user_arg(user)
+        if user_id is None:
+            await interaction.response.send_message(
+                "Please provide a valid user mention or user ID.", ephemeral=True
+            )
+            return
+
+        snap = self.snapshots.get(user_id)
+        if snap is not None:
+            # Repeat view: show the cached head now, re-read past it only if paged into
+            await interaction.response.defer(ephemeral=False)
+            rest = _windowed(self._timeline(user_id, snap.auttaja_total is not None), _PAGE_SIZE, skip=len(snap.head))
+        else:
+            _, (snap, timeline) = await asyncio.gather(
+                interaction.response.defer(ephemeral=False),
+                self._load_snapshot(user_id),
+            )
+            rest = _windowed(timeline, _PAGE_SIZE)
+
+        if not snap.head:
+            await rest.aclose()
+            msg = f"No verbal warnings or Auttaja punishments found for {_mention(user_id)} (`{user_id}`)."
+            if snap.auttaja_total is None and self.auttaja_db is not None:
+                msg += " (Auttaja history is currently unavailable.)"
+            await interaction.followup.send(msg, ephemeral=True)
+            return
+
+        recent_total = sum(snap.recent.values())
+        recent_str = f"{recent_total}+" if snap.recent_truncated else str(recent_total)
+        auttaja_str = "unavailable" if snap.auttaja_total is None else str(snap.auttaja_total)
+        header = (
+            f"**User:** {_mention(user_id)} (`{user_id}`)\n"
+            f"**Total:** `{snap.total}` (verbal `{snap.verbal_total}`, Auttaja `{auttaja_str}`)\n"
+            f"**By action:** {_format_counts(snap.actions)}\n"
+            f"**Last {RECENT_DAYS} days:** `{recent_str}` — {_format_counts(dict(snap.recent))}"
+        )
+
+        def build_page(chunk: list[ProfileEntry], page_index: int, page_count: int) -> discord.Embed:
+            embed = discord.Embed(
+                title="Moderation Profile",
+                color=self.embed_color,
+                description=f"{header}\n**Page:** `{page_index}/{page_count}`",
+            )
+            for entry in chunk:
+                field_name, field_value = _build_entry_field(entry)
+                embed.add_field(name=field_name, value=field_value, inline=False)
+            return embed
+
+        view = StreamPagedView(
+            rest, snap.head, snap.total, build_page, author_id=interaction.user.id, page_size=_PAGE_SIZE
+        )
+        await interaction.followup.send(embed=view.current_embed(), view=view)
+
+
+async def setup(bot: commands.Bot) -> None:
+    db: Database = bot.db  # type: ignore[attr-defined]
+    await bot.add_cog(
+        ProfileCog(
+            bot=bot,
+            db=db,
+            embed_color=bot.embed_color,  # type: ignore[attr-defined]
+            staff_role_id=bot.staff_role_id,  # type: ignore[attr-defined]
+        )
+    )
@@ -11,6 +11,7 @@ from discord.ext import commands
 
 from bot.db import Database
 from bot.ui import PagedEmbedsView
+from bot.users import UserDirectory
 from typing import Literal, List
 
 
@@ -18,6 +19,7 @@ class UtilityCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.db: Database = bot.db  # type: ignore[attr-defined]
+        self.user_directory: UserDirectory = bot.user_directory  # type: ignore[attr-defined]
 
     # ======================
     # BASIC COMMANDS
@@ -108,6 +110,28 @@ class UtilityCog(commands.Cog):
         )
         embed.add_field(name="Total Commands", value=str(total_commands), inline=False)
 
+        user_stats = self.user_directory.stats()
+        embed.add_field(
+            name="User Cache",
+            value=(
+                f"{user_stats['size']} cached, {user_stats['hit_rate']:.0%} hit rate, "
+                f"{user_stats['rest_calls']} REST lookups"
+            ),
+            inline=False,
+        )
+
+        breaker = getattr(self.bot, "supabase_breaker", None)
+        if breaker is not None:
+            stats = breaker.stats()
+            embed.add_field(
+                name="Supabase",
+                value=(
+                    f"Circuit `{stats['state']}`, {stats['timeouts']} timeouts, "
+                    f"{stats['rejected']} fast-failed calls"
+                ),
+                inline=False,
+            )
+
         await interaction.followup.send(embed=embed, ephemeral=False)
 
     # ======================
@@ -263,18 +287,9 @@ class UtilityCog(commands.Cog):
             ids = {w.modId for w in warnings}
             title = "Moderators in Database"
 
-        lines = []
-
-        for user_id in ids:
-            user = interaction.guild.get_member(user_id) if interaction.guild else None
-            if user is None:
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                except Exception:
-                    lines.append(f"UnknownUser - {user_id}")
-                    continue
-
-            lines.append(f"{user.name} - {user_id}")
+        # Gateway cache, then the user_directory table; REST only for users never seen
+        names = await self.user_directory.get_names(ids)
+        lines = [f"{names.get(user_id) or 'UnknownUser'} - {user_id}" for user_id in ids]
 
         if not lines:
             await interaction.followup.send("No users found.", ephemeral=True)
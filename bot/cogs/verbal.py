@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 from collections import Counter
 from typing import Optional
 from typing import Literal
@@ -8,6 +9,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from bot.charts import ChartRenderer
 from bot.checks import has_staff_role_or_above
 from bot.db import Database, VerbalWarning
 from bot.ui import PagedEmbedsView
@@ -318,6 +320,52 @@ class VerbalCog(commands.Cog):
         )
 
 
+    @verbal.command(name="trend", description="Chart verbal warnings per week")
+    @app_commands.describe(weeks="How many weeks to show (2-52, default: 12)")
+    async def verbal_trend(
+        self,
+        interaction: discord.Interaction,
+        weeks: app_commands.Range[int, 2, 52] = 12,
+    ) -> None:
+        await self._staff_check(interaction)
+
+        await interaction.response.defer(thinking=True)
+
+        histogram = await self.db.weekly_counts(weeks)
+        week_starts = [w for w, _ in histogram]
+        counts = [c for _, c in histogram]
+        total = sum(counts)
+
+        embed = discord.Embed(
+            title="Verbal warnings per week",
+            color=self.embed_color,
+            description=(
+                f"**Range:** `{week_starts[0]}` → `{week_starts[-1]}` ({weeks} weeks)\n"
+                f"**Total warnings:** `{total}`\n"
+                f"**Busiest week:** `{max(counts)}` warnings"
+            ),
+        )
+
+        charts: Optional[ChartRenderer] = getattr(self.bot, "charts", None)
+        png = await charts.weekly_trend(
+            f"Verbal warnings per week (last {weeks})", week_starts, counts, self.embed_color
+        ) if charts else None
+
+        if png is None:
+            # No chart backend: fall back to a text histogram
+            embed.add_field(
+                name="Weekly counts",
+                value="\n".join(f"`{w}` {'█' * min(c, 30)} {c}" for w, c in histogram),
+                inline=False,
+            )
+            await interaction.followup.send(embed=embed)
+            return
+
+        embed.set_image(url="attachment://warning_trend.png")
+        await interaction.followup.send(
+            embed=embed, file=discord.File(io.BytesIO(png), filename="warning_trend.png")
+        )
+
     @verbal.command(name="search", description="Search a user's verbal warnings")
     async def verbal_search(self, interaction: discord.Interaction, user: discord.User) -> None:
         await self._staff_check(interaction)
@@ -11,6 +11,11 @@ class Settings:
     log_channel_id: int
     staff_role_id: int
     embed_color: int
+    vote_throttle_burst: int = 3
+    vote_throttle_refill: float = 2.0
+    supabase_timeout: float = 5.0
+    supabase_breaker_threshold: int = 5
+    supabase_breaker_reset: float = 30.0
 
 
 def _parse_hex_color(value: str) -> int:
@@ -34,6 +39,13 @@ def load_settings() -> Settings:
     embed_color_raw = os.getenv("EMBED_COLOR", "0x007FFF").strip()
     embed_color = _parse_hex_color(embed_color_raw)
 
+    vote_throttle_burst = int(os.getenv("VOTE_THROTTLE_BURST", "3"))
+    vote_throttle_refill = float(os.getenv("VOTE_THROTTLE_REFILL", "2.0"))
+
+    supabase_timeout = float(os.getenv("SUPABASE_TIMEOUT", "5.0"))
+    supabase_breaker_threshold = int(os.getenv("SUPABASE_BREAKER_THRESHOLD", "5"))
+    supabase_breaker_reset = float(os.getenv("SUPABASE_BREAKER_RESET", "30.0"))
+
     if log_channel_id <= 0:
         raise RuntimeError("LOG_CHANNEL_ID must be set to a valid channel ID")
     if staff_role_id <= 0:
@@ -44,4 +56,9 @@ def load_settings() -> Settings:
         log_channel_id=log_channel_id,
         staff_role_id=staff_role_id,
         embed_color=embed_color,
+        vote_throttle_burst=max(1, vote_throttle_burst),
+        vote_throttle_refill=max(0.1, vote_throttle_refill),
+        supabase_timeout=max(0.5, supabase_timeout),
+        supabase_breaker_threshold=max(1, supabase_breaker_threshold),
+        supabase_breaker_reset=max(1.0, supabase_breaker_reset),
     )
\ No newline at end of file
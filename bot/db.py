@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import datetime
 from dataclasses import dataclass
-from typing import Optional, Sequence
+from typing import AsyncIterator, Optional, Sequence
 
 import aiosqlite
 
 
+# (id, name, global_name, avatar hash)
+DirectoryRow = tuple[int, str, Optional[str], Optional[str]]
+
+
 @dataclass(slots=True)
 class VerbalWarning:
     id: int
@@ -56,6 +61,18 @@ class Database:
         await self.conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_vw_userId ON verbal_warnings(userId);"
         )
+        # Kept current from gateway events; the dashboard reads names from here too
+        await self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_directory (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                global_name TEXT,
+                avatar TEXT,
+                updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+            );
+            """
+        )
         await self.conn.commit()
 
     async def add_warning(self, user_id: int, reason: str, evidence_link: str, mod_id: int) -> int:
@@ -97,6 +114,57 @@ class Database:
         rows = await cur.fetchall()
         return [self._row_to_warning(r) for r in rows if r is not None]
 
+    async def count_by_user(self, user_id: int) -> int:
+        cur = await self.conn.execute("SELECT COUNT(*) FROM verbal_warnings WHERE userId = ?", (user_id,))
+        row = await cur.fetchone()
+        return int(row[0])
+
+    async def iter_by_user(self, user_id: int, window: int = 50) -> AsyncIterator[list[VerbalWarning]]:
+        """Yields a user's warnings newest-first, `window` rows at a time (keyset on id)."""
+        before: int | None = None
+        while True:
+            cur = await self.conn.execute(
+                """
+                SELECT id, createdAt, userId, reason, evidenceLink, modId
+                FROM verbal_warnings
+                WHERE userId = ? AND (? IS NULL OR id < ?)
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (user_id, before, before, window),
+            )
+            rows = [self._row_to_warning(r) for r in await cur.fetchall() if r is not None]
+            if rows:
+                yield rows
+            if len(rows) < window:
+                return
+            before = rows[-1].id
+
+    async def weekly_counts(self, weeks: int) -> list[tuple[str, int]]:
+        """Returns (week_start, count) for the last `weeks` weeks, oldest first.
+
+        Weeks start on Monday; weeks with no warnings are included with a count of 0.
+        """
+        cur = await self.conn.execute(
+            """
+            SELECT date(createdAt, 'weekday 0', '-6 days') AS week, COUNT(*) AS cnt
+            FROM verbal_warnings
+            WHERE createdAt >= date('now', 'weekday 0', ?)
+            GROUP BY week
+            """,
+            (f"-{weeks * 7 - 1} days",),
+        )
+        counts = {str(r["week"]): int(r["cnt"]) for r in await cur.fetchall()}
+
+        cur = await self.conn.execute("SELECT date('now', 'weekday 0', '-6 days') AS week")
+        row = await cur.fetchone()
+        this_week = datetime.date.fromisoformat(str(row["week"]))
+        starts = [
+            (this_week - datetime.timedelta(weeks=i)).isoformat()
+            for i in range(weeks - 1, -1, -1)
+        ]
+        return [(w, counts.get(w, 0)) for w in starts]
+
     async def delete_warning(self, warning_id: int) -> int:
         cur = await self.conn.execute("DELETE FROM verbal_warnings WHERE id = ?", (warning_id,))
         await self.conn.commit()
@@ -121,6 +189,41 @@ class Database:
         await self.conn.commit()
         return cur.rowcount
 
+    # ---- user directory ----
+
+    async def upsert_directory(self, rows: Sequence[DirectoryRow]) -> None:
+        """Writes (id, name, global_name, avatar) rows in one transaction; unchanged rows are left alone."""
+        if not rows:
+            return
+        await self.conn.executemany(
+            """
+            INSERT INTO user_directory (id, name, global_name, avatar)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                name = excluded.name,
+                global_name = excluded.global_name,
+                avatar = excluded.avatar,
+                updated_at = datetime('now')
+            WHERE name IS NOT excluded.name
+               OR global_name IS NOT excluded.global_name
+               OR avatar IS NOT excluded.avatar
+            """,
+            rows,
+        )
+        await self.conn.commit()
+
+    async def directory_names(self, user_ids: Sequence[int]) -> dict[int, str]:
+        names: dict[int, str] = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(user_ids), 500):
+            batch = user_ids[start:start + 500]
+            cur = await self.conn.execute(
+                f"SELECT id, name FROM user_directory WHERE id IN ({','.join('?' * len(batch))})",
+                tuple(batch),
+            )
+            names.update((int(r["id"]), str(r["name"])) for r in await cur.fetchall())
+        return names
+
     @staticmethod
     def _row_to_warning(row: aiosqlite.Row | None) -> Optional[VerbalWarning]:
         if row is None:
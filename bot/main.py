@@ -5,10 +5,15 @@ import logging
 import os
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 
+from bot.breaker import CircuitBreaker, ServiceUnavailable
+from bot.charts import ChartRenderer
 from bot.config import Settings, load_settings
 from bot.db import Database
+from bot.ratelimit import Throttled
+from bot.users import UserDirectory
 
 
 logging.basicConfig(
@@ -43,10 +48,27 @@ class VerbalWarningsBot(commands.Bot):
         # Shared DB (SQLite, for verbal warnings)
         self.db = Database(path="warnings.db")
 
+        # Off-loop PNG chart rendering (poll results, warning trends)
+        self.charts = ChartRenderer()
+
+        # Cached username lookups shared by every cog
+        self.user_directory = UserDirectory(self, self.db)
+
+        # Fails Supabase calls fast while it is down (used by the Auttaja cog)
+        self.supabase_breaker = CircuitBreaker(
+            "Supabase",
+            failure_threshold=settings.supabase_breaker_threshold,
+            reset_timeout=settings.supabase_breaker_reset,
+            timeout=settings.supabase_timeout,
+        )
+
     async def setup_hook(self) -> None:
         # DB
         await self.db.connect()
         await self.db.init_schema()
+        self.user_directory.start()
+
+        self.tree.error(self.on_app_command_error)
 
         # Load cogs
         await self.load_extension("bot.cogs.help")
@@ -55,6 +77,7 @@ class VerbalWarningsBot(commands.Bot):
         await self.load_extension("bot.cogs.polls")
         await self.load_extension("bot.cogs.polls_template")
         await self.load_extension("bot.cogs.auttaja")
+        await self.load_extension("bot.cogs.profile")
 
         # Sync commands globally (can take time) — you can switch to guild sync during dev.
         synced = await self.tree.sync()
@@ -62,12 +85,44 @@ class VerbalWarningsBot(commands.Bot):
         log.info("App commands synced")
 
     async def close(self) -> None:
+        await self.user_directory.close()
         await self.db.close()
+        self.charts.close()
         await super().close()
 
+    async def on_app_command_error(
+        self, interaction: discord.Interaction, error: app_commands.AppCommandError
+    ) -> None:
+        # Throttled users have already been answered by the check itself
+        if isinstance(error, Throttled):
+            return
+        original = getattr(error, "original", None)
+        if isinstance(original, ServiceUnavailable):
+            log.warning("%s: %s", interaction.command.qualified_name if interaction.command else "?", original)
+            msg = f"{original.service} is temporarily unavailable — please try again in a minute."
+            if interaction.response.is_done():
+                await interaction.followup.send(msg, ephemeral=True)
+            else:
+                await interaction.response.send_message(msg, ephemeral=True)
+            return
+        await app_commands.CommandTree.on_error(self.tree, interaction, error)
+
     async def on_ready(self) -> None:
         self.start_time = discord.utils.utcnow()
         log.info("Logged in as %s (ID: %s)", self.user, self.user.id if self.user else "?")
+        # Guild members have been chunked in by now (members intent); unchanged rows are skipped on upsert
+        self.user_directory.record_many(m for guild in self.guilds for m in guild.members)
+
+    # Keep the shared user_directory table current from the gateway
+
+    async def on_member_join(self, member: discord.Member) -> None:
+        self.user_directory.record(member)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        self.user_directory.record_if_changed(before, after)
+
+    async def on_user_update(self, before: discord.User, after: discord.User) -> None:
+        self.user_directory.record_if_changed(before, after)
 
 
 def main() -> None:
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import functools
+import time
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+import discord
+from discord import app_commands
+
+T = TypeVar("T")
+KeyFunc = Callable[[discord.Interaction], Hashable]
+
+
+class Throttled(app_commands.CheckFailure):
+    """Raised by `throttle_check` after the user has already been told to slow down."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Throttled, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """In-memory token buckets, one per key.
+
+    Each bucket holds up to `burst` tokens and regains one every
+    `refill_every` seconds. A hit costs one token.
+    """
+
+    def __init__(self, burst: int, refill_every: float, max_keys: int = 10_000) -> None:
+        self.burst = burst
+        self.refill_every = refill_every
+        self.max_keys = max_keys
+        # key -> (tokens, last_update)
+        self._buckets: dict[Hashable, tuple[float, float]] = {}
+        self.allowed = 0
+        self.throttled = 0
+
+    def configure(self, burst: int, refill_every: float) -> None:
+        self.burst = burst
+        self.refill_every = refill_every
+        self._buckets.clear()
+
+    def hit(self, key: Hashable) -> float:
+        """Consumes a token for `key`. Returns 0 if allowed, else seconds until the next token."""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - last) / self.refill_every)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            self.throttled += 1
+            return (1 - tokens) * self.refill_every
+
+        self._buckets[key] = (tokens - 1, now)
+        self.allowed += 1
+        if len(self._buckets) > self.max_keys:
+            self._prune(now)
+        return 0.0
+
+    def _prune(self, now: float) -> None:
+        # Buckets that have fully refilled carry no state worth keeping
+        full_after = self.burst * self.refill_every
+        for key in [k for k, (_, last) in self._buckets.items() if now - last >= full_after]:
+            del self._buckets[key]
+
+
+# ===== KEYS =====
+
+
+def by_user(interaction: discord.Interaction) -> Hashable:
+    return interaction.user.id
+
+
+def by_user_and_message(interaction: discord.Interaction) -> Hashable:
+    """One bucket per user per message, e.g. per (user, poll) for poll buttons."""
+    message_id = interaction.message.id if interaction.message else 0
+    return (interaction.user.id, message_id)
+
+
+def _slow_down_message(retry_after: float) -> str:
+    return f"You're going too fast — try again in {max(retry_after, 0.1):.1f}s."
+
+
+# ===== DECORATORS =====
+
+
+def throttled(
+    limiter: RateLimiter, key: KeyFunc = by_user
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T | None]]]:
+    """Decorator for component callbacks and view handlers taking `(self, interaction, ...)`.
+
+    Throttled interactions are answered with an ephemeral notice and the
+    wrapped handler is never called.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T | None]]:
+        @functools.wraps(func)
+        async def wrapper(self: Any, interaction: discord.Interaction, *args: Any, **kwargs: Any) -> T | None:
+            retry_after = limiter.hit(key(interaction))
+            if retry_after:
+                await interaction.response.send_message(_slow_down_message(retry_after), ephemeral=True)
+                return None
+            return await func(self, interaction, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def throttle_check(limiter: RateLimiter, key: KeyFunc = by_user) -> Callable[[T], T]:
+    """`app_commands` check for slash commands; raises `Throttled` after replying."""
+
+    async def predicate(interaction: discord.Interaction) -> bool:
+        retry_after = limiter.hit(key(interaction))
+        if retry_after:
+            await interaction.response.send_message(_slow_down_message(retry_after), ephemeral=True)
+            raise Throttled(retry_after)
+        return True
+
+    return app_commands.check(predicate)
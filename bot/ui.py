@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from typing import Callable
+import asyncio
+from typing import AsyncIterator, Callable, Generic, TypeVar
 
 import discord
 
+from bot.breaker import ServiceUnavailable
+
+T = TypeVar("T")
+
 
 class PagedEmbedsView(discord.ui.View):
     def __init__(
@@ -42,4 +47,108 @@ class PagedEmbedsView(discord.ui.View):
     @discord.ui.button(label="Close", style=discord.ButtonStyle.danger)
     async def close_button(self, interaction: discord.Interaction, button: discord.ui.Button):  # type: ignore[override]
         await interaction.response.edit_message(view=None)
-        self.stop()
\ No newline at end of file
+        self.stop()
+
+
+class StreamPagedView(discord.ui.View, Generic[T]):
+    """Pages through an async stream of windows (lists of items).
+
+    Only the windows the user has actually paged into are fetched; `total`,
+    when known up front, is used for the page count.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterator[list[T]],
+        first_window: list[T],
+        total: int | None,
+        build_page: Callable[[list[T], int, int], discord.Embed],
+        author_id: int,
+        page_size: int = 5,
+        timeout: float = 180,
+    ) -> None:
+        super().__init__(timeout=timeout)
+        self._stream = stream
+        self._rows = list(first_window)
+        self._exhausted = False
+        # An async generator can't be advanced by two button presses at once
+        self._fetch_lock = asyncio.Lock()
+        self._build_page = build_page
+        self.total = total
+        self.page_size = page_size
+        self.author_id = author_id
+        self.index = 0
+        self._sync_buttons()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+
+    async def _close_stream(self) -> None:
+        # Waits out a fetch in flight: closing a running generator raises
+        async with self._fetch_lock:
+            self._exhausted = True
+            await self._stream.aclose()
+
+    async def on_timeout(self) -> None:
+        await self._close_stream()
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item) -> None:
+        if isinstance(error, ServiceUnavailable):
+            message = f"{error.service} is temporarily unavailable — please try again in a minute."
+            if interaction.response.is_done():
+                await interaction.followup.send(message, ephemeral=True)
+            else:
+                await interaction.response.send_message(message, ephemeral=True)
+            return
+        await super().on_error(interaction, error, item)
+
+    @property
+    def page_count(self) -> int:
+        known = max(self.total or 0, len(self._rows))
+        return max(1, (known - 1) // self.page_size + 1)
+
+    def current_embed(self) -> discord.Embed:
+        start = self.index * self.page_size
+        chunk = self._rows[start:start + self.page_size]
+        return self._build_page(chunk, self.index + 1, self.page_count)
+
+    async def _ensure_page(self, index: int) -> None:
+        needed = (index + 1) * self.page_size
+        async with self._fetch_lock:
+            while len(self._rows) < needed and not self._exhausted:
+                window = await anext(self._stream, None)
+                if window is None:
+                    self._exhausted = True
+                else:
+                    self._rows.extend(window)
+
+    def _sync_buttons(self) -> None:
+        if self.total is None:
+            more_upstream = not self._exhausted
+        else:
+            more_upstream = not self._exhausted and len(self._rows) < self.total
+        has_more = len(self._rows) > (self.index + 1) * self.page_size or more_upstream
+        self.prev_button.disabled = self.index <= 0
+        self.next_button.disabled = not has_more
+
+    @discord.ui.button(label="Prev", style=discord.ButtonStyle.secondary)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):  # type: ignore[override]
+        self.index -= 1
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.current_embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):  # type: ignore[override]
+        # Acknowledged first: fetching the next window can outlast the 3s interaction deadline
+        await interaction.response.defer()
+        await self._ensure_page(self.index + 1)
+        if len(self._rows) > (self.index + 1) * self.page_size:
+            self.index += 1
+        self._sync_buttons()
+        await interaction.edit_original_response(embed=self.current_embed(), view=self)
+
+    @discord.ui.button(label="Close", style=discord.ButtonStyle.danger)
+    async def close_button(self, interaction: discord.Interaction, button: discord.ui.Button):  # type: ignore[override]
+        await interaction.response.edit_message(view=None)
+        self.stop()
+        await self._close_stream()
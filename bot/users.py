@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import discord
+
+from bot.db import Database, DirectoryRow
+
+log = logging.getLogger("verbal-bot.users")
+
+
+def _directory_row(user: discord.abc.User) -> DirectoryRow:
+    return (user.id, user.name, user.global_name, user.avatar.key if user.avatar else None)
+
+
+class UserDirectory:
+    """Bot-wide username lookup with an LRU+TTL cache in front of `fetch_user`.
+
+    - The gateway cache (`client.get_user`) is always checked first and is free.
+    - Then the `user_directory` table, which `record()` keeps current from
+      gateway events (buffered, upserted in batches every `flush_interval`).
+      It also holds users the bot no longer shares a guild with, and the
+      dashboard reads names from it.
+    - Deleted/unknown users are cached negatively so they are not re-fetched.
+    - Concurrent lookups of the same ID share one REST request.
+    - Bulk lookups run with bounded concurrency.
+    """
+
+    def __init__(
+        self,
+        client: discord.Client,
+        db: Optional[Database] = None,
+        max_size: int = 5000,
+        ttl: float = 3600,
+        negative_ttl: float = 600,
+        concurrency: int = 5,
+        flush_interval: float = 5.0,
+        flush_batch: int = 1000,
+    ) -> None:
+        self.client = client
+        self.db = db
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.concurrency = concurrency
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+
+        # user_id -> (expires_at, name or None for "does not exist")
+        self._cache: OrderedDict[int, tuple[float, Optional[str]]] = OrderedDict()
+        self._inflight: dict[int, asyncio.Future[Optional[str]]] = {}
+        # Rows waiting for the next batched upsert, latest wins
+        self._dirty: dict[int, DirectoryRow] = {}
+        self._flush_task: Optional[asyncio.Task[None]] = None
+
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.rest_calls = 0
+        self.errors = 0
+        self.written = 0
+
+    # ---- cache primitives ----
+
+    def _get_cached(self, user_id: int) -> tuple[bool, Optional[str]]:
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return False, None
+        expires_at, name = entry
+        if expires_at < time.monotonic():
+            del self._cache[user_id]
+            return False, None
+        self._cache.move_to_end(user_id)
+        return True, name
+
+    def _store(self, user_id: int, name: Optional[str]) -> None:
+        ttl = self.ttl if name is not None else self.negative_ttl
+        self._cache[user_id] = (time.monotonic() + ttl, name)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def prime(self, user_id: int, name: str) -> None:
+        """Seed the cache with a name learned elsewhere (e.g. a gateway event)."""
+        self._store(user_id, name)
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.pop(user_id, None)
+
+    # ---- user_directory table ----
+
+    def record(self, user: discord.abc.User) -> None:
+        """Queues a gateway-seen user for the next batched upsert."""
+        self._dirty[user.id] = _directory_row(user)
+        self._store(user.id, user.name)
+
+    def record_many(self, users: Iterable[discord.abc.User]) -> None:
+        for user in users:
+            self.record(user)
+
+    def record_if_changed(self, before: discord.abc.User, after: discord.abc.User) -> None:
+        if _directory_row(before) != _directory_row(after):
+            self.record(after)
+
+    async def flush(self) -> None:
+        if self.db is None or not self._dirty:
+            return
+        rows = list(self._dirty.values())
+        self._dirty.clear()
+        for start in range(0, len(rows), self.flush_batch):
+            batch = rows[start:start + self.flush_batch]
+            try:
+                await self.db.upsert_directory(batch)
+            except Exception:
+                # Keep unwritten rows for the next flush unless a newer one arrived meanwhile
+                for row in rows[start:]:
+                    self._dirty.setdefault(row[0], row)
+                raise
+            self.written += len(batch)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("user_directory flush failed")
+
+    def start(self) -> None:
+        if self.db is not None and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def _lookup_stored(self, user_ids: list[int]) -> dict[int, str]:
+        if self.db is None or not user_ids:
+            return {}
+        stored = await self.db.directory_names(user_ids)
+        for uid, name in stored.items():
+            self.db_hits += 1
+            self._store(uid, name)
+        return stored
+
+    # ---- lookups ----
+
+    def _get_local(self, user_id: int) -> tuple[bool, Optional[str]]:
+        user = self.client.get_user(user_id)
+        if user is not None:
+            self.hits += 1
+            return True, user.name
+        found, name = self._get_cached(user_id)
+        if found:
+            self.hits += 1
+        return found, name
+
+    async def get_name(self, user_id: int) -> Optional[str]:
+        """Returns the username, or None if the user does not exist or cannot be fetched."""
+        found, name = self._get_local(user_id)
+        if found:
+            return name
+
+        stored = await self._lookup_stored([user_id])
+        if user_id in stored:
+            return stored[user_id]
+
+        return await self._fetch_shared(user_id)
+
+    async def _fetch_shared(self, user_id: int) -> Optional[str]:
+        pending = self._inflight.get(user_id)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future: asyncio.Future[Optional[str]] = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = future
+        try:
+            name = await self._fetch(user_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so waiter-less failures don't log "never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(name)
+        finally:
+            self._inflight.pop(user_id, None)
+        return name
+
+    async def _fetch(self, user_id: int) -> Optional[str]:
+        self.rest_calls += 1
+        try:
+            user = await self.client.fetch_user(user_id)
+        except discord.NotFound:
+            self._store(user_id, None)
+            return None
+        except discord.HTTPException as exc:
+            # Transient failure: don't cache, let the next caller retry
+            self.errors += 1
+            log.warning("fetch_user(%s) failed: %s", user_id, exc)
+            return None
+        self.record(user)
+        return user.name
+
+    async def get_names(self, user_ids: Iterable[int]) -> dict[int, Optional[str]]:
+        """Resolves many IDs at once: one table query for everything not cached,
+        then at most `concurrency` REST calls in flight for the rest."""
+        names: dict[int, Optional[str]] = {}
+        missing: list[int] = []
+        for uid in set(user_ids):
+            found, name = self._get_local(uid)
+            if found:
+                names[uid] = name
+            else:
+                missing.append(uid)
+
+        stored = await self._lookup_stored(missing)
+        names.update(stored)
+        missing = [uid for uid in missing if uid not in stored]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(uid: int) -> tuple[int, Optional[str]]:
+            async with semaphore:
+                return uid, await self._fetch_shared(uid)
+
+        names.update(await asyncio.gather(*(one(uid) for uid in missing)))
+        return names
+
+    # ---- stats ----
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.db_hits + self.misses
+        return (self.hits + self.db_hits) / total if total else 0.0
+
+    def stats(self) -> dict[str, float | int]:
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "written": self.written,
+            "pending": len(self._dirty),
+            "hit_rate": round(self.hit_rate, 3),
+            "rest_calls": self.rest_calls,
+            "errors": self.errors,
+        }
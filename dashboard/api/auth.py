@@ -18,8 +18,8 @@ from .config import (
     JWT_SECRET,
     STAFF_ROLE_ID,
 )
+from .discord_rest import discord_rest
 
-DISCORD_API = "https://discord.com/api/v10"
 security = HTTPBearer()
 router = APIRouter()
 
@@ -48,11 +48,9 @@ async def get_current_user(
 
 
 async def _discord_get(path: str, token: str, bot: bool = False) -> dict:
-    headers = {"Authorization": f"Bot {token}" if bot else f"Bearer {token}"}
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(f"{DISCORD_API}{path}", headers=headers)
-        resp.raise_for_status()
-        return resp.json()
+    resp = await discord_rest.get(path, auth="bot" if bot else "bearer", token=token)
+    resp.raise_for_status()
+    return resp.json()
 
 
 async def check_staff_access(user_id: str) -> bool:
@@ -103,20 +101,20 @@ async def login():
 
 @router.get("/callback")
 async def callback(code: str):
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post(
-            f"{DISCORD_API}/oauth2/token",
-            data={
-                "client_id": DISCORD_CLIENT_ID,
-                "client_secret": DISCORD_CLIENT_SECRET,
-                "grant_type": "authorization_code",
-                "code": code,
-                "redirect_uri": DISCORD_REDIRECT_URI,
-            },
-        )
-        if token_resp.status_code != 200:
-            return RedirectResponse(f"{DASHBOARD_ORIGIN}/#/login?error=oauth_failed")
-        token_data = token_resp.json()
+    token_resp = await discord_rest.post(
+        "/oauth2/token",
+        auth="none",
+        data={
+            "client_id": DISCORD_CLIENT_ID,
+            "client_secret": DISCORD_CLIENT_SECRET,
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": DISCORD_REDIRECT_URI,
+        },
+    )
+    if token_resp.status_code != 200:
+        return RedirectResponse(f"{DASHBOARD_ORIGIN}/#/login?error=oauth_failed")
+    token_data = token_resp.json()
 
     access_token = token_data.get("access_token")
     if not access_token:
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class ServiceUnavailable(Exception):
+    def __init__(self, service: str, reason: str) -> None:
+        super().__init__(f"{service} unavailable: {reason}")
+        self.service = service
+        self.reason = reason
+
+
+class CircuitBreaker:
+    """Fails fast after `failure_threshold` consecutive errors or timeouts.
+
+    After `reset_timeout` seconds one probe request is let through
+    (half-open); success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        timeout: float = 5.0,
+        is_failure: Callable[[BaseException], bool] = lambda exc: True,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.timeout = timeout
+        self.is_failure = is_failure
+
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+        self.calls = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def _admit(self) -> None:
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise ServiceUnavailable(self.name, "circuit open")
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                self.trips += 1
+            self._opened_at = time.monotonic()
+
+    def _record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self._admit()
+        self.calls += 1
+        probing = self._probing
+        try:
+            result = await asyncio.wait_for(fn(), self.timeout)
+        except asyncio.TimeoutError as exc:
+            self.timeouts += 1
+            self._record_failure()
+            raise ServiceUnavailable(self.name, "timed out") from exc
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if self.is_failure(exc):
+                self._record_failure()
+            else:
+                self._record_success()
+            raise
+        else:
+            self._record_success()
+            return result
+        finally:
+            if probing:
+                self._probing = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "trips": self.trips,
+        }
+
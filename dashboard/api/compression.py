@@ -0,0 +1,95 @@
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+    _BROTLI = True
+except ImportError:  # gzip only without the brotli package
+    _BROTLI = False
+
+# Streams are passed through untouched: compressing them would hold events back
+_PASSTHROUGH_TYPES = ("text/event-stream",)
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    codings = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        params = params.strip()
+        if params.startswith("q=") and params[2:].strip("0.") == "":
+            continue  # q=0: explicitly refused
+        codings.add(coding.strip().lower())
+    return codings
+
+
+class CompressionMiddleware:
+    """Compresses complete response bodies of at least `minimum_size` bytes, brotli preferred over gzip.
+
+    Only single-message bodies are compressed; streaming responses (SSE in
+    particular) and responses that already carry a Content-Encoding are sent
+    as they come, so nothing is buffered. A body is only replaced when the
+    compressed form is actually smaller.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose(self, scope: Scope) -> str | None:
+        codings = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        if _BROTLI and "br" in codings:
+            return "br"
+        if "gzip" in codings:
+            return "gzip"
+        return None
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = self._choose(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+                if "content-encoding" in headers or media_type in _PASSTHROUGH_TYPES:
+                    await send(message)
+                else:
+                    # Held until the first body message shows whether it is worth compressing
+                    start = message
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if not message.get("more_body", False) and len(body) >= self.minimum_size:
+                compressed = self._compress(encoding, body)
+                if len(compressed) < len(body):
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(compressed))
+                    etag = headers.get("etag")
+                    if etag and not etag.startswith("W/"):
+                        # Same validator for every encoding, so it can only be a weak one
+                        headers["ETag"] = "W/" + etag
+                    message = {**message, "body": compressed}
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
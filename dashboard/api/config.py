@@ -13,9 +13,18 @@ STAFF_ROLE_ID: int = int(os.environ["STAFF_ROLE_ID"])
 WARNINGS_DB: str = os.environ.get("WARNINGS_DB_PATH", "../warnings.db")
 POLLS_DB: str = os.environ.get("POLLS_DB_PATH", "../staffpolls.db")
 TEMPLATES_DB: str = os.environ.get("TEMPLATES_DB_PATH", "../polltemplates.db")
+# Persistent tier of the dashboard's Discord user lookup cache (created if missing)
+USER_CACHE_DB: str = os.environ.get("USER_CACHE_DB_PATH", "user_cache.db")
+# Warm read connections kept per database file in each worker (plus one writer)
+DB_POOL_SIZE: int = int(os.environ.get("DB_POOL_SIZE", "4"))
 
 SUPABASE_URL: str = os.environ.get("SUPABASE_URL", "")
 SUPABASE_KEY: str = os.environ.get("SUPABASE_KEY", "")
+SUPABASE_TIMEOUT: float = float(os.environ.get("SUPABASE_TIMEOUT", "5.0"))
+SUPABASE_BREAKER_THRESHOLD: int = int(os.environ.get("SUPABASE_BREAKER_THRESHOLD", "5"))
+SUPABASE_BREAKER_RESET: float = float(os.environ.get("SUPABASE_BREAKER_RESET", "30.0"))
+# The bot's local copy of the Auttaja table, read when Supabase is unavailable
+AUTTAJA_MIRROR_DB: str = os.environ.get("AUTTAJA_MIRROR_DB_PATH", "../auttaja_mirror.db")
 
 JWT_SECRET: str = os.environ["JWT_SECRET"]
 JWT_EXPIRY_HOURS: int = int(os.environ.get("JWT_EXPIRY_HOURS", "24"))
@@ -1,33 +1,272 @@
+import asyncio
+import datetime
+import logging
+import os
+import sqlite3
+import time
+from typing import Awaitable, Callable, Hashable
+
 import aiosqlite
 from contextlib import asynccontextmanager
-from .config import WARNINGS_DB, POLLS_DB, TEMPLATES_DB
+from .config import AUTTAJA_MIRROR_DB, DB_POOL_SIZE, WARNINGS_DB, POLLS_DB, TEMPLATES_DB
 
+log = logging.getLogger(__name__)
 
-@asynccontextmanager
-async def get_warnings_db():
-    async with aiosqlite.connect(WARNINGS_DB) as db:
-        db.row_factory = aiosqlite.Row
-        await db.execute("PRAGMA journal_mode=WAL")
-        await db.execute("PRAGMA foreign_keys=ON")
-        await db.execute("PRAGMA synchronous=NORMAL")
-        yield db
 
+class SQLitePool:
+    """Warm aiosqlite connections to one database file, one pool per worker.
 
-@asynccontextmanager
-async def get_polls_db():
-    async with aiosqlite.connect(POLLS_DB) as db:
+    `size` reader connections are handed out one request at a time and are
+    opened with `query_only`, so a handler that writes without asking for
+    the writer fails loudly. All writes share a single connection behind a
+    lock, matching SQLite's one-writer model. Connections are opened in the
+    app lifespan (or on first use) and keep their PRAGMAs for their lifetime.
+    """
+
+    def __init__(self, path: str, size: int = 4) -> None:
+        self.path = path
+        self.size = size
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._writer: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+        self._connections: list[aiosqlite.Connection] = []
+
+    async def _connect(self, query_only: bool) -> aiosqlite.Connection:
+        db = await aiosqlite.connect(self.path)
         db.row_factory = aiosqlite.Row
         await db.execute("PRAGMA journal_mode=WAL")
         await db.execute("PRAGMA foreign_keys=ON")
         await db.execute("PRAGMA synchronous=NORMAL")
-        yield db
+        if query_only:
+            await db.execute("PRAGMA query_only=ON")
+        return db
+
+    async def open(self) -> None:
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+            # Open the writer first so WAL mode is set before the readers attach
+            writer = await self._connect(query_only=False)
+            readers = await asyncio.gather(*(self._connect(query_only=True) for _ in range(self.size)))
+            for db in readers:
+                self._readers.put_nowait(db)
+            self._connections = [writer, *readers]
+            self._writer = writer
+
+    async def close(self) -> None:
+        async with self._open_lock:
+            for db in self._connections:
+                await db.close()
+            self._connections = []
+            self._writer = None
+            self._readers = asyncio.Queue()
+
+    @asynccontextmanager
+    async def read(self):
+        if self._writer is None:
+            await self.open()
+        db = await self._readers.get()
+        try:
+            yield db
+        finally:
+            if db.in_transaction:
+                await db.rollback()
+            self._readers.put_nowait(db)
+
+    @asynccontextmanager
+    async def write(self):
+        if self._writer is None:
+            await self.open()
+        async with self._write_lock:
+            db = self._writer
+            assert db is not None
+            try:
+                yield db
+            finally:
+                # Never hand the next request a half-finished transaction
+                if db.in_transaction:
+                    await db.rollback()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": self.size,
+            "idle_readers": self._readers.qsize(),
+            "writer_busy": int(self._write_lock.locked()),
+        }
+
+
+warnings_pool = SQLitePool(WARNINGS_DB, size=DB_POOL_SIZE)
+polls_pool = SQLitePool(POLLS_DB, size=DB_POOL_SIZE)
+templates_pool = SQLitePool(TEMPLATES_DB, size=DB_POOL_SIZE)
+_pools = (warnings_pool, polls_pool, templates_pool)
+
+
+def get_warnings_db(write: bool = False):
+    """Borrows a pooled connection; pass `write=True` for anything that modifies the database."""
+    return warnings_pool.write() if write else warnings_pool.read()
+
+
+def get_polls_db(write: bool = False):
+    return polls_pool.write() if write else polls_pool.read()
+
+
+def get_templates_db(write: bool = False):
+    return templates_pool.write() if write else templates_pool.read()
+
+
+async def open_pools() -> None:
+    await asyncio.gather(*(pool.open() for pool in _pools))
+    for changes in _change_counters:
+        await changes.install()
+
+
+async def close_pools() -> None:
+    for pool in _pools:
+        await pool.close()
+
+
+def auttaja_mirror_available() -> bool:
+    return os.path.exists(AUTTAJA_MIRROR_DB)
 
 
 @asynccontextmanager
-async def get_templates_db():
-    async with aiosqlite.connect(TEMPLATES_DB) as db:
+async def get_auttaja_mirror_db():
+    # Read-only: the bot owns this file and keeps it in sync with Supabase
+    async with aiosqlite.connect(f"file:{AUTTAJA_MIRROR_DB}?mode=ro", uri=True) as db:
         db.row_factory = aiosqlite.Row
-        await db.execute("PRAGMA journal_mode=WAL")
-        await db.execute("PRAGMA foreign_keys=ON")
-        await db.execute("PRAGMA synchronous=NORMAL")
         yield db
+
+
+class ChangeCounters:
+    """Per-table change counters for one database file, behind ETags and `VersionedCache`.
+
+    Triggers bump `table_versions` on every insert, update and delete, so
+    writes from the bot count too. Counters start at the creation time in
+    milliseconds, so a recreated file never reuses old values. They are
+    re-read on a watcher connection only when `PRAGMA data_version` moves;
+    an unchanged database costs one PRAGMA.
+    """
+
+    def __init__(self, pool: SQLitePool, tables: tuple[str, ...]) -> None:
+        self.pool = pool
+        self.tables = tables
+        self._watcher: aiosqlite.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._data_version: int | None = None
+        self._versions: dict[str, int] = {}
+
+    async def install(self) -> None:
+        """Creates the counters and triggers for tracked tables that exist (the bot creates the tables)."""
+        async with self.pool.write() as db:
+            await db.execute(
+                "CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            async with db.execute("SELECT name FROM sqlite_master WHERE type = 'table'") as cur:
+                existing = {row[0] for row in await cur.fetchall()}
+            for table in self.tables:
+                if table not in existing:
+                    log.warning("%s: table %s not found, its responses get no ETag", self.pool.path, table)
+                    continue
+                await db.execute(
+                    "INSERT OR IGNORE INTO table_versions (name, version) "
+                    "VALUES (?, CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER))",
+                    (table,),
+                )
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    await db.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version "
+                        f"AFTER {event} ON {table} BEGIN "
+                        f"UPDATE table_versions SET version = version + 1 WHERE name = '{table}'; "
+                        f"END"
+                    )
+            await db.commit()
+
+    async def versions(self) -> dict[str, int]:
+        async with self._lock:
+            if self._watcher is None:
+                self._watcher = await aiosqlite.connect(self.pool.path)
+            async with self._watcher.execute("PRAGMA data_version") as cur:
+                data_version = int((await cur.fetchone())[0])
+            if data_version != self._data_version:
+                try:
+                    async with self._watcher.execute("SELECT name, version FROM table_versions") as cur:
+                        self._versions = {name: int(version) for name, version in await cur.fetchall()}
+                except sqlite3.OperationalError:
+                    self._versions = {}
+                self._data_version = data_version
+            return self._versions
+
+    async def close(self) -> None:
+        if self._watcher is not None:
+            await self._watcher.close()
+            self._watcher = None
+
+
+warnings_changes = ChangeCounters(warnings_pool, ("verbal_warnings",))
+polls_changes = ChangeCounters(polls_pool, ("staffpoll_polls", "staffpoll_options", "staffpoll_votes"))
+templates_changes = ChangeCounters(templates_pool, ("poll_templates", "poll_template_options"))
+_change_counters = (warnings_changes, polls_changes, templates_changes)
+
+
+class VersionedCache:
+    """Per-worker results derived from some tables, recomputed at most once per change to them.
+
+    Entries are keyed on the tables' change counters (and the UTC date with
+    `daily=True`, for rolling windows), so a read costs no query until a
+    write lands. Concurrent misses for one key share a single computation.
+    Without counters (tables the dashboard could not install triggers on)
+    entries fall back to a `fallback_ttl` expiry. Past `max_entries` keys the
+    cache starts over.
+    """
+
+    def __init__(
+        self,
+        changes: ChangeCounters,
+        tables: tuple[str, ...],
+        daily: bool = False,
+        fallback_ttl: float = 30.0,
+        max_entries: int = 1024,
+    ) -> None:
+        self.changes = changes
+        self.tables = tables
+        self.daily = daily
+        self.fallback_ttl = fallback_ttl
+        self.max_entries = max_entries
+        # key -> (version stamp, value)
+        self._entries: dict[Hashable, tuple[tuple, object]] = {}
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self.computed = 0
+
+    async def _stamp(self) -> tuple:
+        versions = await self.changes.versions()
+        stamp: tuple = tuple(versions.get(table) for table in self.tables)
+        if None in stamp:
+            stamp = ("ttl", int(time.monotonic() // self.fallback_ttl))
+        if self.daily:
+            stamp += (datetime.datetime.now(datetime.timezone.utc).date(),)
+        return stamp
+
+    async def get(self, key: Hashable, compute: Callable[[], Awaitable[object]]):
+        stamp = await self._stamp()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            # Stamp read before computing: a write landing meanwhile forces the next read to recompute
+            value = await compute()
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._entries.clear()
+                self._locks = {k: other for k, other in self._locks.items() if other.locked()}
+            self._entries[key] = (stamp, value)
+            self.computed += 1
+            return value
+
+
+async def close_change_counters() -> None:
+    for changes in _change_counters:
+        await changes.close()
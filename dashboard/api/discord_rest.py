@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+import time
+from collections import deque
+from typing import Literal
+
+import httpx
+
+from .config import DISCORD_BOT_TOKEN
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:  # httpx falls back to HTTP/1.1 keep-alive without the h2 package
+    _HTTP2 = False
+
+DISCORD_API = "https://discord.com/api/v10"
+
+Auth = Literal["bot", "bearer", "none"]
+
+# IDs after these segments pick a separate rate-limit bucket ("major parameters")
+_MAJOR_SEGMENTS = {"channels", "guilds", "webhooks"}
+
+
+def _segments(path: str) -> list[str]:
+    return path.split("?", 1)[0].strip("/").split("/")
+
+
+def _identity(auth: Auth, token: str | None) -> str:
+    """Who Discord rate-limits a request as: the bot, one OAuth token (by hash), or nobody in particular."""
+    if auth == "bearer":
+        return "bearer:" + hashlib.blake2b((token or "").encode(), digest_size=8).hexdigest()
+    return auth
+
+
+def _route_key(method: str, identity: str, path: str) -> str:
+    """e.g. `bot GET guilds/123/members/{id}` — other IDs are folded so one route shares one bucket."""
+    segments = _segments(path)
+    route = [
+        "{id}" if seg.isdigit() and (i == 0 or segments[i - 1] not in _MAJOR_SEGMENTS) else seg
+        for i, seg in enumerate(segments)
+    ]
+    return f"{identity} {method} {'/'.join(route)}"
+
+
+def _major_params(path: str) -> str:
+    segments = _segments(path)
+    return ",".join(seg for i, seg in enumerate(segments) if i > 0 and segments[i - 1] in _MAJOR_SEGMENTS)
+
+
+class _Bucket:
+    """Discord's view of one rate-limit bucket, as last reported in the X-RateLimit-* headers."""
+
+    def __init__(self) -> None:
+        self.remaining: int | None = None
+        self.reset_at = 0.0
+        # Requests queue here while the bucket is empty
+        self.lock = asyncio.Lock()
+
+    async def wait(self, rest: "DiscordREST") -> None:
+        """Sleeps until the bucket has room. Call with `lock` held."""
+        if self.remaining is not None and self.remaining <= 0:
+            delay = self.reset_at - time.monotonic()
+            if delay > 0:
+                rest.bucket_waits += 1
+                rest.wait_seconds += delay
+                await asyncio.sleep(delay)
+            # Unknown until the next response reports it
+            self.remaining = None
+
+    def update(self, headers: httpx.Headers) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        self.remaining = int(remaining)
+        self.reset_at = time.monotonic() + float(reset_after)
+
+
+class DiscordREST:
+    """One keep-alive (HTTP/2 when available) client for every Discord REST call the dashboard makes.
+
+    - Buckets: each route's `X-RateLimit-*` headers are tracked; once a bucket
+      is empty, further requests on it wait for its reset instead of hitting 429.
+      Routes that Discord reports under the same `X-RateLimit-Bucket` share state.
+      OAuth (bearer) routes are tracked per token, since Discord limits each
+      user's token separately.
+    - Global limit: a global 429 pauses every request made with the same
+      token until it expires; one user's limit never stalls the bot's calls.
+    - 429s that still happen are retried after `retry_after`, up to `max_retries`.
+
+    Opened in the app lifespan (or on first use) and closed on shutdown.
+    """
+
+    def __init__(
+        self, base_url: str = DISCORD_API, max_retries: int = 3, timeout: float = 10.0, max_buckets: int = 2000
+    ) -> None:
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.max_buckets = max_buckets
+        self._client: httpx.AsyncClient | None = None
+        self._buckets: dict[str, _Bucket] = {}
+        # identity + bucket hash + major parameters -> shared bucket
+        self._shared: dict[str, _Bucket] = {}
+        # identity -> monotonic time its global limit lifts
+        self._global_until: dict[str, float] = {}
+
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.global_limited = 0
+        self.retries = 0
+        self.bucket_waits = 0
+        self.wait_seconds = 0.0
+        self._latencies: deque[float] = deque(maxlen=500)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=_HTTP2,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60),
+                headers={"User-Agent": "DiscordBot (https://github.com/augy-studios/verbal-warning-logger, 1.0)"},
+            )
+        return self._client
+
+    async def open(self) -> None:
+        _ = self.client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _bucket(self, key: str) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._prune()
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    def _prune(self) -> None:
+        """Forgets buckets nobody is waiting on whose window has passed; one set per logged-in user adds up."""
+        now = time.monotonic()
+
+        def idle(bucket: _Bucket) -> bool:
+            return not bucket.lock.locked() and bucket.reset_at <= now
+
+        self._buckets = {k: b for k, b in self._buckets.items() if not idle(b)}
+        self._shared = {k: b for k, b in self._shared.items() if not idle(b)}
+        self._global_until = {k: until for k, until in self._global_until.items() if until > now}
+
+    def _learn_bucket(self, key: str, identity: str, path: str, headers: httpx.Headers) -> _Bucket:
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        current = self._bucket(key)
+        if not bucket_hash:
+            return current
+        shared = self._shared.setdefault(f"{identity}:{bucket_hash}:{_major_params(path)}", current)
+        self._buckets[key] = shared
+        return shared
+
+    async def _wait_global(self, identity: str) -> None:
+        delay = self._global_until.get(identity, 0.0) - time.monotonic()
+        if delay > 0:
+            self.wait_seconds += delay
+            await asyncio.sleep(delay)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        auth: Auth = "bot",
+        token: str | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """Sends a request, waiting out rate limits. Returns the final response; callers check its status."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        if auth == "bot":
+            headers["Authorization"] = f"Bot {token or DISCORD_BOT_TOKEN}"
+        elif auth == "bearer":
+            headers["Authorization"] = f"Bearer {token}"
+
+        identity = _identity(auth, token)
+        key = _route_key(method, identity, path)
+        attempt = 0
+        while True:
+            await self._wait_global(identity)
+            bucket = self._bucket(key)
+            resp = None
+            async with bucket.lock:
+                await bucket.wait(self)
+                if bucket.remaining is None:
+                    # Limits unknown: send one request alone and let its headers tell us
+                    resp = await self._send(key, identity, method, path, headers, kwargs)
+                else:
+                    bucket.remaining -= 1
+            if resp is None:
+                resp = await self._send(key, identity, method, path, headers, kwargs)
+
+            if resp.status_code == 429:
+                self.rate_limited += 1
+            if resp.status_code != 429 or attempt >= self.max_retries:
+                if resp.status_code >= 400:
+                    self.errors += 1
+                return resp
+
+            attempt += 1
+            self.retries += 1
+            retry_after = float(resp.headers.get("Retry-After") or 1.0)
+            try:
+                body = resp.json()
+                retry_after = float(body.get("retry_after", retry_after))
+                is_global = bool(body.get("global")) or resp.headers.get("X-RateLimit-Global") == "true"
+            except ValueError:
+                is_global = resp.headers.get("X-RateLimit-Global") == "true"
+            if is_global:
+                self.global_limited += 1
+                self._global_until[identity] = max(
+                    self._global_until.get(identity, 0.0), time.monotonic() + retry_after
+                )
+            else:
+                # The retry queues behind the bucket like any other request
+                bucket = self._bucket(key)
+                bucket.remaining = 0
+                bucket.reset_at = max(bucket.reset_at, time.monotonic() + retry_after)
+
+    async def _send(
+        self, key: str, identity: str, method: str, path: str, headers: dict, kwargs: dict
+    ) -> httpx.Response:
+        self.requests += 1
+        started = time.monotonic()
+        try:
+            resp = await self.client.request(method, path, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.errors += 1
+            raise
+        self._latencies.append(time.monotonic() - started)
+        self._learn_bucket(key, identity, path, resp.headers).update(resp.headers)
+        return resp
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    def stats(self) -> dict[str, object]:
+        latencies = sorted(self._latencies)
+
+        def pct(q: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000, 1)
+
+        return {
+            "http2": _HTTP2,
+            "requests": self.requests,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "global_limited": self.global_limited,
+            "retries": self.retries,
+            "bucket_waits": self.bucket_waits,
+            "wait_seconds": round(self.wait_seconds, 2),
+            "buckets": len(self._buckets),
+            "latency_p50_ms": pct(0.5),
+            "latency_p95_ms": pct(0.95),
+        }
+
+
+discord_rest = DiscordREST()
@@ -0,0 +1,41 @@
+import datetime
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from .auth import get_current_user
+from .database import ChangeCounters
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: compression (ours or nginx's) turns strong ETags weak
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def conditional(changes: ChangeCounters, *tables: str, daily: bool = False):
+    """Route dependency for ETag / If-None-Match on reads of `tables`.
+
+    The ETag is derived from the URL and the tables' change counters, so a
+    matching `If-None-Match` is answered with 304 before the handler opens a
+    connection. `daily=True` also folds in the UTC date, for responses with
+    rolling windows such as "last 7 days".
+    """
+
+    async def check(request: Request, response: Response, _user: dict = Depends(get_current_user)) -> None:
+        versions = await changes.versions()
+        if any(table not in versions for table in tables):
+            return
+        parts = [request.url.path, request.url.query, *(f"{t}={versions[t]}" for t in tables)]
+        if daily:
+            parts.append(datetime.datetime.now(datetime.timezone.utc).date().isoformat())
+        etag = '"' + hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return Depends(check)
@@ -0,0 +1,352 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+import aiosqlite
+
+from .database import SQLitePool, polls_pool, warnings_pool
+
+log = logging.getLogger(__name__)
+
+# (table, trigger event, change kind, entity id expression, WHEN condition)
+Trigger = tuple[str, str, str, str, str | None]
+
+_WARNING_TRIGGERS: tuple[Trigger, ...] = (
+    ("verbal_warnings", "INSERT", "warning.added", "NEW.id", None),
+    ("verbal_warnings", "UPDATE", "warning.updated", "NEW.id", None),
+    ("verbal_warnings", "DELETE", "warning.deleted", "OLD.id", None),
+)
+_POLL_TRIGGERS: tuple[Trigger, ...] = (
+    ("staffpoll_votes", "INSERT", "poll.votes", "NEW.poll_id", None),
+    ("staffpoll_votes", "UPDATE", "poll.votes", "NEW.poll_id", None),
+    ("staffpoll_votes", "DELETE", "poll.votes", "OLD.poll_id", None),
+    ("staffpoll_polls", "UPDATE OF is_active", "poll.closed", "NEW.id", "OLD.is_active = 1 AND NEW.is_active = 0"),
+    ("staffpoll_polls", "UPDATE OF is_active", "poll.reopened", "NEW.id", "OLD.is_active = 0 AND NEW.is_active = 1"),
+)
+
+# Changes a client may have missed are replayed from the log for this long
+_RETENTION = "-1 day"
+# Only the latest of these per entity matters within one batch
+_COALESCED = {"warning.updated", "poll.votes"}
+
+
+@dataclass(slots=True)
+class Event:
+    source: str
+    seq: int
+    name: str
+    data: dict
+
+
+class _ChangeLog:
+    """The `change_log` table of one database file, filled by triggers on every write (the bot's too)."""
+
+    def __init__(self, source: str, pool: SQLitePool, triggers: tuple[Trigger, ...]) -> None:
+        self.source = source
+        self.pool = pool
+        self.triggers = triggers
+        self._watcher: aiosqlite.Connection | None = None
+        self._data_version: int | None = None
+
+    async def install(self) -> None:
+        async with self.pool.write() as db:
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS change_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    entity_id INTEGER NOT NULL,
+                    at TEXT NOT NULL DEFAULT (datetime('now'))
+                )
+                """
+            )
+            async with db.execute("SELECT name FROM sqlite_master WHERE type = 'table'") as cur:
+                existing = {row[0] for row in await cur.fetchall()}
+            for table, event, kind, entity, when in self.triggers:
+                if table not in existing:
+                    log.warning("%s: table %s not found, no %s events", self.pool.path, table, kind)
+                    continue
+                name = f"change_log_{kind.replace('.', '_')}_{event.split()[0].lower()}"
+                await db.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} "
+                    + (f"WHEN {when} " if when else "")
+                    + f"BEGIN INSERT INTO change_log (kind, entity_id) VALUES ('{kind}', {entity}); END"
+                )
+            await db.commit()
+
+    async def _watcher_conn(self) -> aiosqlite.Connection:
+        if self._watcher is None:
+            self._watcher = await aiosqlite.connect(self.pool.path)
+        return self._watcher
+
+    async def changed(self) -> bool:
+        """True when something was committed since the last call (one PRAGMA on the watcher)."""
+        db = await self._watcher_conn()
+        async with db.execute("PRAGMA data_version") as cur:
+            version = int((await cur.fetchone())[0])
+        changed = version != self._data_version
+        self._data_version = version
+        return changed
+
+    def reset(self) -> None:
+        self._data_version = None
+
+    async def head(self) -> int:
+        db = await self._watcher_conn()
+        async with db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'") as cur:
+            row = await cur.fetchone()
+        return int(row[0]) if row else 0
+
+    async def oldest(self) -> int | None:
+        db = await self._watcher_conn()
+        async with db.execute("SELECT MIN(id) FROM change_log") as cur:
+            row = await cur.fetchone()
+        return row[0]
+
+    async def read(self, after: int, upto: int | None = None, limit: int = 500) -> list[tuple[int, str, int]]:
+        db = await self._watcher_conn()
+        async with db.execute(
+            "SELECT id, kind, entity_id FROM change_log WHERE id > ? AND (? IS NULL OR id <= ?) ORDER BY id LIMIT ?",
+            (after, upto, upto, limit),
+        ) as cur:
+            return [(int(r[0]), str(r[1]), int(r[2])) for r in await cur.fetchall()]
+
+    async def prune(self) -> None:
+        async with self.pool.write() as db:
+            await db.execute("DELETE FROM change_log WHERE at < datetime('now', ?)", (_RETENTION,))
+            await db.commit()
+
+    async def close(self) -> None:
+        if self._watcher is not None:
+            await self._watcher.close()
+            self._watcher = None
+
+
+async def _warning_events(source: str, rows: list[tuple[int, str, int]]) -> list[Event]:
+    wanted = {entity for _, kind, entity in rows if kind != "warning.deleted"}
+    current: dict[int, dict] = {}
+    if wanted:
+        async with warnings_pool.read() as db:
+            cursor = await db.execute(
+                f"SELECT * FROM verbal_warnings WHERE id IN ({','.join('?' * len(wanted))})", tuple(wanted)
+            )
+            current = {r["id"]: dict(r) for r in await cursor.fetchall()}
+    events = []
+    for seq, kind, entity in rows:
+        if kind == "warning.deleted":
+            events.append(Event(source, seq, kind, {"id": entity}))
+        elif entity in current:
+            # Rows deleted later in the same batch are reported by their delete event
+            events.append(Event(source, seq, kind, current[entity]))
+    return events
+
+
+async def _poll_events(source: str, rows: list[tuple[int, str, int]]) -> list[Event]:
+    voted = {entity for _, kind, entity in rows if kind == "poll.votes"}
+    counts: dict[int, dict[str, int]] = {poll_id: {} for poll_id in voted}
+    if voted:
+        async with polls_pool.read() as db:
+            cursor = await db.execute(
+                f"SELECT poll_id, option_id, COUNT(*) AS count FROM staffpoll_votes "
+                f"WHERE poll_id IN ({','.join('?' * len(voted))}) GROUP BY poll_id, option_id",
+                tuple(voted),
+            )
+            for r in await cursor.fetchall():
+                counts[r["poll_id"]][str(r["option_id"])] = r["count"]
+    events = []
+    for seq, kind, entity in rows:
+        if kind == "poll.votes":
+            data = {"poll_id": entity, "counts": counts[entity], "total_votes": sum(counts[entity].values())}
+        else:
+            data = {"poll_id": entity}
+        events.append(Event(source, seq, kind, data))
+    return events
+
+
+def _coalesce(rows: list[tuple[int, str, int]]) -> list[tuple[int, str, int]]:
+    last_seq = {(kind, entity): seq for seq, kind, entity in rows if kind in _COALESCED}
+    return [row for row in rows if row[1] not in _COALESCED or last_seq[(row[1], row[2])] == row[0]]
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    events: deque[Event] = field(default_factory=deque)
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+    # Set when the client falls `max_queue` events behind; it catches up from the log instead
+    lagged: bool = False
+
+
+class EventHub:
+    """One change-log tailer per worker, fanned out to every `/api/events` client.
+
+    Each database's `change_log` is checked every `interval` with a single
+    `PRAGMA data_version`, and read only when something was committed.
+    Event IDs are `<warnings seq>-<polls seq>`: a client reconnecting with
+    `Last-Event-ID` has exactly what it missed replayed from the log (on any
+    worker), or gets a `resync` event if that part of the log was pruned.
+    Pruning runs from `install()` every `prune_interval`, with or without
+    clients connected.
+    """
+
+    def __init__(
+        self, interval: float = 0.5, heartbeat: float = 15.0, max_queue: int = 256, prune_interval: float = 3600.0
+    ) -> None:
+        self.interval = interval
+        self.prune_interval = prune_interval
+        self.heartbeat = heartbeat
+        self.max_queue = max_queue
+        self._logs = {
+            "w": (_ChangeLog("w", warnings_pool, _WARNING_TRIGGERS), _warning_events),
+            "p": (_ChangeLog("p", polls_pool, _POLL_TRIGGERS), _poll_events),
+        }
+        self._position: dict[str, int] = {}
+        self._subscribers: set[_Subscriber] = set()
+        self._task: asyncio.Task[None] | None = None
+        self._prune_task: asyncio.Task[None] | None = None
+        self._start_lock = asyncio.Lock()
+        self.published = 0
+
+    async def install(self) -> None:
+        for change_log, _ in self._logs.values():
+            await change_log.install()
+        # The triggers fill the log whether or not anyone is listening, so it is pruned regardless
+        if self._prune_task is None:
+            self._prune_task = asyncio.create_task(self._prune())
+
+    async def _ensure_started(self) -> None:
+        async with self._start_lock:
+            if self._task is not None:
+                return
+            for source, (change_log, _) in self._logs.items():
+                await change_log.changed()
+                self._position[source] = await change_log.head()
+            self._task = asyncio.create_task(self._run())
+
+    async def _read(self, source: str, after: int, upto: int | None = None) -> tuple[list[Event], int]:
+        """Returns the events after `after` and the last log id read."""
+        change_log, build = self._logs[source]
+        events: list[Event] = []
+        while True:
+            rows = await change_log.read(after, upto)
+            if not rows:
+                return events, after
+            events += await build(source, _coalesce(rows))
+            after = rows[-1][0]
+
+    async def _prune(self) -> None:
+        while True:
+            try:
+                for change_log, _ in self._logs.values():
+                    await change_log.prune()
+            except Exception:
+                log.exception("change_log prune failed")
+            await asyncio.sleep(self.prune_interval)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                for source, (change_log, _) in self._logs.items():
+                    if not await change_log.changed():
+                        continue
+                    events, self._position[source] = await self._read(source, self._position[source])
+                    if events:
+                        self._publish(events)
+            except Exception:
+                log.exception("change_log tail failed")
+                # Re-read on the next tick instead of waiting for another commit
+                for change_log, _ in self._logs.values():
+                    change_log.reset()
+
+    def _publish(self, events: list[Event]) -> None:
+        self.published += len(events)
+        for sub in self._subscribers:
+            if sub.lagged:
+                continue
+            if len(sub.events) + len(events) > self.max_queue:
+                sub.lagged = True
+                sub.events.clear()
+            else:
+                sub.events.extend(events)
+            sub.wake.set()
+
+    def _parse(self, last_event_id: str | None) -> dict[str, int] | None:
+        try:
+            w, p = (last_event_id or "").split("-")
+            return {"w": int(w), "p": int(p)}
+        except ValueError:
+            return None
+
+    async def _missed(self, since: dict[str, int]) -> list[Event] | None:
+        """Events after `since` up to the tailer's position, or None if the log no longer reaches back that far."""
+        missed: list[Event] = []
+        for source, (change_log, _) in self._logs.items():
+            upto = self._position[source]
+            if since[source] >= upto:
+                continue
+            oldest = await change_log.oldest()
+            if oldest is None or oldest > since[source] + 1:
+                return None
+            events, _ = await self._read(source, since[source], upto)
+            missed += events
+        return missed
+
+    async def stream(self, last_event_id: str | None) -> AsyncIterator[tuple[str, str, dict] | None]:
+        """Yields (id, name, data) for each change, or None as a keep-alive when idle."""
+        await self._ensure_started()
+        sub = _Subscriber()
+        self._subscribers.add(sub)
+        try:
+            # Snapshot after subscribing: anything newer arrives through `sub.events`
+            since = dict(self._position)
+            resume = self._parse(last_event_id)
+            backlog = await self._missed(resume) if resume else []
+            if backlog is None:
+                yield f"{since['w']}-{since['p']}", "resync", {}
+            else:
+                since = resume or since
+                sub.events.extendleft(reversed(backlog))
+
+            while True:
+                sub.wake.clear()
+                if sub.lagged:
+                    sub.lagged = False
+                    missed = await self._missed(since)
+                    if missed is None:
+                        since = dict(self._position)
+                        yield f"{since['w']}-{since['p']}", "resync", {}
+                    else:
+                        # Ahead of anything published while the log was read
+                        sub.events.extendleft(reversed(missed))
+                while sub.events:
+                    event = sub.events.popleft()
+                    if event.seq <= since[event.source]:
+                        continue
+                    since[event.source] = event.seq
+                    yield f"{since['w']}-{since['p']}", event.name, event.data
+                if sub.wake.is_set() or sub.lagged:
+                    continue
+                try:
+                    await asyncio.wait_for(sub.wake.wait(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self._subscribers.discard(sub)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            self._prune_task = None
+        for change_log, _ in self._logs.values():
+            await change_log.close()
+
+    def stats(self) -> dict[str, int]:
+        return {"subscribers": len(self._subscribers), "published": self.published}
+
+
+event_hub = EventHub()
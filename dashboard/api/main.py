@@ -1,11 +1,43 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .auth import router as auth_router
+from .compression import CompressionMiddleware
 from .config import DASHBOARD_ORIGIN
-from .routes import auttaja, polls, templates, utility, warnings
+from .database import close_change_counters, close_pools, open_pools
+from .discord_rest import discord_rest
+from .events import event_hub
+from .responses import JSONResponse
+from .routes import auttaja, events, polls, profile, templates, utility, warnings
+from .users import user_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_pools()
+    await event_hub.install()
+    await discord_rest.open()
+    await auttaja.open_supabase()
+    yield
+    await auttaja.close_supabase()
+    await event_hub.close()
+    await user_cache.close()
+    await discord_rest.close()
+    await close_change_counters()
+    await close_pools()
+
+
+app = FastAPI(
+    title="Vigila Dashboard API",
+    docs_url=None,
+    redoc_url=None,
+    lifespan=lifespan,
+    default_response_class=JSONResponse,
+)
 
-app = FastAPI(title="Vigila Dashboard API", docs_url=None, redoc_url=None)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,6 +45,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
@@ -20,9 +53,18 @@ app.include_router(warnings.router, prefix="/api/warnings", tags=["warnings"])
 app.include_router(polls.router, prefix="/api/polls", tags=["polls"])
 app.include_router(templates.router, prefix="/api/poll-templates", tags=["templates"])
 app.include_router(auttaja.router, prefix="/api/auttaja", tags=["auttaja"])
+app.include_router(profile.router, prefix="/api/profile", tags=["profile"])
 app.include_router(utility.router, prefix="/api/utility", tags=["utility"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
 
 
 @app.get("/api/health")
 async def health():
-    return {"status": "ok"}
+    breaker = auttaja.supabase_breaker.stats()
+    return {
+        "status": "ok" if breaker["state"] == "closed" else "degraded",
+        "supabase": breaker,
+        "discord": discord_rest.stats(),
+        "users": user_cache.stats(),
+        "events": event_hub.stats(),
+    }
@@ -0,0 +1,22 @@
+import base64
+
+from fastapi import HTTPException
+
+MAX_PER_PAGE = 100
+
+
+def clamp_per_page(per_page: int) -> int:
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+def encode_id_cursor(last_id: int) -> str:
+    """Opaque keyset cursor: the next page starts below `last_id`."""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
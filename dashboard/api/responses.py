@@ -0,0 +1,54 @@
+import json
+from typing import Any, Iterable
+
+from starlette.responses import JSONResponse as _StarletteJSONResponse
+
+try:
+    import orjson
+    _ORJSON = True
+except ImportError:  # the standard library encoder produces the same JSON, only slower
+    _ORJSON = False
+
+
+def dumps(content: Any) -> bytes:
+    if _ORJSON:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def json_object_sql(columns: Iterable[str], table: str = "") -> str:
+    """`json_object('col', col, ...)` for a SELECT, so SQLite builds each row's JSON itself."""
+    prefix = f"{table}." if table else ""
+    return "json_object(" + ", ".join(f"'{col}', {prefix}{col}" for col in columns) + ")"
+
+
+class RawRows:
+    """A JSON array whose items are already-encoded JSON objects (from `json_object_sql`).
+
+    Spliced into the body by `JSONResponse` as-is, so list endpoints skip
+    building a dict per row and encoding it again.
+    """
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: Iterable[str]) -> None:
+        self.items = list(items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def render(self) -> bytes:
+        return ("[" + ",".join(self.items) + "]").encode()
+
+
+class JSONResponse(_StarletteJSONResponse):
+    """The app's default response class: orjson when installed, and `RawRows` values spliced in unencoded."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, dict) and any(isinstance(value, RawRows) for value in content.values()):
+            parts = [
+                dumps(str(key)) + b":" + (value.render() if isinstance(value, RawRows) else dumps(value))
+                for key, value in content.items()
+            ]
+            return b"{" + b",".join(parts) + b"}"
+        return dumps(content)
@@ -1,29 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Response
+from postgrest.exceptions import APIError
 from pydantic import BaseModel
 
 from ..auth import get_current_user
-from ..config import SUPABASE_KEY, SUPABASE_URL
+from ..breaker import CircuitBreaker, ServiceUnavailable
+from ..config import (
+    SUPABASE_BREAKER_RESET,
+    SUPABASE_BREAKER_THRESHOLD,
+    SUPABASE_KEY,
+    SUPABASE_TIMEOUT,
+    SUPABASE_URL,
+)
+from ..database import auttaja_mirror_available, get_auttaja_mirror_db
 
 router = APIRouter()
 
 _sb = None
+_LEADERBOARD_RPC = "auttaja_leaderboard"
+# PostgREST's default max-rows; larger reads are split into .range() pages
+_PAGE_SIZE = 1000
+# Set once PostgREST reports the RPC as unknown (PGRST202)
+_rpc_missing = False
 
 
-def _get_supabase():
+def _is_outage(exc: BaseException) -> bool:
+    # PGRST* are PostgREST client errors (bad filter, unknown RPC) — Supabase itself is fine
+    return not (isinstance(exc, APIError) and str(exc.code or "").startswith("PGRST"))
+
+
+supabase_breaker = CircuitBreaker(
+    "Supabase",
+    failure_threshold=SUPABASE_BREAKER_THRESHOLD,
+    reset_timeout=SUPABASE_BREAKER_RESET,
+    timeout=SUPABASE_TIMEOUT,
+    is_failure=_is_outage,
+)
+
+
+async def open_supabase() -> None:
+    """Creates the shared async client; called once from the app lifespan."""
     global _sb
-    if _sb is None:
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            return None
-        try:
-            from supabase import create_client
-            _sb = create_client(SUPABASE_URL, SUPABASE_KEY)
-        except Exception:
-            return None
-    return _sb
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        return
+    try:
+        from supabase import acreate_client
+        _sb = await acreate_client(SUPABASE_URL, SUPABASE_KEY)
+    except Exception:
+        _sb = None
+
+
+async def close_supabase() -> None:
+    global _sb
+    if _sb is not None:
+        # The PostgREST sub-client owns the pooled httpx connection
+        await _sb.postgrest.aclose()
+        _sb = None
 
 
 def _require_supabase():
-    sb = _get_supabase()
+    sb = _sb
     if not sb:
         raise HTTPException(
             status_code=503,
@@ -32,6 +68,65 @@ def _require_supabase():
     return sb
 
 
+async def _execute(query):
+    """Runs a Supabase request under the breaker's timeout."""
+    try:
+        return await supabase_breaker.call(query.execute)
+    except httpx.HTTPError as exc:
+        raise ServiceUnavailable("Supabase", type(exc).__name__) from exc
+
+
+def _unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Auttaja history temporarily unavailable — Supabase is not responding",
+    )
+
+
+# ---- local mirror fallback ----
+
+
+def _mirror_row(row) -> dict:
+    out = dict(row)
+    if out.get("deleted") is not None:
+        out["deleted"] = bool(out["deleted"])
+    return out
+
+
+async def _mirror_history(role: str, user_id: str, show_removed: bool) -> list[dict]:
+    removed = "" if show_removed else " AND (deleted IS NULL OR deleted = 0)"
+    async with get_auttaja_mirror_db() as db:
+        async with db.execute(
+            f"SELECT * FROM auttaja_punishments WHERE {role} = ?{removed} ORDER BY timestamp DESC, id DESC",
+            (user_id,),
+        ) as cur:
+            return [_mirror_row(r) for r in await cur.fetchall()]
+
+
+async def _mirror_leaderboard(role: str, limit: int, offset: int) -> list[dict]:
+    async with get_auttaja_mirror_db() as db:
+        async with db.execute(
+            f"SELECT {role} AS user_id, COUNT(*) AS count FROM auttaja_punishments "
+            f"WHERE deleted IS NOT 1 AND {role} != '' GROUP BY {role} "
+            "ORDER BY count DESC, user_id LIMIT ? OFFSET ?",
+            (limit, offset),
+        ) as cur:
+            return [{"user_id": str(r["user_id"]), "count": r["count"]} for r in await cur.fetchall()]
+
+
+async def _mirror_get(punishment_id: int) -> dict | None:
+    async with get_auttaja_mirror_db() as db:
+        async with db.execute("SELECT * FROM auttaja_punishments WHERE id = ?", (punishment_id,)) as cur:
+            row = await cur.fetchone()
+    return _mirror_row(row) if row else None
+
+
+def _serve_from_mirror(response: Response) -> None:
+    if not auttaja_mirror_available():
+        raise _unavailable()
+    response.headers["X-Data-Source"] = "mirror"
+
+
 class PunishmentUpdate(BaseModel):
     offender: str
     punisher: str
@@ -42,56 +137,119 @@ class PunishmentUpdate(BaseModel):
 @router.get("/offender/{user_id}")
 async def offender_history(
     user_id: str,
+    response: Response,
     show_removed: bool = False,
     _user: dict = Depends(get_current_user),
 ):
     sb = _require_supabase()
     query = sb.table("punishments").select("*").eq("offender", user_id).order("timestamp", desc=True)
     if not show_removed:
-        query = query.eq("deleted", False)
-    result = query.execute()
+        query = query.or_("deleted.is.null,deleted.is.false")
+    try:
+        result = await _execute(query)
+    except ServiceUnavailable:
+        _serve_from_mirror(response)
+        return {"user_id": user_id, "punishments": await _mirror_history("offender", user_id, show_removed)}
     return {"user_id": user_id, "punishments": result.data}
 
 
 @router.get("/punisher/{user_id}")
 async def punisher_history(
     user_id: str,
+    response: Response,
     show_removed: bool = False,
     _user: dict = Depends(get_current_user),
 ):
     sb = _require_supabase()
     query = sb.table("punishments").select("*").eq("punisher", user_id).order("timestamp", desc=True)
     if not show_removed:
-        query = query.eq("deleted", False)
-    result = query.execute()
+        query = query.or_("deleted.is.null,deleted.is.false")
+    try:
+        result = await _execute(query)
+    except ServiceUnavailable:
+        _serve_from_mirror(response)
+        return {"user_id": user_id, "punishments": await _mirror_history("punisher", user_id, show_removed)}
     return {"user_id": user_id, "punishments": result.data}
 
 
+async def _leaderboard_scan(sb, mode: str, limit: int, offset: int) -> list[tuple[str, int]]:
+    """Fallback when the RPC is not installed: stream the column in pages and count here."""
+    counts: dict[str, int] = {}
+    start = 0
+    while True:
+        result = await _execute(
+            sb.table("punishments")
+            .select(mode)
+            # NULL counts as not removed, as in supabase/auttaja_leaderboard.sql
+            .or_("deleted.is.null,deleted.is.false")
+            .order("id")
+            .range(start, start + _PAGE_SIZE - 1)
+        )
+        rows = result.data or []
+        for row in rows:
+            uid = str(row.get(mode) or "")
+            if uid:
+                counts[uid] = counts.get(uid, 0) + 1
+        if len(rows) < _PAGE_SIZE:
+            break
+        start += _PAGE_SIZE
+    ranked = sorted(counts.items(), key=lambda x: (-x[1], x[0]))
+    return ranked[offset:offset + limit]
+
+
+async def _leaderboard_remote(sb, mode: str, limit: int, offset: int) -> list[dict]:
+    global _rpc_missing
+    # GROUP BY runs in Postgres via supabase/auttaja_leaderboard.sql when installed
+    if not _rpc_missing:
+        try:
+            result = await _execute(sb.rpc(_LEADERBOARD_RPC, {
+                "p_role": mode,
+                "p_include_removed": False,
+                "p_limit": limit,
+                "p_offset": offset,
+            }))
+            return [{"user_id": str(r["user_id"]), "count": r["count"]} for r in (result.data or [])]
+        except APIError as exc:
+            if exc.code != "PGRST202":
+                raise
+            _rpc_missing = True
+
+    ranked = await _leaderboard_scan(sb, mode, limit, offset)
+    return [{"user_id": uid, "count": count} for uid, count in ranked]
+
+
 @router.get("/leaderboard")
 async def leaderboard(
+    response: Response,
     mode: str = "offender",
+    limit: int = 25,
+    offset: int = 0,
     _user: dict = Depends(get_current_user),
 ):
+    limit = max(1, min(limit, 100))
+    offset = max(0, offset)
     if mode not in ("offender", "punisher"):
         raise HTTPException(status_code=400, detail="mode must be 'offender' or 'punisher'")
     sb = _require_supabase()
-    result = sb.table("punishments").select(mode).eq("deleted", False).execute()
-    counts: dict[str, int] = {}
-    for row in result.data:
-        uid = str(row.get(mode, ""))
-        if uid:
-            counts[uid] = counts.get(uid, 0) + 1
-    ranked = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:25]
-    return [{"user_id": uid, "count": count} for uid, count in ranked]
+    try:
+        return await _leaderboard_remote(sb, mode, limit, offset)
+    except ServiceUnavailable:
+        _serve_from_mirror(response)
+        return await _mirror_leaderboard(mode, limit, offset)
 
 
 @router.get("/{punishment_id}")
-async def get_punishment(punishment_id: int, _user: dict = Depends(get_current_user)):
+async def get_punishment(punishment_id: int, response: Response, _user: dict = Depends(get_current_user)):
     sb = _require_supabase()
-    result = sb.table("punishments").select("*").eq("id", punishment_id).execute()
-    if not result.data:
+    try:
+        result = await _execute(sb.table("punishments").select("*").eq("id", punishment_id))
+        row = result.data[0] if result.data else None
+    except ServiceUnavailable:
+        _serve_from_mirror(response)
+        row = await _mirror_get(punishment_id)
+    if row is None:
         raise HTTPException(status_code=404, detail="Punishment not found")
-    return result.data[0]
+    return row
 
 
 @router.put("/{punishment_id}")
@@ -101,12 +259,16 @@ async def update_punishment(
     _user: dict = Depends(get_current_user),
 ):
     sb = _require_supabase()
-    result = sb.table("punishments").update({
-        "offender": body.offender,
-        "punisher": body.punisher,
-        "action": body.action,
-        "reason": body.reason,
-    }).eq("id", punishment_id).execute()
+    try:
+        result = await _execute(sb.table("punishments").update({
+            "offender": body.offender,
+            "punisher": body.punisher,
+            "action": body.action,
+            "reason": body.reason,
+        }).eq("id", punishment_id))
+    except ServiceUnavailable:
+        # Writes can't be served from the read-only mirror
+        raise _unavailable()
     if not result.data:
         raise HTTPException(status_code=404, detail="Punishment not found")
     return result.data[0]
@@ -0,0 +1,36 @@
+import json
+
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+
+from ..auth import get_current_user
+from ..events import event_hub
+
+router = APIRouter()
+
+
+@router.get("")
+async def events(
+    request: Request,
+    last_event_id: str | None = Header(None),
+    _user: dict = Depends(get_current_user),
+):
+    """Server-Sent Events: warning.added/updated/deleted, poll.votes, poll.closed/reopened, resync."""
+
+    async def body():
+        yield "retry: 3000\n\n"
+        async for item in event_hub.stream(last_event_id):
+            if await request.is_disconnected():
+                break
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id, name, data = item
+            yield f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # nginx would otherwise buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,11 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import functools
+
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
 
 from ..auth import get_current_user
-from ..database import get_polls_db
+from ..database import VersionedCache, get_polls_db, polls_changes
+from ..etag import conditional
+from ..pagination import clamp_per_page, decode_id_cursor, encode_id_cursor
+from ..responses import JSONResponse, RawRows, json_object_sql
 
 router = APIRouter()
 
+_unchanged = conditional(polls_changes, "staffpoll_polls", "staffpoll_options", "staffpoll_votes")
+# Recomputed once per change to polls or votes, not per request
+_stats = VersionedCache(polls_changes, ("staffpoll_polls", "staffpoll_votes"), daily=True)
+_counts = VersionedCache(polls_changes, ("staffpoll_polls",))
+_POLL_JSON = json_object_sql(
+    (
+        "id", "title", "description", "created_at", "created_by", "channel_id",
+        "message_id", "is_active", "is_anonymous", "max_votes",
+    )
+)
+
 
 class PollCreate(BaseModel):
     title: str
@@ -25,34 +42,69 @@ def row_to_dict(row) -> dict:
     return dict(row)
 
 
-@router.get("")
+async def _count(db, where: str) -> int:
+    async with db.execute(f"SELECT COUNT(*) FROM staffpoll_polls {where}") as cur:
+        row = await cur.fetchone()
+    return int(row[0])
+
+
+def _encode_cursor(voted_at: str, vote_id: int) -> str:
+    raw = f"{voted_at}|{vote_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        voted_at, vote_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        return voted_at, int(vote_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("", dependencies=[_unchanged])
 async def list_polls(
+    response: Response,
     filter: str = "active",
     page: int = 1,
     per_page: int = 20,
+    cursor: str | None = None,
     _user: dict = Depends(get_current_user),
 ):
+    page = max(1, page)
+    per_page = clamp_per_page(per_page)
+    where = "WHERE is_active=1" if filter == "active" else ""
+
     async with get_polls_db() as db:
-        if filter == "active":
-            cursor = await db.execute(
-                "SELECT * FROM staffpoll_polls WHERE is_active=1 ORDER BY id DESC"
+        total = await _counts.get(("count", where), functools.partial(_count, db, where))
+        # One extra row tells us whether there is a next page
+        if cursor:
+            keyset = f"{where} AND id < ?" if where else "WHERE id < ?"
+            cur = await db.execute(
+                f"SELECT id, {_POLL_JSON} AS json FROM staffpoll_polls {keyset} ORDER BY id DESC LIMIT ?",
+                (decode_id_cursor(cursor), per_page + 1),
             )
         else:
-            cursor = await db.execute(
-                "SELECT * FROM staffpoll_polls ORDER BY id DESC"
+            cur = await db.execute(
+                f"SELECT id, {_POLL_JSON} AS json FROM staffpoll_polls {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                (per_page + 1, (page - 1) * per_page),
             )
-        all_rows = await cursor.fetchall()
-
-    total = len(all_rows)
-    offset = (page - 1) * per_page
-    rows = all_rows[offset : offset + per_page]
-    return {
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "pages": max(1, (total + per_page - 1) // per_page),
-        "items": [row_to_dict(r) for r in rows],
-    }
+        rows = await cur.fetchall()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    # Returned as a response so the pre-encoded rows skip FastAPI's encoder; keeps the ETag headers
+    return JSONResponse(
+        {
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": max(1, (total + per_page - 1) // per_page),
+            "items": RawRows(r["json"] for r in rows),
+            "next_cursor": encode_id_cursor(rows[-1]["id"]) if has_more else None,
+        },
+        headers=response.headers,
+    )
 
 
 @router.post("")
@@ -65,7 +117,7 @@ async def create_poll(
     if len(body.options) > 24:
         raise HTTPException(status_code=400, detail="Maximum 24 options allowed")
 
-    async with get_polls_db() as db:
+    async with get_polls_db(write=True) as db:
         cursor = await db.execute(
             """INSERT INTO staffpoll_polls
                (title, description, created_by, is_anonymous, max_votes)
@@ -74,34 +126,38 @@ async def create_poll(
         )
         poll_id = cursor.lastrowid
 
-        for i, label in enumerate(body.options):
-            await db.execute(
-                "INSERT INTO staffpoll_options (poll_id, label, display_order) VALUES (?, ?, ?)",
-                (poll_id, label, i),
-            )
+        await db.executemany(
+            "INSERT INTO staffpoll_options (poll_id, label, display_order) VALUES (?, ?, ?)",
+            [(poll_id, label, i) for i, label in enumerate(body.options)],
+        )
         await db.commit()
 
     return await _get_poll_full(poll_id)
 
 
-@router.get("/stats")
-async def poll_stats(_user: dict = Depends(get_current_user)):
+async def _compute_poll_stats() -> dict:
     async with get_polls_db() as db:
-        cursor = await db.execute("SELECT COUNT(*) as total FROM staffpoll_polls")
-        total = (await cursor.fetchone())["total"]
-
         cursor = await db.execute(
-            "SELECT COUNT(*) as active FROM staffpoll_polls WHERE is_active=1"
+            "SELECT (SELECT COUNT(*) FROM staffpoll_polls) as total, "
+            "(SELECT COUNT(*) FROM staffpoll_polls WHERE is_active=1) as active, "
+            "(SELECT COUNT(*) FROM staffpoll_votes) as votes, "
+            "(SELECT COUNT(*) FROM staffpoll_votes WHERE voted_at >= date('now', '-7 days')) as recent"
         )
-        active = (await cursor.fetchone())["active"]
+        row = await cursor.fetchone()
+    return {
+        "total": row["total"],
+        "active": row["active"],
+        "total_votes": row["votes"],
+        "votes_last_7_days": row["recent"],
+    }
 
-        cursor = await db.execute("SELECT COUNT(*) as votes FROM staffpoll_votes")
-        votes = (await cursor.fetchone())["votes"]
 
-    return {"total": total, "active": active, "total_votes": votes}
+@router.get("/stats", dependencies=[conditional(polls_changes, "staffpoll_polls", "staffpoll_votes", daily=True)])
+async def poll_stats(_user: dict = Depends(get_current_user)):
+    return await _stats.get("stats", _compute_poll_stats)
 
 
-@router.get("/{poll_id}")
+@router.get("/{poll_id}", dependencies=[_unchanged])
 async def get_poll(poll_id: int, _user: dict = Depends(get_current_user)):
     result = await _get_poll_full(poll_id)
     if not result:
@@ -115,7 +171,7 @@ async def update_poll(
     body: PollUpdate,
     _user: dict = Depends(get_current_user),
 ):
-    async with get_polls_db() as db:
+    async with get_polls_db(write=True) as db:
         cursor = await db.execute(
             "UPDATE staffpoll_polls SET title=?, description=? WHERE id=?",
             (body.title, body.description, poll_id),
@@ -134,11 +190,10 @@ async def update_poll(
             raise HTTPException(
                 status_code=400, detail="Option count mismatch — cannot add/remove options"
             )
-        for opt, label in zip(options, body.option_labels):
-            await db.execute(
-                "UPDATE staffpoll_options SET label=? WHERE id=?",
-                (label, opt["id"]),
-            )
+        await db.executemany(
+            "UPDATE staffpoll_options SET label=? WHERE id=?",
+            [(label, opt["id"]) for opt, label in zip(options, body.option_labels)],
+        )
         await db.commit()
 
     return await _get_poll_full(poll_id)
@@ -146,7 +201,7 @@ async def update_poll(
 
 @router.delete("/{poll_id}")
 async def close_poll(poll_id: int, _user: dict = Depends(get_current_user)):
-    async with get_polls_db() as db:
+    async with get_polls_db(write=True) as db:
         cursor = await db.execute(
             "UPDATE staffpoll_polls SET is_active=0 WHERE id=?", (poll_id,)
         )
@@ -158,7 +213,7 @@ async def close_poll(poll_id: int, _user: dict = Depends(get_current_user)):
 
 @router.post("/{poll_id}/reopen")
 async def reopen_poll(poll_id: int, _user: dict = Depends(get_current_user)):
-    async with get_polls_db() as db:
+    async with get_polls_db(write=True) as db:
         cursor = await db.execute(
             "UPDATE staffpoll_polls SET is_active=1 WHERE id=?", (poll_id,)
         )
@@ -168,7 +223,7 @@ async def reopen_poll(poll_id: int, _user: dict = Depends(get_current_user)):
     return await _get_poll_full(poll_id)
 
 
-@router.get("/{poll_id}/results")
+@router.get("/{poll_id}/results", dependencies=[_unchanged])
 async def poll_results(poll_id: int, _user: dict = Depends(get_current_user)):
     async with get_polls_db() as db:
         cursor = await db.execute(
@@ -191,12 +246,6 @@ async def poll_results(poll_id: int, _user: dict = Depends(get_current_user)):
         vote_rows = await cursor.fetchall()
         vote_counts = {r["option_id"]: r["count"] for r in vote_rows}
 
-        cursor = await db.execute(
-            "SELECT user_id, option_id FROM staffpoll_votes WHERE poll_id=?",
-            (poll_id,),
-        )
-        all_votes = await cursor.fetchall()
-
     total_votes = sum(vote_counts.values())
     results = []
     for opt in options:
@@ -212,14 +261,73 @@ async def poll_results(poll_id: int, _user: dict = Depends(get_current_user)):
         "poll": row_to_dict(poll),
         "options": results,
         "total_votes": total_votes,
-        "voters": (
-            [{"user_id": str(v["user_id"]), "option_id": v["option_id"]} for v in all_votes]
-            if not poll["is_anonymous"]
-            else []
-        ),
     }
 
 
+@router.get("/{poll_id}/participants", dependencies=[_unchanged])
+async def poll_participants(
+    poll_id: int,
+    response: Response,
+    option_id: int,
+    cursor: str | None = None,
+    limit: int = 50,
+    _user: dict = Depends(get_current_user),
+):
+    limit = max(1, min(limit, 100))
+    after = _decode_cursor(cursor) if cursor else None
+
+    async with get_polls_db() as db:
+        cur = await db.execute(
+            "SELECT is_anonymous FROM staffpoll_polls WHERE id=?", (poll_id,)
+        )
+        poll = await cur.fetchone()
+        if not poll:
+            raise HTTPException(status_code=404, detail="Poll not found")
+        if poll["is_anonymous"]:
+            raise HTTPException(status_code=403, detail="Poll is anonymous")
+
+        cur = await db.execute(
+            "SELECT COUNT(*) as count FROM staffpoll_votes WHERE poll_id=? AND option_id=?",
+            (poll_id, option_id),
+        )
+        total = (await cur.fetchone())["count"]
+
+        if after is None:
+            cur = await db.execute(
+                """SELECT id, voted_at,
+                          json_object('user_id', CAST(user_id AS TEXT), 'voted_at', voted_at) AS json
+                   FROM staffpoll_votes
+                   WHERE poll_id=? AND option_id=?
+                   ORDER BY voted_at, id LIMIT ?""",
+                (poll_id, option_id, limit + 1),
+            )
+        else:
+            cur = await db.execute(
+                """SELECT id, voted_at,
+                          json_object('user_id', CAST(user_id AS TEXT), 'voted_at', voted_at) AS json
+                   FROM staffpoll_votes
+                   WHERE poll_id=? AND option_id=? AND (voted_at, id) > (?, ?)
+                   ORDER BY voted_at, id LIMIT ?""",
+                (poll_id, option_id, after[0], after[1], limit + 1),
+            )
+        rows = await cur.fetchall()
+
+    page = rows[:limit]
+    next_cursor = (
+        _encode_cursor(page[-1]["voted_at"], page[-1]["id"]) if len(rows) > limit else None
+    )
+    return JSONResponse(
+        {
+            "poll_id": poll_id,
+            "option_id": option_id,
+            "total": total,
+            "items": RawRows(r["json"] for r in page),
+            "next_cursor": next_cursor,
+        },
+        headers=response.headers,
+    )
+
+
 async def _get_poll_full(poll_id: int) -> dict | None:
     async with get_polls_db() as db:
         cursor = await db.execute(
@@ -0,0 +1,293 @@
+import asyncio
+import base64
+import datetime
+import heapq
+import itertools
+import math
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from ..auth import get_current_user
+from ..breaker import ServiceUnavailable
+from ..database import auttaja_mirror_available, get_auttaja_mirror_db, get_warnings_db
+from ..users import is_user_id
+from . import auttaja
+
+router = APIRouter()
+
+_RECENT_DAYS = 30
+_CACHE_TTL = 30.0
+_CACHE_MAX_SIZE = 512
+# (user_id, cursor, limit) -> (stored_at, payload)
+_cache: dict[tuple[str, str, int], tuple[float, dict]] = {}
+
+
+def _encode_cursor(verbal_before: int, auttaja_offset: int) -> str:
+    raw = f"{verbal_before}|{auttaja_offset}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        verbal_before, auttaja_offset = base64.urlsafe_b64decode(padded).decode().split("|")
+        return int(verbal_before), int(auttaja_offset)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _epoch(raw) -> float | None:
+    # Same formats the bot accepts: epoch float, ISO string, or a leftover {"epoch_time": ...} dict
+    if raw is None or raw == "":
+        return None
+    if isinstance(raw, dict):
+        raw = raw.get("epoch_time")
+        if raw is None:
+            return None
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    try:
+        dt = datetime.datetime.fromisoformat(str(raw).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def _sort_key(item: dict) -> float:
+    # Undated Auttaja rows sort first, as Postgres puts NULLs first in DESC order
+    return math.inf if item["timestamp"] is None else item["timestamp"]
+
+
+def _verbal_item(row) -> dict:
+    return {
+        "source": "verbal",
+        "id": row["id"],
+        "timestamp": _epoch(row["createdAt"]),
+        "action": "verbal",
+        "reason": row["reason"],
+        "moderator_id": str(row["modId"]),
+        "evidence_link": row["evidenceLink"],
+        "removed": False,
+    }
+
+
+def _auttaja_item(row) -> dict:
+    return {
+        "source": "auttaja",
+        "id": row["id"],
+        "timestamp": _epoch(row.get("timestamp")),
+        "action": (row.get("action") or "unknown").lower(),
+        "reason": row.get("reason") or "",
+        "moderator_id": str(row.get("punisher") or ""),
+        "duration": row.get("duration"),
+        "removed": bool(row.get("deleted")),
+    }
+
+
+# ---- verbal warnings ----
+
+
+async def _verbal_page(user_id: int, before: int, limit: int) -> list[dict]:
+    async with get_warnings_db() as db:
+        cursor = await db.execute(
+            "SELECT * FROM verbal_warnings WHERE userId = ? AND (? = 0 OR id < ?) ORDER BY id DESC LIMIT ?",
+            (user_id, before, before, limit),
+        )
+        return [_verbal_item(r) for r in await cursor.fetchall()]
+
+
+async def _verbal_summary(user_id: int) -> dict:
+    async with get_warnings_db() as db:
+        cursor = await db.execute(
+            "SELECT COUNT(*) AS total, "
+            "COALESCE(SUM(createdAt >= datetime('now', ?)), 0) AS recent "
+            "FROM verbal_warnings WHERE userId = ?",
+            (f"-{_RECENT_DAYS} days", user_id),
+        )
+        row = await cursor.fetchone()
+    return {"total": row["total"], "last_30_days": row["recent"]}
+
+
+# ---- Auttaja punishments (Supabase, or the bot's mirror while it is down) ----
+
+
+async def _auttaja_page_remote(sb, user_id: str, offset: int, limit: int) -> list[dict]:
+    result = await auttaja._execute(
+        sb.table("punishments")
+        .select("*")
+        .eq("offender", user_id)
+        .order("timestamp", desc=True)
+        .order("id", desc=True)
+        .range(offset, offset + limit - 1)
+    )
+    return [_auttaja_item(r) for r in (result.data or [])]
+
+
+async def _auttaja_summary_remote(sb, user_id: str) -> dict:
+    """Pages through (action, timestamp) for the user once, counting both totals and the last 30 days."""
+    cutoff = time.time() - _RECENT_DAYS * 86400
+    actions: dict[str, int] = {}
+    recent: dict[str, int] = {}
+    start = 0
+    while True:
+        result = await auttaja._execute(
+            sb.table("punishments")
+            .select("action,timestamp")
+            .eq("offender", user_id)
+            .order("id")
+            .range(start, start + auttaja._PAGE_SIZE - 1)
+        )
+        rows = result.data or []
+        for row in rows:
+            action = (row.get("action") or "unknown").lower()
+            actions[action] = actions.get(action, 0) + 1
+            ts = _epoch(row.get("timestamp"))
+            if ts is not None and ts >= cutoff:
+                recent[action] = recent.get(action, 0) + 1
+        if len(rows) < auttaja._PAGE_SIZE:
+            break
+        start += auttaja._PAGE_SIZE
+    return {"total": sum(actions.values()), "last_30_days": sum(recent.values()), "actions": actions, "recent_actions": recent}
+
+
+async def _auttaja_page_mirror(user_id: str, offset: int, limit: int) -> list[dict]:
+    async with get_auttaja_mirror_db() as db:
+        async with db.execute(
+            "SELECT * FROM auttaja_punishments WHERE offender = ? "
+            "ORDER BY timestamp DESC NULLS FIRST, id DESC LIMIT ? OFFSET ?",
+            (user_id, limit, offset),
+        ) as cur:
+            return [_auttaja_item(dict(r)) for r in await cur.fetchall()]
+
+
+async def _auttaja_summary_mirror(user_id: str) -> dict:
+    cutoff = time.time() - _RECENT_DAYS * 86400
+    async with get_auttaja_mirror_db() as db:
+        async with db.execute(
+            "SELECT LOWER(COALESCE(action, 'unknown')) AS action, COUNT(*) AS total, "
+            "SUM(timestamp >= ?) AS recent "
+            "FROM auttaja_punishments WHERE offender = ? GROUP BY 1",
+            (cutoff, user_id),
+        ) as cur:
+            rows = await cur.fetchall()
+    actions = {r["action"]: r["total"] for r in rows}
+    recent = {r["action"]: r["recent"] for r in rows if r["recent"]}
+    return {"total": sum(actions.values()), "last_30_days": sum(recent.values()), "actions": actions, "recent_actions": recent}
+
+
+async def _auttaja_part(user_id: str, offset: int, limit: int, with_summary: bool):
+    """Returns (items, summary, source); source is None when no Auttaja data can be read."""
+    sb = auttaja._sb
+    if sb is not None:
+        try:
+            page, summary = await asyncio.gather(
+                _auttaja_page_remote(sb, user_id, offset, limit),
+                _auttaja_summary_remote(sb, user_id) if with_summary else asyncio.sleep(0),
+            )
+            return page, summary, "supabase"
+        except ServiceUnavailable:
+            pass
+    if not auttaja_mirror_available():
+        return [], None, None
+    page = await _auttaja_page_mirror(user_id, offset, limit)
+    summary = await _auttaja_summary_mirror(user_id) if with_summary else None
+    return page, summary, "mirror"
+
+
+# ---- cache ----
+
+
+def _cache_get(key: tuple[str, str, int]) -> dict | None:
+    hit = _cache.get(key)
+    if hit is None:
+        return None
+    if time.monotonic() - hit[0] > _CACHE_TTL:
+        _cache.pop(key, None)
+        return None
+    return hit[1]
+
+
+def _cache_put(key: tuple[str, str, int], payload: dict) -> None:
+    if len(_cache) >= _CACHE_MAX_SIZE:
+        # Dicts keep insertion order, so this drops the oldest entry
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic(), payload)
+
+
+@router.get("/{user_id}")
+async def get_profile(
+    user_id: str,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 25,
+    _user: dict = Depends(get_current_user),
+):
+    if not is_user_id(user_id):
+        raise HTTPException(status_code=400, detail="user_id must be a Discord user ID")
+    limit = max(1, min(limit, 100))
+
+    key = (user_id, cursor or "", limit)
+    cached = _cache_get(key)
+    if cached is not None:
+        response.headers["X-Cache"] = "hit"
+        return cached
+
+    verbal_before, auttaja_offset = _decode_cursor(cursor) if cursor else (0, 0)
+    first_page = cursor is None
+
+    # Each source returns at most `limit` rows, already sorted newest-first
+    verbal_rows, verbal_summary, (auttaja_rows, auttaja_summary, source) = await asyncio.gather(
+        _verbal_page(int(user_id), verbal_before, limit),
+        _verbal_summary(int(user_id)) if first_page else asyncio.sleep(0),
+        _auttaja_part(user_id, auttaja_offset, limit, with_summary=first_page),
+    )
+
+    merged = heapq.merge(verbal_rows, auttaja_rows, key=_sort_key, reverse=True)
+    items = list(itertools.islice(merged, limit))
+
+    used_verbal = [i for i in items if i["source"] == "verbal"]
+    used_auttaja = sum(1 for i in items if i["source"] == "auttaja")
+    has_more = (
+        len(used_verbal) < len(verbal_rows)
+        or used_auttaja < len(auttaja_rows)
+        or len(verbal_rows) == limit
+        or len(auttaja_rows) == limit
+    )
+    next_cursor = (
+        _encode_cursor(used_verbal[-1]["id"] if used_verbal else verbal_before, auttaja_offset + used_auttaja)
+        if has_more
+        else None
+    )
+
+    payload: dict = {"user_id": user_id, "items": items, "next_cursor": next_cursor}
+    if first_page:
+        actions = dict(auttaja_summary["actions"]) if auttaja_summary else {}
+        recent = dict(auttaja_summary["recent_actions"]) if auttaja_summary else {}
+        if verbal_summary["total"]:
+            actions["verbal"] = verbal_summary["total"]
+        if verbal_summary["last_30_days"]:
+            recent["verbal"] = verbal_summary["last_30_days"]
+        payload["summary"] = {
+            "total": verbal_summary["total"] + (auttaja_summary["total"] if auttaja_summary else 0),
+            "last_30_days": sum(recent.values()),
+            "verbal": verbal_summary,
+            "auttaja": (
+                {"total": auttaja_summary["total"], "last_30_days": auttaja_summary["last_30_days"]}
+                if auttaja_summary
+                else None
+            ),
+            "actions": actions,
+            "recent_actions": recent,
+        }
+
+    if source is None and auttaja._sb is not None:
+        response.headers["X-Data-Source"] = "partial"
+    elif source == "mirror":
+        response.headers["X-Data-Source"] = "mirror"
+    else:
+        # Only cache complete, live answers
+        _cache_put(key, payload)
+    return payload
@@ -2,10 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from ..auth import get_current_user
-from ..database import get_polls_db, get_templates_db
+from ..database import get_polls_db, get_templates_db, templates_changes
+from ..etag import conditional
 
 router = APIRouter()
 
+_unchanged = conditional(templates_changes, "poll_templates", "poll_template_options")
+
 
 class TemplateCreate(BaseModel):
     name: str
@@ -25,7 +28,7 @@ def row_to_dict(row) -> dict:
     return dict(row)
 
 
-@router.get("")
+@router.get("", dependencies=[_unchanged])
 async def list_templates(
     filter: str = "active",
     _user: dict = Depends(get_current_user),
@@ -53,7 +56,7 @@ async def create_template(
     if len(body.options) > 24:
         raise HTTPException(status_code=400, detail="Maximum 24 options allowed")
 
-    async with get_templates_db() as db:
+    async with get_templates_db(write=True) as db:
         cursor = await db.execute(
             """INSERT INTO poll_templates
                (name, description, created_by, is_anonymous, max_votes)
@@ -61,11 +64,10 @@ async def create_template(
             (body.name, body.description, int(user["sub"]), int(body.is_anonymous), body.max_votes),
         )
         template_id = cursor.lastrowid
-        for i, label in enumerate(body.options):
-            await db.execute(
-                "INSERT INTO poll_template_options (template_id, label, display_order) VALUES (?, ?, ?)",
-                (template_id, label, i),
-            )
+        await db.executemany(
+            "INSERT INTO poll_template_options (template_id, label, display_order) VALUES (?, ?, ?)",
+            [(template_id, label, i) for i, label in enumerate(body.options)],
+        )
         await db.commit()
 
     return await _get_template_full(template_id)
@@ -89,7 +91,7 @@ async def template_from_poll(
         )
         options = await cursor.fetchall()
 
-    async with get_templates_db() as db:
+    async with get_templates_db(write=True) as db:
         cursor = await db.execute(
             """INSERT INTO poll_templates
                (name, description, created_by, is_anonymous, max_votes)
@@ -103,17 +105,16 @@ async def template_from_poll(
             ),
         )
         template_id = cursor.lastrowid
-        for i, opt in enumerate(options):
-            await db.execute(
-                "INSERT INTO poll_template_options (template_id, label, display_order) VALUES (?, ?, ?)",
-                (template_id, opt["label"], i),
-            )
+        await db.executemany(
+            "INSERT INTO poll_template_options (template_id, label, display_order) VALUES (?, ?, ?)",
+            [(template_id, opt["label"], i) for i, opt in enumerate(options)],
+        )
         await db.commit()
 
     return await _get_template_full(template_id)
 
 
-@router.get("/{template_id}")
+@router.get("/{template_id}", dependencies=[_unchanged])
 async def get_template(template_id: int, _user: dict = Depends(get_current_user)):
     result = await _get_template_full(template_id)
     if not result:
@@ -127,7 +128,7 @@ async def update_template(
     body: TemplateUpdate,
     _user: dict = Depends(get_current_user),
 ):
-    async with get_templates_db() as db:
+    async with get_templates_db(write=True) as db:
         cursor = await db.execute(
             "UPDATE poll_templates SET name=?, description=? WHERE id=?",
             (body.name, body.description, template_id),
@@ -143,11 +144,10 @@ async def update_template(
         options = await cursor.fetchall()
         if len(options) != len(body.option_labels):
             raise HTTPException(status_code=400, detail="Option count mismatch")
-        for opt, label in zip(options, body.option_labels):
-            await db.execute(
-                "UPDATE poll_template_options SET label=? WHERE id=?",
-                (label, opt["id"]),
-            )
+        await db.executemany(
+            "UPDATE poll_template_options SET label=? WHERE id=?",
+            [(label, opt["id"]) for opt, label in zip(options, body.option_labels)],
+        )
         await db.commit()
 
     return await _get_template_full(template_id)
@@ -155,7 +155,7 @@ async def update_template(
 
 @router.delete("/{template_id}")
 async def delete_template(template_id: int, _user: dict = Depends(get_current_user)):
-    async with get_templates_db() as db:
+    async with get_templates_db(write=True) as db:
         cursor = await db.execute(
             "UPDATE poll_templates SET is_deleted=1 WHERE id=?", (template_id,)
         )
@@ -167,7 +167,7 @@ async def delete_template(template_id: int, _user: dict = Depends(get_current_us
 
 @router.post("/{template_id}/restore")
 async def restore_template(template_id: int, _user: dict = Depends(get_current_user)):
-    async with get_templates_db() as db:
+    async with get_templates_db(write=True) as db:
         cursor = await db.execute(
             "UPDATE poll_templates SET is_deleted=0 WHERE id=?", (template_id,)
         )
@@ -193,7 +193,7 @@ async def use_template(
     max_votes = body.get("max_votes", result["max_votes"])
     option_labels = [o["label"] for o in result["options"]]
 
-    async with get_polls_db() as db:
+    async with get_polls_db(write=True) as db:
         cursor = await db.execute(
             """INSERT INTO staffpoll_polls
                (title, description, created_by, is_anonymous, max_votes)
@@ -201,11 +201,10 @@ async def use_template(
             (result["name"], result["description"], int(user["sub"]), int(is_anonymous), max_votes),
         )
         poll_id = cursor.lastrowid
-        for i, label in enumerate(option_labels):
-            await db.execute(
-                "INSERT INTO staffpoll_options (poll_id, label, display_order) VALUES (?, ?, ?)",
-                (poll_id, label, i),
-            )
+        await db.executemany(
+            "INSERT INTO staffpoll_options (poll_id, label, display_order) VALUES (?, ?, ?)",
+            [(poll_id, label, i) for i, label in enumerate(option_labels)],
+        )
         await db.commit()
 
     # Import to avoid circular
@@ -1,23 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
-import httpx
 
 from ..auth import get_current_user
-from ..config import DISCORD_BOT_TOKEN, DISCORD_GUILD_ID
-from ..database import get_warnings_db
+from ..config import DISCORD_GUILD_ID
+from ..database import get_warnings_db, warnings_changes
+from ..discord_rest import discord_rest
+from ..etag import conditional
+from ..users import is_user_id, user_cache
 
 router = APIRouter()
 
-DISCORD_API = "https://discord.com/api/v10"
-
-
 async def _bot_get(path: str) -> dict | list:
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            f"{DISCORD_API}{path}",
-            headers={"Authorization": f"Bot {DISCORD_BOT_TOKEN}"},
-        )
-        resp.raise_for_status()
-        return resp.json()
+    resp = await discord_rest.get(path)
+    resp.raise_for_status()
+    return resp.json()
 
 
 @router.get("/ping")
@@ -44,25 +39,26 @@ async def guild_info(_user: dict = Depends(get_current_user)):
     }
 
 
+_MAX_BATCH_IDS = 100
+
+
+@router.get("/discord/users")
+async def get_discord_users(ids: str, _user: dict = Depends(get_current_user)):
+    """Resolves up to 100 comma-separated IDs in one call; unknown users map to null."""
+    user_ids = [uid for uid in dict.fromkeys(s.strip() for s in ids.split(",")) if is_user_id(uid)]
+    if len(user_ids) > _MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {_MAX_BATCH_IDS} ids per request")
+    return {"users": await user_cache.get_many(user_ids)}
+
+
 @router.get("/discord/user/{user_id}")
 async def get_discord_user(user_id: str, _user: dict = Depends(get_current_user)):
-    try:
-        data = await _bot_get(f"/users/{user_id}")
-        avatar_hash = data.get("avatar")
-        return {
-            "id": data["id"],
-            "username": data.get("global_name") or data.get("username", "Unknown User"),
-            "discriminator": data.get("discriminator", "0"),
-            "avatar_url": (
-                f"https://cdn.discordapp.com/avatars/{data['id']}/{avatar_hash}.png"
-                if avatar_hash
-                else f"https://cdn.discordapp.com/embed/avatars/{int(data['id']) % 5}.png"
-            ),
-        }
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 404:
-            raise HTTPException(status_code=404, detail="User not found")
-        raise HTTPException(status_code=502, detail="Discord API error")
+    if not is_user_id(user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    user = await user_cache.get(user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 @router.get("/channels")
@@ -130,7 +126,7 @@ async def get_members(
     return members
 
 
-@router.get("/warning-ids")
+@router.get("/warning-ids", dependencies=[conditional(warnings_changes, "verbal_warnings")])
 async def get_warning_ids(
     mode: str = "offender",
     _user: dict = Depends(get_current_user),
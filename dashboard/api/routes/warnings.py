@@ -1,13 +1,26 @@
-import httpx
-from fastapi import APIRouter, Depends, HTTPException
+import datetime
+import functools
+
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
 
 from ..auth import get_current_user
-from ..config import DISCORD_BOT_TOKEN, EMBED_COLOR, LOG_CHANNEL_ID
-from ..database import get_warnings_db
+from ..config import EMBED_COLOR, LOG_CHANNEL_ID
+from ..database import VersionedCache, get_warnings_db, warnings_changes
+from ..discord_rest import discord_rest
+from ..etag import conditional
+from ..pagination import clamp_per_page, decode_id_cursor, encode_id_cursor
+from ..responses import JSONResponse, RawRows, json_object_sql
 
 router = APIRouter()
 
+_unchanged = conditional(warnings_changes, "verbal_warnings")
+# Stats and leaderboards are recomputed once per change to the table (and once a day), not per request
+_derived = VersionedCache(warnings_changes, ("verbal_warnings",), daily=True)
+_counts = VersionedCache(warnings_changes, ("verbal_warnings",))
+_STATS_DAYS = 30
+_ROW_JSON = json_object_sql(("id", "createdAt", "userId", "reason", "evidenceLink", "modId"))
+
 
 class WarningCreate(BaseModel):
     userId: str
@@ -27,6 +40,12 @@ def row_to_dict(row) -> dict:
     return dict(row)
 
 
+async def _count(db, where: str, params: tuple) -> int:
+    async with db.execute(f"SELECT COUNT(*) FROM verbal_warnings {where}", params) as cur:
+        row = await cur.fetchone()
+    return int(row[0])
+
+
 def _normalize_evidence_link(link: str) -> str:
     return link.replace("https://canary.discord.com", "https://discord.com")
 
@@ -45,43 +64,53 @@ async def _post_warning_to_log_channel(warning: dict) -> None:
             {"name": "Reason", "value": warning["reason"], "inline": False},
         ],
     }
-    async with httpx.AsyncClient() as client:
-        await client.post(
-            f"https://discord.com/api/v10/channels/{LOG_CHANNEL_ID}/messages",
-            headers={"Authorization": f"Bot {DISCORD_BOT_TOKEN}"},
-            json={"embeds": [embed]},
-        )
+    await discord_rest.post(f"/channels/{LOG_CHANNEL_ID}/messages", json={"embeds": [embed]})
 
 
-@router.get("")
+@router.get("", dependencies=[_unchanged])
 async def list_warnings(
+    response: Response,
     page: int = 1,
     per_page: int = 20,
     user_id: str | None = None,
+    cursor: str | None = None,
     _user: dict = Depends(get_current_user),
 ):
+    page = max(1, page)
+    per_page = clamp_per_page(per_page)
+    where, params = ("WHERE userId = ?", (int(user_id),)) if user_id else ("", ())
+
     async with get_warnings_db() as db:
-        if user_id:
-            cursor = await db.execute(
-                "SELECT * FROM verbal_warnings WHERE userId = ? ORDER BY id DESC",
-                (int(user_id),),
+        total = await _counts.get(("count", where, params), functools.partial(_count, db, where, params))
+        # One extra row tells us whether there is a next page
+        if cursor:
+            # Keyset: cost stays flat however deep the page is
+            keyset = f"{where} AND id < ?" if where else "WHERE id < ?"
+            cur = await db.execute(
+                f"SELECT id, {_ROW_JSON} AS json FROM verbal_warnings {keyset} ORDER BY id DESC LIMIT ?",
+                (*params, decode_id_cursor(cursor), per_page + 1),
             )
         else:
-            cursor = await db.execute(
-                "SELECT * FROM verbal_warnings ORDER BY id DESC"
+            cur = await db.execute(
+                f"SELECT id, {_ROW_JSON} AS json FROM verbal_warnings {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                (*params, per_page + 1, (page - 1) * per_page),
             )
-        all_rows = await cursor.fetchall()
-
-    total = len(all_rows)
-    offset = (page - 1) * per_page
-    rows = all_rows[offset : offset + per_page]
-    return {
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "pages": max(1, (total + per_page - 1) // per_page),
-        "items": [row_to_dict(r) for r in rows],
-    }
+        rows = await cur.fetchall()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    # Returned as a response so the pre-encoded rows skip FastAPI's encoder; keeps the ETag headers
+    return JSONResponse(
+        {
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": max(1, (total + per_page - 1) // per_page),
+            "items": RawRows(r["json"] for r in rows),
+            "next_cursor": encode_id_cursor(rows[-1]["id"]) if has_more else None,
+        },
+        headers=response.headers,
+    )
 
 
 @router.post("")
@@ -91,7 +120,7 @@ async def create_warning(
 ):
     evidence_link = _normalize_evidence_link(body.evidenceLink)
 
-    async with get_warnings_db() as db:
+    async with get_warnings_db(write=True) as db:
         cursor = await db.execute(
             "INSERT INTO verbal_warnings (userId, reason, evidenceLink, modId) VALUES (?, ?, ?, ?)",
             (int(body.userId), body.reason, evidence_link, int(body.modId)),
@@ -99,7 +128,6 @@ async def create_warning(
         await db.commit()
         warning_id = cursor.lastrowid
 
-    async with get_warnings_db() as db:
         cursor = await db.execute(
             "SELECT * FROM verbal_warnings WHERE id = ?", (warning_id,)
         )
@@ -110,16 +138,14 @@ async def create_warning(
     return warning
 
 
-@router.get("/stats")
-async def get_stats(_user: dict = Depends(get_current_user)):
+async def _compute_stats() -> dict:
     async with get_warnings_db() as db:
-        cursor = await db.execute("SELECT COUNT(*) as total FROM verbal_warnings")
-        total_row = await cursor.fetchone()
-
         cursor = await db.execute(
-            "SELECT COUNT(*) as count FROM verbal_warnings WHERE createdAt >= date('now', '-7 days')"
+            "SELECT COUNT(*) as total, "
+            "COALESCE(SUM(createdAt >= date('now', '-7 days')), 0) as last_7_days "
+            "FROM verbal_warnings"
         )
-        recent_row = await cursor.fetchone()
+        totals = await cursor.fetchone()
 
         cursor = await db.execute(
             "SELECT userId, COUNT(*) as count FROM verbal_warnings GROUP BY userId ORDER BY count DESC LIMIT 5"
@@ -127,19 +153,39 @@ async def get_stats(_user: dict = Depends(get_current_user)):
         top_offenders = await cursor.fetchall()
 
         cursor = await db.execute(
-            "SELECT modId, COUNT(*) as count FROM verbal_warnings GROUP BY modId ORDER BY count DESC LIMIT 5"
+            "SELECT modId, COUNT(*) as count, "
+            "COALESCE(SUM(createdAt >= date('now', '-7 days')), 0) as week "
+            "FROM verbal_warnings GROUP BY modId"
         )
-        top_mods = await cursor.fetchall()
+        mods = await cursor.fetchall()
 
+        cursor = await db.execute(
+            "SELECT date(createdAt) as day, COUNT(*) as count FROM verbal_warnings "
+            "WHERE createdAt >= date('now', ?) GROUP BY day",
+            (f"-{_STATS_DAYS - 1} days",),
+        )
+        per_day = {r["day"]: r["count"] for r in await cursor.fetchall()}
+
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    days = [(today - datetime.timedelta(days=i)).isoformat() for i in range(_STATS_DAYS - 1, -1, -1)]
+    by_total = sorted(mods, key=lambda r: r["count"], reverse=True)[:5]
+    by_week = sorted((r for r in mods if r["week"]), key=lambda r: r["week"], reverse=True)[:5]
     return {
-        "total": total_row["total"],
-        "last_7_days": recent_row["count"],
+        "total": totals["total"],
+        "last_7_days": totals["last_7_days"],
         "top_offenders": [dict(r) for r in top_offenders],
-        "top_mods": [dict(r) for r in top_mods],
+        "top_mods": [{"modId": r["modId"], "count": r["count"]} for r in by_total],
+        "top_mods_week": [{"modId": r["modId"], "count": r["week"]} for r in by_week],
+        "daily": [{"date": d, "count": per_day.get(d, 0)} for d in days],
     }
 
 
-@router.get("/leaderboard")
+@router.get("/stats", dependencies=[conditional(warnings_changes, "verbal_warnings", daily=True)])
+async def get_stats(_user: dict = Depends(get_current_user)):
+    return await _derived.get("stats", _compute_stats)
+
+
+@router.get("/leaderboard", dependencies=[_unchanged])
 async def leaderboard(
     mode: str = "offender",
     _user: dict = Depends(get_current_user),
@@ -148,16 +194,19 @@ async def leaderboard(
         raise HTTPException(status_code=400, detail="mode must be 'offender' or 'mod'")
 
     field = "userId" if mode == "offender" else "modId"
-    async with get_warnings_db() as db:
-        cursor = await db.execute(
-            f"SELECT {field} as user_id, COUNT(*) as count FROM verbal_warnings GROUP BY {field} ORDER BY count DESC LIMIT 25"
-        )
-        rows = await cursor.fetchall()
 
-    return [{"user_id": str(r["user_id"]), "count": r["count"]} for r in rows]
+    async def compute() -> list[dict]:
+        async with get_warnings_db() as db:
+            cursor = await db.execute(
+                f"SELECT {field} as user_id, COUNT(*) as count FROM verbal_warnings GROUP BY {field} ORDER BY count DESC LIMIT 25"
+            )
+            rows = await cursor.fetchall()
+        return [{"user_id": str(r["user_id"]), "count": r["count"]} for r in rows]
+
+    return await _derived.get(("leaderboard", mode), compute)
 
 
-@router.get("/{warning_id}")
+@router.get("/{warning_id}", dependencies=[_unchanged])
 async def get_warning(warning_id: int, _user: dict = Depends(get_current_user)):
     async with get_warnings_db() as db:
         cursor = await db.execute(
@@ -176,7 +225,7 @@ async def update_warning(
     body: WarningUpdate,
     _user: dict = Depends(get_current_user),
 ):
-    async with get_warnings_db() as db:
+    async with get_warnings_db(write=True) as db:
         cursor = await db.execute(
             "UPDATE verbal_warnings SET userId=?, reason=?, evidenceLink=?, modId=? WHERE id=?",
             (int(body.userId), body.reason, body.evidenceLink, int(body.modId), warning_id),
@@ -185,7 +234,6 @@ async def update_warning(
         if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Warning not found")
 
-    async with get_warnings_db() as db:
         cursor = await db.execute(
             "SELECT * FROM verbal_warnings WHERE id = ?", (warning_id,)
         )
@@ -196,7 +244,7 @@ async def update_warning(
 
 @router.delete("/{warning_id}")
 async def delete_warning(warning_id: int, _user: dict = Depends(get_current_user)):
-    async with get_warnings_db() as db:
+    async with get_warnings_db(write=True) as db:
         cursor = await db.execute(
             "DELETE FROM verbal_warnings WHERE id = ?", (warning_id,)
         )
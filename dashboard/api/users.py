@@ -0,0 +1,276 @@
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+import aiosqlite
+import httpx
+
+from .config import USER_CACHE_DB
+from .database import get_warnings_db
+from .discord_rest import discord_rest
+
+
+def user_to_dict(data: dict) -> dict:
+    avatar_hash = data.get("avatar")
+    return {
+        "id": data["id"],
+        "username": data.get("global_name") or data.get("username", "Unknown User"),
+        "discriminator": data.get("discriminator", "0"),
+        "avatar_url": (
+            f"https://cdn.discordapp.com/avatars/{data['id']}/{avatar_hash}.png"
+            if avatar_hash
+            else f"https://cdn.discordapp.com/embed/avatars/{int(data['id']) % 5}.png"
+        ),
+    }
+
+
+def is_user_id(value: str) -> bool:
+    """True for a string that can be a Discord ID: ASCII digits that fit SQLite's signed 64-bit INTEGER."""
+    return value.isascii() and value.isdigit() and int(value) < 2**63
+
+
+class UserCache:
+    """Discord user lookups for the dashboard, cached in two tiers.
+
+    - Memory: LRU+TTL, checked first.
+    - The bot's `user_directory` table (in the warnings database), kept
+      current from gateway events; entries from it expire after `directory_ttl`
+      so renames show up quickly.
+    - SQLite (`USER_CACHE_DB`): survives restarts and is shared by workers,
+      read in one `IN (...)` query per batch. Only REST results land here.
+    - Unknown users (404) are cached negatively for `negative_ttl`.
+    - Concurrent lookups of the same ID share one REST request; bulk
+      lookups run with at most `concurrency` requests in flight.
+    Transient Discord errors are not cached.
+    """
+
+    def __init__(
+        self,
+        path: str = USER_CACHE_DB,
+        max_size: int = 5000,
+        ttl: float = 3600,
+        persistent_ttl: float = 86400,
+        negative_ttl: float = 600,
+        directory_ttl: float = 300,
+        concurrency: int = 5,
+    ) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.directory_ttl = directory_ttl
+        self.persistent_ttl = persistent_ttl
+        self.negative_ttl = negative_ttl
+        self.concurrency = concurrency
+
+        # user_id -> (expires_at, user dict or None for "does not exist")
+        self._cache: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[tuple[bool, dict | None]]] = {}
+        self._db: aiosqlite.Connection | None = None
+        self._open_lock = asyncio.Lock()
+
+        self.hits = 0
+        self.directory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.rest_calls = 0
+        self.errors = 0
+
+    # ---- bot's user_directory ----
+
+    async def _load_directory(self, user_ids: list[str]) -> dict[str, dict]:
+        user_ids = [uid for uid in user_ids if is_user_id(uid)]
+        if not user_ids:
+            return {}
+        placeholders = ",".join("?" * len(user_ids))
+        try:
+            async with get_warnings_db() as db:
+                cursor = await db.execute(
+                    f"SELECT id, name, global_name, avatar FROM user_directory WHERE id IN ({placeholders})",
+                    [int(uid) for uid in user_ids],
+                )
+                rows = await cursor.fetchall()
+        except sqlite3.OperationalError:
+            # The bot has not created the table yet
+            return {}
+        return {
+            str(r["id"]): user_to_dict(
+                {"id": str(r["id"]), "username": r["name"], "global_name": r["global_name"], "avatar": r["avatar"]}
+            )
+            for r in rows
+        }
+
+    # ---- persistent tier ----
+
+    async def _conn(self) -> aiosqlite.Connection:
+        async with self._open_lock:
+            if self._db is None:
+                db = await aiosqlite.connect(self.path)
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.execute("PRAGMA synchronous=NORMAL")
+                await db.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS discord_users (
+                        id TEXT PRIMARY KEY,
+                        data TEXT,
+                        fetched_at REAL NOT NULL
+                    )
+                    """
+                )
+                await db.commit()
+                self._db = db
+        return self._db
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def _load_persisted(self, user_ids: list[str]) -> dict[str, dict | None]:
+        db = await self._conn()
+        now = time.time()
+        found: dict[str, dict | None] = {}
+        placeholders = ",".join("?" * len(user_ids))
+        async with db.execute(
+            f"SELECT id, data, fetched_at FROM discord_users WHERE id IN ({placeholders})", user_ids
+        ) as cur:
+            for uid, data, fetched_at in await cur.fetchall():
+                ttl = self.persistent_ttl if data is not None else self.negative_ttl
+                if now - fetched_at < ttl:
+                    found[uid] = json.loads(data) if data is not None else None
+        return found
+
+    async def _persist(self, users: dict[str, dict | None]) -> None:
+        db = await self._conn()
+        now = time.time()
+        await db.executemany(
+            "INSERT OR REPLACE INTO discord_users (id, data, fetched_at) VALUES (?, ?, ?)",
+            [(uid, json.dumps(u) if u is not None else None, now) for uid, u in users.items()],
+        )
+        await db.commit()
+
+    # ---- memory tier ----
+
+    def _get_cached(self, user_id: str) -> tuple[bool, dict | None]:
+        entry = self._cache.get(user_id)
+        if entry is None:
+            return False, None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del self._cache[user_id]
+            return False, None
+        self._cache.move_to_end(user_id)
+        return True, user
+
+    def _store(self, user_id: str, user: dict | None, ttl: float | None = None) -> None:
+        if ttl is None:
+            ttl = self.ttl if user is not None else self.negative_ttl
+        self._cache[user_id] = (time.monotonic() + ttl, user)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    # ---- REST ----
+
+    async def _fetch(self, user_id: str) -> tuple[bool, dict | None]:
+        """Returns (cacheable, user)."""
+        self.rest_calls += 1
+        try:
+            resp = await discord_rest.get(f"/users/{user_id}")
+        except httpx.HTTPError:
+            self.errors += 1
+            return False, None
+        if resp.status_code == 404:
+            return True, None
+        if resp.status_code >= 400:
+            self.errors += 1
+            return False, None
+        return True, user_to_dict(resp.json())
+
+    async def _fetch_shared(self, user_id: str) -> tuple[bool, dict | None]:
+        pending = self._inflight.get(user_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[tuple[bool, dict | None]] = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = future
+        try:
+            cacheable, user = await self._fetch(user_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        else:
+            if cacheable:
+                self._store(user_id, user)
+            future.set_result((cacheable, user))
+        finally:
+            self._inflight.pop(user_id, None)
+        return cacheable, user
+
+    # ---- lookups ----
+
+    async def get_many(self, user_ids: Iterable[str]) -> dict[str, dict | None]:
+        """Resolves many IDs; unknown or unfetchable users map to None."""
+        result: dict[str, dict | None] = {}
+        missing: list[str] = []
+        for uid in dict.fromkeys(user_ids):
+            found, user = self._get_cached(uid)
+            if found:
+                self.hits += 1
+                result[uid] = user
+            else:
+                missing.append(uid)
+        if not missing:
+            return result
+
+        known = await self._load_directory(missing)
+        for uid, user in known.items():
+            self.directory_hits += 1
+            self._store(uid, user, self.directory_ttl)
+            result[uid] = user
+        missing = [uid for uid in missing if uid not in known]
+        if not missing:
+            return result
+
+        persisted = await self._load_persisted(missing)
+        for uid, user in persisted.items():
+            self.db_hits += 1
+            self._store(uid, user)
+            result[uid] = user
+        missing = [uid for uid in missing if uid not in persisted]
+        if not missing:
+            return result
+
+        self.misses += len(missing)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(uid: str) -> tuple[str, bool, dict | None]:
+            async with semaphore:
+                return (uid, *await self._fetch_shared(uid))
+
+        fetched = await asyncio.gather(*(one(uid) for uid in missing))
+        await self._persist({uid: user for uid, cacheable, user in fetched if cacheable})
+        result.update({uid: user for uid, _, user in fetched})
+        return result
+
+    async def get(self, user_id: str) -> dict | None:
+        return (await self.get_many([user_id]))[user_id]
+
+    def stats(self) -> dict[str, int | float]:
+        cached = self.hits + self.directory_hits + self.db_hits
+        lookups = cached + self.misses
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "directory_hits": self.directory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round(cached / lookups, 3) if lookups else 0.0,
+            "rest_calls": self.rest_calls,
+            "errors": self.errors,
+        }
+
+
+user_cache = UserCache()
@@ -1,5 +1,9 @@
 const BASE = "/api";
 
+// GET path -> { etag, data }; unchanged responses come back as a bodiless 304
+const _validators = new Map();
+const MAX_VALIDATORS = 200;
+
 function getToken() {
   return localStorage.getItem("vigila_token");
 }
@@ -8,6 +12,8 @@ async function request(method, path, body) {
   const token = getToken();
   const headers = { "Content-Type": "application/json" };
   if (token) headers["Authorization"] = `Bearer ${token}`;
+  const cached = method === "GET" ? _validators.get(path) : undefined;
+  if (cached) headers["If-None-Match"] = cached.etag;
 
   const resp = await fetch(`${BASE}${path}`, {
     method,
@@ -21,13 +27,22 @@ async function request(method, path, body) {
     throw new Error("Unauthorized");
   }
 
+  if (resp.status === 304 && cached) return structuredClone(cached.data);
+
   if (!resp.ok) {
     const err = await resp.json().catch(() => ({ detail: resp.statusText }));
     throw new Error(err.detail || `HTTP ${resp.status}`);
   }
 
   if (resp.status === 204) return null;
-  return resp.json();
+  const data = await resp.json();
+  const etag = method === "GET" && resp.headers.get("ETag");
+  if (etag) {
+    _validators.delete(path);
+    if (_validators.size >= MAX_VALIDATORS) _validators.delete(_validators.keys().next().value);
+    _validators.set(path, { etag, data: structuredClone(data) });
+  }
+  return data;
 }
 
 const get  = (path)        => request("GET",    path);
@@ -58,6 +73,7 @@ export const polls = {
   close:   (id)          => del(`/polls/${id}`),
   reopen:  (id)          => post(`/polls/${id}/reopen`),
   results: (id)          => get(`/polls/${id}/results`),
+  participants: (id, params = {}) => get(`/polls/${id}/participants?${new URLSearchParams(params)}`),
   stats:   ()            => get("/polls/stats"),
 };
 
@@ -80,10 +96,15 @@ export const auttaja = {
   update:      (id, body)           => put(`/auttaja/${id}`, body),
 };
 
+export const profile = {
+  get:        (userId, params = {}) => get(`/profile/${userId}?${new URLSearchParams(params)}`),
+};
+
 export const utility = {
   ping:        ()             => get("/utility/ping"),
   guild:       ()             => get("/utility/guild"),
   user:        (id)           => get(`/utility/discord/user/${id}`),
+  users:       (ids)          => get(`/utility/discord/users?ids=${ids.join(",")}`),
   channels:    (params = {})  => get(`/utility/channels?${new URLSearchParams(params)}`),
   roles:       ()             => get("/utility/roles"),
   members:     (params = {})  => get(`/utility/members?${new URLSearchParams(params)}`),
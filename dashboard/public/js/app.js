@@ -1,6 +1,7 @@
 import { consumeTokenFromHash, fetchCurrentUser, isLoggedIn, logout } from "./auth.js";
 import { initTheme, initThemePicker } from "./theme.js";
 import { initRouter, register } from "./router.js";
+import { startEvents } from "./events.js";
 import * as home      from "./pages/home.js";
 import * as warnings  from "./pages/warnings.js";
 import * as polls     from "./pages/polls.js";
@@ -124,6 +125,7 @@ function showApp(user) {
   initRouter();
   initModalClose();
   initSidebar();
+  startEvents();
 
   // Logout
   document.getElementById("logout-btn")?.addEventListener("click", async () => {
@@ -0,0 +1,69 @@
+// Live change feed from GET /api/events (Server-Sent Events).
+// Read with fetch rather than EventSource so the bearer token can be sent;
+// reconnects resume from the last event ID like EventSource would.
+
+const _listeners = new Map(); // event name -> Set<fn(data)>
+let _lastEventId = null;
+let _retryMs = 3000;
+let _started = false;
+
+export function subscribe(names, fn) {
+  for (const name of [].concat(names)) {
+    if (!_listeners.has(name)) _listeners.set(name, new Set());
+    _listeners.get(name).add(fn);
+  }
+  return () => { for (const name of [].concat(names)) _listeners.get(name)?.delete(fn); };
+}
+
+export function startEvents() {
+  if (_started) return;
+  _started = true;
+  connect();
+}
+
+function dispatch(block) {
+  let name = "message";
+  let data = "";
+  for (const line of block.split("\n")) {
+    if (line.startsWith(":")) continue;
+    const i = line.indexOf(":");
+    const field = i < 0 ? line : line.slice(0, i);
+    const value = i < 0 ? "" : line.slice(i + 1).replace(/^ /, "");
+    if (field === "id") _lastEventId = value;
+    else if (field === "event") name = value;
+    else if (field === "data") data += (data ? "\n" : "") + value;
+    else if (field === "retry" && /^\d+$/.test(value)) _retryMs = Number(value);
+  }
+  if (!data && name === "message") return;
+  let payload = {};
+  try { payload = data ? JSON.parse(data) : {}; } catch { return; }
+  _listeners.get(name)?.forEach((fn) => { try { fn(payload); } catch (e) { console.error(e); } });
+}
+
+async function connect() {
+  for (;;) {
+    const token = localStorage.getItem("vigila_token");
+    if (!token) return;
+    try {
+      const headers = { Authorization: `Bearer ${token}`, Accept: "text/event-stream" };
+      if (_lastEventId) headers["Last-Event-ID"] = _lastEventId;
+      const resp = await fetch("/api/events", { headers, cache: "no-store" });
+      if (resp.status === 401) return;
+      if (resp.ok && resp.body) {
+        const reader = resp.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value.replace(/\r\n?/g, "\n");
+          let end;
+          while ((end = buffer.indexOf("\n\n")) >= 0) {
+            dispatch(buffer.slice(0, end));
+            buffer = buffer.slice(end + 2);
+          }
+        }
+      }
+    } catch {}
+    await new Promise((resolve) => setTimeout(resolve, _retryMs));
+  }
+}
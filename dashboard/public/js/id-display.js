@@ -4,6 +4,10 @@ const COPY_SVG = `<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" str
 const CHECK_SVG = `<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round" aria-hidden="true"><polyline points="20 6 9 17 4 12"/></svg>`;
 
 const _nameCache = {};
+// uid -> Promise<username>, shared by overlapping resolveUserNames() calls
+const _pending = new Map();
+// The batch endpoint's per-request limit
+const USER_BATCH_SIZE = 100;
 
 function esc(s) {
   return String(s).replace(/&/g, "&amp;").replace(/</g, "&lt;").replace(/>/g, "&gt;").replace(/"/g, "&quot;");
@@ -47,29 +51,43 @@ export function setupCopyBtns(container) {
   });
 }
 
+function fetchNames(uids) {
+  for (let i = 0; i < uids.length; i += USER_BATCH_SIZE) {
+    const batch = uids.slice(i, i + USER_BATCH_SIZE);
+    const request = utility.users(batch).then((r) => r.users, () => ({}));
+    batch.forEach((uid) => {
+      const promise = request
+        .then((users) => {
+          const name = users[uid]?.username || "";
+          _nameCache[uid] = name;
+          return name;
+        })
+        .finally(() => _pending.delete(uid));
+      _pending.set(uid, promise);
+    });
+  }
+}
+
 export function resolveUserNames(container) {
   const els = container.querySelectorAll("[data-uid-name]");
-  const toFetch = new Map();
+  const waiting = new Map();
 
   els.forEach((el) => {
     const uid = el.dataset.uidName;
     if (uid in _nameCache) {
       if (_nameCache[uid]) el.textContent = _nameCache[uid];
     } else {
-      if (!toFetch.has(uid)) toFetch.set(uid, []);
-      toFetch.get(uid).push(el);
+      if (!waiting.has(uid)) waiting.set(uid, []);
+      waiting.get(uid).push(el);
     }
   });
 
-  Promise.allSettled(
-    [...toFetch.entries()].map(async ([uid, uidEls]) => {
-      try {
-        const u = await utility.user(uid);
-        _nameCache[uid] = u.username;
-        uidEls.forEach((el) => { if (el.isConnected) el.textContent = u.username; });
-      } catch {
-        _nameCache[uid] = "";
-      }
-    })
-  );
+  // One request per 100 names not already being looked up elsewhere
+  fetchNames([...waiting.keys()].filter((uid) => !_pending.has(uid)));
+
+  waiting.forEach((uidEls, uid) => {
+    _pending.get(uid)?.then((name) => {
+      if (name) uidEls.forEach((el) => { if (el.isConnected) el.textContent = name; });
+    });
+  });
 }
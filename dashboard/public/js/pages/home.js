@@ -1,5 +1,9 @@
 import { warnings as warnApi, polls as pollsApi, utility as utilApi } from "../api.js";
 import { copyBtnHtml, userIdHtml, setupCopyBtns, resolveUserNames } from "../id-display.js";
+import { subscribe } from "../events.js";
+
+let _unsubscribe = null;
+let _refreshTimer = null;
 
 export function render() {
   return `
@@ -19,6 +23,16 @@ export function render() {
 }
 
 export async function init() {
+  _unsubscribe?.();
+  _unsubscribe = subscribe(
+    ["warning.added", "warning.updated", "warning.deleted", "poll.votes", "poll.closed", "poll.reopened", "resync"],
+    () => {
+      if (!document.getElementById("stats-grid")) return;
+      clearTimeout(_refreshTimer);
+      _refreshTimer = setTimeout(init, 1000);
+    },
+  );
+
   const [warnStats, pollStats, guildInfo] = await Promise.allSettled([
     warnApi.stats(),
     pollsApi.stats(),
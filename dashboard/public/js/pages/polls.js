@@ -1,7 +1,10 @@
 import { polls as api } from "../api.js";
 import { toast, openModal, closeModal, confirmModal } from "../app.js";
+import { subscribe } from "../events.js";
 
 let _filter = "active";
+let _unsubscribe = null;
+let _refreshTimer = null;
 
 export function render() {
   return `
@@ -30,12 +33,23 @@ export async function init() {
 
   document.getElementById("create-poll-btn")?.addEventListener("click", openCreateModal);
   loadPolls();
+
+  _unsubscribe?.();
+  _unsubscribe = subscribe(["poll.votes", "poll.closed", "poll.reopened", "resync"], (data) => {
+    if (!document.getElementById("polls-grid")) return;
+    const results = document.getElementById("poll-results");
+    if (results && !results.closest(".hidden") && (data.poll_id === undefined || String(data.poll_id) === results.dataset.pollId)) {
+      renderResults(results.dataset.pollId);
+    }
+    clearTimeout(_refreshTimer);
+    _refreshTimer = setTimeout(() => loadPolls({ quiet: true }), 500);
+  });
 }
 
-async function loadPolls() {
+async function loadPolls({ quiet = false } = {}) {
   const grid = document.getElementById("polls-grid");
   if (!grid) return;
-  grid.innerHTML = '<div class="loader-wrap"><div class="loader"></div></div>';
+  if (!quiet) grid.innerHTML = '<div class="loader-wrap"><div class="loader"></div></div>';
   try {
     const data = await api.list({ filter: _filter, per_page: 50 });
     if (!data.items.length) {
@@ -161,8 +175,14 @@ async function openEditModal(id) {
 }
 
 async function openResultsModal(id) {
-  const modal = document.getElementById("modal-body");
-  openModal("Poll Results", '<div class="loader-wrap"><div class="loader"></div></div>');
+  openModal("Poll Results", `<div id="poll-results" data-poll-id="${escHtml(String(id))}"><div class="loader-wrap"><div class="loader"></div></div></div>`);
+  await renderResults(id);
+}
+
+// Also called on live vote events while the modal is open
+async function renderResults(id) {
+  const target = document.getElementById("poll-results");
+  if (!target) return;
   try {
     const data = await api.results(id);
     const { poll, options, total_votes } = data;
@@ -183,9 +203,9 @@ async function openResultsModal(id) {
             <div class="progress-bar-outer"><div class="progress-bar-inner" style="width:${o.percentage}%"></div></div>
           </div>`).join("")}
       </div>`;
-    document.getElementById("modal-body").innerHTML = html;
+    target.innerHTML = html;
   } catch (e) {
-    document.getElementById("modal-body").innerHTML = `<p class="text-muted">Error: ${e.message}</p>`;
+    target.innerHTML = `<p class="text-muted">Error: ${e.message}</p>`;
   }
 }
 
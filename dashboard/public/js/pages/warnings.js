@@ -1,8 +1,11 @@
 import { warnings as api } from "../api.js";
 import { toast, openModal, closeModal, confirmModal } from "../app.js";
 import { userIdHtml, setupCopyBtns, resolveUserNames } from "../id-display.js";
+import { subscribe } from "../events.js";
 
 let _state = { page: 1, per_page: 20, user_id: "", tab: "list", lb_mode: "offender" };
+let _unsubscribe = null;
+let _refreshTimer = null;
 
 export function render() {
   return `
@@ -23,6 +26,15 @@ export async function init() {
     });
   });
   renderTab();
+
+  _unsubscribe?.();
+  _unsubscribe = subscribe(["warning.added", "warning.updated", "warning.deleted", "resync"], () => {
+    const content = document.getElementById("warnings-content");
+    // Only the list refreshes itself, and not while someone is typing in it
+    if (!content || _state.tab !== "list" || content.contains(document.activeElement)) return;
+    clearTimeout(_refreshTimer);
+    _refreshTimer = setTimeout(() => renderList(content), 300);
+  });
 }
 
 async function renderTab() {
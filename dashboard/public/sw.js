@@ -1,4 +1,4 @@
-const CACHE = "vigila-v1";
+const CACHE = "vigila-v2";
 const SHELL = [
   "/",
   "/css/style.css",
@@ -7,6 +7,7 @@ const SHELL = [
   "/js/auth.js",
   "/js/theme.js",
   "/js/router.js",
+  "/js/events.js",
   "/js/pages/home.js",
   "/js/pages/warnings.js",
   "/js/pages/polls.js",
@@ -0,0 +1,65 @@
+-- Auttaja leaderboard and action breakdown aggregation.
+--
+-- Run this once in the Supabase SQL editor (or `psql`) against the project
+-- that holds `public.punishments`. The bot and dashboard call
+-- `auttaja_leaderboard` through PostgREST RPC so that the GROUP BY runs in
+-- Postgres and only one page of ranked rows crosses the network. Without
+-- it, both fall back to streaming the whole column in pages and counting
+-- locally, which is correct but slow on large tables.
+--
+-- The bot calls `auttaja_action_breakdown` for the per-action summary on
+-- `/auttaja offender` and `/auttaja punisher`; its `removed` column also
+-- gives the history's total, so no separate count request is made. Without it, it reads the
+-- user's `action` column and counts it instead. Actions are grouped
+-- case-insensitively, the same way in both paths and in the local mirror.
+
+create index if not exists idx_punishments_offender on public.punishments (offender);
+create index if not exists idx_punishments_punisher on public.punishments (punisher);
+
+create or replace function public.auttaja_leaderboard(
+    p_role            text,
+    p_include_removed boolean default true,
+    p_limit           integer default null,
+    p_offset          integer default 0
+)
+returns table (user_id text, count bigint, total_users bigint)
+language sql
+stable
+as $$
+    select ranked.user_id,
+           ranked.count,
+           count(*) over () as total_users
+    from (
+        select case when p_role = 'punisher' then punisher::text else offender::text end as user_id,
+               count(*) as count
+        from public.punishments
+        where p_role in ('offender', 'punisher')
+          -- `deleted` is nullable; NULL counts as not removed, as in the bot's queries
+          and (p_include_removed or deleted is not true)
+        group by 1
+    ) ranked
+    where ranked.user_id is not null and ranked.user_id <> ''
+    order by ranked.count desc, ranked.user_id
+    limit p_limit
+    offset p_offset;
+$$;
+
+-- The result columns changed (`removed` was added), which `create or replace` cannot do
+drop function if exists public.auttaja_action_breakdown(text, text);
+
+create or replace function public.auttaja_action_breakdown(
+    p_role    text,
+    p_user_id text
+)
+returns table (action text, count bigint, removed bigint)
+language sql
+stable
+as $$
+    select lower(coalesce(nullif(action, ''), 'unknown')) as action,
+           count(*) as count,
+           count(*) filter (where deleted is true) as removed
+    from public.punishments
+    where (p_role = 'offender' and offender::text = p_user_id)
+       or (p_role = 'punisher' and punisher::text = p_user_id)
+    group by 1;
+$$;
@@ -0,0 +1,99 @@
+"""The dashboard's Auttaja routes must not block the event loop while Supabase is slow.
+
+Runs the app in-process against the local PostgREST stand-in
+(tools/postgrest_stub.py) with a slow response, and checks that a
+/api/warnings request completes while an /api/auttaja request is still
+waiting on Supabase.
+
+    python -m pytest tests
+
+Requires the dashboard dependencies plus aiohttp (for the stub).
+"""
+import asyncio
+import os
+import sqlite3
+
+SUPABASE_LATENCY = 1.0
+
+
+def _set_env(tmp_path) -> None:
+    for name in ("DISCORD_CLIENT_ID", "DISCORD_CLIENT_SECRET", "DISCORD_REDIRECT_URI", "DISCORD_BOT_TOKEN"):
+        os.environ.setdefault(name, "test")
+    os.environ.setdefault("DISCORD_GUILD_ID", "1")
+    os.environ.setdefault("STAFF_ROLE_ID", "1")
+    os.environ.setdefault("JWT_SECRET", "test-secret")
+    for name, file in (
+        ("WARNINGS_DB_PATH", "warnings.db"),
+        ("POLLS_DB_PATH", "polls.db"),
+        ("TEMPLATES_DB_PATH", "templates.db"),
+        ("USER_CACHE_DB_PATH", "user_cache.db"),
+        ("AUTTAJA_MIRROR_DB_PATH", "auttaja_mirror.db"),
+    ):
+        os.environ[name] = str(tmp_path / file)
+
+    conn = sqlite3.connect(tmp_path / "warnings.db")
+    conn.execute(
+        """
+        CREATE TABLE verbal_warnings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            createdAt TEXT NOT NULL DEFAULT (datetime('now')),
+            userId INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            evidenceLink TEXT NOT NULL,
+            modId INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO verbal_warnings (userId, reason, evidenceLink, modId) VALUES (1, 'test', 'https://discord.com', 2)"
+    )
+    conn.commit()
+    conn.close()
+
+
+async def _overlap(monkeypatch) -> None:
+    import httpx
+
+    from dashboard.api.auth import create_token
+    from dashboard.api.main import app
+    from dashboard.api.routes import auttaja
+    from tools.postgrest_stub import PostgrestStub, create_database, seed
+
+    stub_db = create_database()
+    seed(stub_db, 200, users=20)
+    offender = stub_db.execute("SELECT offender FROM punishments LIMIT 1").fetchone()[0]
+    stub = PostgrestStub(stub_db, latency=SUPABASE_LATENCY)
+    url = await stub.start(port=0)
+    monkeypatch.setattr(auttaja, "SUPABASE_URL", url)
+    monkeypatch.setattr(auttaja, "SUPABASE_KEY", "stub.stub.stub")
+
+    headers = {"Authorization": f"Bearer {create_token('1', 'test', None)}"}
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+                slow = asyncio.create_task(client.get(f"/api/auttaja/offender/{offender}"))
+                # Wait until the Auttaja request is held up inside Supabase
+                while stub.requests == 0:
+                    await asyncio.sleep(0.01)
+
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                fast = await client.get("/api/warnings")
+                elapsed = loop.time() - started
+
+                assert fast.status_code == 200
+                assert fast.json()["total"] == 1
+                assert not slow.done(), "the /api/auttaja request finished before /api/warnings"
+                assert elapsed < SUPABASE_LATENCY / 2
+
+                response = await slow
+                assert response.status_code == 200
+                assert response.json()["punishments"]
+    finally:
+        await stub.stop()
+
+
+def test_warnings_complete_while_auttaja_waits_on_supabase(tmp_path, monkeypatch):
+    _set_env(tmp_path)
+    asyncio.run(_overlap(monkeypatch))
@@ -0,0 +1,167 @@
+"""Benchmarks the Auttaja read paths against the local PostgREST stub.
+
+Drives `AuttajaDB` (bot) and the dashboard's /api/auttaja routes in-process,
+with configurable per-request latency, and reports wall time, per-call
+percentiles and the number of REST round trips each scenario made.
+
+Usage:
+    python -m tools.bench_auttaja --rows 50000 --latency-ms 40 --concurrency 20
+
+Requires the bot and dashboard dependencies (discord.py, supabase, fastapi, httpx).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from tools.postgrest_stub import PostgrestStub, create_database, seed
+
+STUB_KEY = "stub.stub.stub"
+
+
+def _report(name: str, wall: float, timings: list[float], round_trips: int) -> None:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{name:<38} {len(timings):>4} calls  wall {wall * 1000:8.1f} ms  "
+        f"p50 {statistics.median(timings) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+        f"{round_trips:>5} round trips"
+    )
+
+
+async def _run(
+    stub: PostgrestStub, name: str, calls: list[Callable[[], Awaitable[object]]], concurrency: int
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: list[float] = []
+
+    async def one(call: Callable[[], Awaitable[object]]) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            timings.append(time.perf_counter() - started)
+
+    before = stub.requests
+    started = time.perf_counter()
+    await asyncio.gather(*(one(c) for c in calls))
+    _report(name, time.perf_counter() - started, timings, stub.requests - before)
+
+
+def _top_users(stub: PostgrestStub, role: str, n: int) -> list[str]:
+    rows = stub.conn.execute(
+        f"SELECT {role} FROM punishments GROUP BY {role} ORDER BY COUNT(*) DESC LIMIT ?", (n,)
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+# ===== BOT =====
+
+
+async def bench_bot(stub: PostgrestStub, url: str, users: list[str], concurrency: int) -> None:
+    from bot.cogs.auttaja import AuttajaDB
+
+    db = AuttajaDB(url=url, key=STUB_KEY)
+    await db.connect()
+
+    async def lookup(user_id: str) -> None:
+        # Same fetches /auttaja offender makes before showing page 1
+        stream = db.iter_punishments("offender", user_id, include_removed=False)
+        await asyncio.gather(db.action_summary(user_id, "offender"), anext(stream, []))
+        await stream.aclose()
+
+    print("\n-- AuttajaDB --")
+    await _run(stub, "offender lookup (cold)", [lambda u=u: lookup(u) for u in users], concurrency)
+    await _run(stub, "offender lookup (cached)", [lambda u=u: lookup(u) for u in users], concurrency)
+
+    db.cache.invalidate(lambda key: True)
+    hot = users[0]
+    await _run(stub, "same offender x N (coalesced)", [lambda: lookup(hot) for _ in users], concurrency)
+
+    async def leaderboard() -> None:
+        # First page, as /auttaja lb shows it
+        db.cache.invalidate(lambda key: key[0] == "leaderboard")
+        await db.leaderboard("offender", limit=10)
+
+    stub.rpc_enabled = True
+    db._missing_rpcs.clear()
+    await _run(stub, "leaderboard (RPC)", [leaderboard for _ in range(5)], 1)
+    stub.rpc_enabled = False
+    await _run(stub, "leaderboard (paged scan fallback)", [leaderboard for _ in range(5)], 1)
+    stub.rpc_enabled = True
+
+    print(f"cache: {db.cache.stats()}")
+    print(f"breaker: {db.breaker.stats()}")
+
+
+# ===== DASHBOARD =====
+
+
+async def bench_dashboard(stub: PostgrestStub, url: str, users: list[str], concurrency: int) -> None:
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = STUB_KEY
+    for name in ("DISCORD_CLIENT_ID", "DISCORD_CLIENT_SECRET", "DISCORD_REDIRECT_URI", "DISCORD_BOT_TOKEN"):
+        os.environ.setdefault(name, "bench")
+    os.environ.setdefault("DISCORD_GUILD_ID", "1")
+    os.environ.setdefault("STAFF_ROLE_ID", "1")
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+    import httpx
+
+    from dashboard.api.auth import create_token
+    from dashboard.api.main import app
+    from dashboard.api.routes import auttaja
+
+    await auttaja.open_supabase()
+    headers = {"Authorization": f"Bearer {create_token('1', 'bench', None)}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://dashboard", headers=headers) as client:
+
+        async def get(path: str) -> None:
+            response = await client.get(path)
+            response.raise_for_status()
+
+        print("\n-- dashboard /api/auttaja --")
+        await _run(stub, "GET /offender/{id}", [lambda u=u: get(f"/api/auttaja/offender/{u}") for u in users], concurrency)
+        await _run(stub, "GET /leaderboard", [lambda: get("/api/auttaja/leaderboard?mode=offender") for _ in range(10)], concurrency)
+        # With a non-blocking client, wall time stays near one request's latency
+        await _run(stub, "GET /offender/{id} (all at once)", [lambda u=u: get(f"/api/auttaja/offender/{u}") for u in users], len(users))
+    await auttaja.close_supabase()
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    conn = create_database()
+    seed(conn, args.rows)
+    stub = PostgrestStub(conn, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000)
+    url = await stub.start(port=0)
+    users = _top_users(stub, "offender", args.users)
+    print(
+        f"stub {url}: {args.rows} punishments, {args.latency_ms:.0f}+{args.jitter_ms:.0f} ms latency, "
+        f"{len(users)} offenders, concurrency {args.concurrency}"
+    )
+    try:
+        if not args.skip_bot:
+            await bench_bot(stub, url, users, args.concurrency)
+        if not args.skip_dashboard:
+            await bench_dashboard(stub, url, users, args.concurrency)
+    finally:
+        await stub.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=50, help="Distinct offenders to look up")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--skip-bot", action="store_true")
+    parser.add_argument("--skip-dashboard", action="store_true")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
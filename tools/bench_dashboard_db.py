@@ -0,0 +1,160 @@
+"""Benchmarks per-request SQLite overhead in the dashboard API.
+
+Compares the old pattern (open an aiosqlite connection, run three PRAGMAs,
+query, close) with borrowing a warm connection from `SQLitePool`, for a
+point read, a one-page list read and a single-row insert.
+
+Usage:
+    python -m tools.bench_dashboard_db --rows 20000 --requests 2000 --concurrency 20
+
+Requires the dashboard dependencies (fastapi, aiosqlite, python-dotenv).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, Callable
+
+import aiosqlite
+
+Acquire = Callable[[bool], AsyncContextManager[aiosqlite.Connection]]
+
+
+def _create_database(path: str, rows: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """
+        CREATE TABLE verbal_warnings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            createdAt TEXT NOT NULL DEFAULT (datetime('now')),
+            userId INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            evidenceLink TEXT NOT NULL,
+            modId INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX idx_vw_userId ON verbal_warnings(userId)")
+    rng = random.Random(42)
+    conn.executemany(
+        "INSERT INTO verbal_warnings (userId, reason, evidenceLink, modId) VALUES (?, ?, ?, ?)",
+        [
+            (rng.randrange(1, 2000), f"reason {i}", "https://discord.com/channels/1/2/3", rng.randrange(1, 40))
+            for i in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _connect_per_request(path: str) -> Acquire:
+    """The dashboard's previous `get_warnings_db()`."""
+
+    @asynccontextmanager
+    async def acquire(write: bool):
+        async with aiosqlite.connect(path) as db:
+            db.row_factory = aiosqlite.Row
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute("PRAGMA foreign_keys=ON")
+            await db.execute("PRAGMA synchronous=NORMAL")
+            yield db
+
+    return acquire
+
+
+def _pooled(pool) -> Acquire:
+    def acquire(write: bool):
+        return pool.write() if write else pool.read()
+
+    return acquire
+
+
+async def _point_read(acquire: Acquire, rows: int) -> None:
+    async with acquire(False) as db:
+        cursor = await db.execute("SELECT * FROM verbal_warnings WHERE id = ?", (random.randrange(1, rows),))
+        await cursor.fetchone()
+
+
+async def _list_page(acquire: Acquire, rows: int) -> None:
+    async with acquire(False) as db:
+        cursor = await db.execute(
+            "SELECT * FROM verbal_warnings ORDER BY id DESC LIMIT ? OFFSET ?", (21, random.randrange(0, 200) * 20)
+        )
+        await cursor.fetchall()
+
+
+async def _insert(acquire: Acquire, rows: int) -> None:
+    async with acquire(True) as db:
+        await db.execute(
+            "INSERT INTO verbal_warnings (userId, reason, evidenceLink, modId) VALUES (?, ?, ?, ?)",
+            (1, "bench", "https://discord.com/channels/1/2/3", 1),
+        )
+        await db.commit()
+
+
+async def _run(name: str, acquire: Acquire, op, rows: int, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await op(acquire, rows)
+            timings.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    wall = time.perf_counter() - started
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{name:<28} {requests / wall:8.0f} req/s  "
+        f"p50 {statistics.median(timings) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms"
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    for name in ("DISCORD_CLIENT_ID", "DISCORD_CLIENT_SECRET", "DISCORD_REDIRECT_URI", "DISCORD_BOT_TOKEN"):
+        os.environ.setdefault(name, "bench")
+    os.environ.setdefault("DISCORD_GUILD_ID", "1")
+    os.environ.setdefault("STAFF_ROLE_ID", "1")
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    from dashboard.api.database import SQLitePool
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "warnings.db")
+        _create_database(path, args.rows)
+        pool = SQLitePool(path, size=args.pool_size)
+        await pool.open()
+        print(
+            f"{args.rows} warnings, {args.requests} requests per scenario, "
+            f"concurrency {args.concurrency}, pool size {args.pool_size}"
+        )
+        try:
+            for label, op in (("point read", _point_read), ("list page", _list_page), ("insert", _insert)):
+                print(f"\n-- {label} --")
+                await _run("connect per request", _connect_per_request(path), op, args.rows, args.requests, args.concurrency)
+                await _run("pooled", _pooled(pool), op, args.rows, args.requests, args.concurrency)
+        finally:
+            await pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=4)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
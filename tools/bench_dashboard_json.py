@@ -0,0 +1,212 @@
+"""Benchmarks JSON serialisation and compression in the dashboard API.
+
+For a page of `/api/warnings` and for `/api/polls/{id}/results`:
+
+- serialisation alone: `dict(row)` + FastAPI's encoder + `json.dumps` (the
+  previous path) against orjson, and against rows encoded by SQLite's
+  `json_object` and spliced in with `RawRows`;
+- whole requests through the app (in-process, no network): CPU time per
+  request and bytes on the wire for identity, gzip and brotli.
+
+Usage:
+    python -m tools.bench_dashboard_json --rows 20000 --per-page 100 --requests 500
+
+Requires the dashboard dependencies (fastapi, aiosqlite, httpx, python-dotenv);
+orjson and brotli are measured when installed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Callable
+
+
+def _create_databases(tmp: str, rows: int, voters: int) -> None:
+    conn = sqlite3.connect(os.path.join(tmp, "warnings.db"))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """
+        CREATE TABLE verbal_warnings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            createdAt TEXT NOT NULL DEFAULT (datetime('now')),
+            userId INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            evidenceLink TEXT NOT NULL,
+            modId INTEGER NOT NULL
+        )
+        """
+    )
+    rng = random.Random(42)
+    conn.executemany(
+        "INSERT INTO verbal_warnings (userId, reason, evidenceLink, modId) VALUES (?, ?, ?, ?)",
+        [
+            (
+                rng.randrange(10**17, 10**18),
+                f"Reminder about rule {rng.randrange(1, 12)} after report {i}",
+                f"https://discord.com/channels/1/2/{rng.randrange(10**17, 10**18)}",
+                rng.randrange(10**17, 10**18),
+            )
+            for i in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(os.path.join(tmp, "polls.db"))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE staffpoll_polls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL DEFAULT (datetime('now')),
+            created_by INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL DEFAULT 0,
+            message_id INTEGER NOT NULL DEFAULT 0,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            is_anonymous INTEGER NOT NULL DEFAULT 0,
+            max_votes INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE staffpoll_options (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            poll_id INTEGER NOT NULL REFERENCES staffpoll_polls(id) ON DELETE CASCADE,
+            label TEXT NOT NULL,
+            display_order INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE staffpoll_votes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            poll_id INTEGER NOT NULL REFERENCES staffpoll_polls(id) ON DELETE CASCADE,
+            option_id INTEGER NOT NULL REFERENCES staffpoll_options(id) ON DELETE CASCADE,
+            user_id INTEGER NOT NULL,
+            voted_at TEXT NOT NULL DEFAULT (datetime('now')),
+            UNIQUE(poll_id, user_id)
+        );
+        CREATE INDEX idx_sv_poll_option ON staffpoll_votes(poll_id, option_id);
+        """
+    )
+    conn.execute(
+        "INSERT INTO staffpoll_polls (title, description, created_by) VALUES (?, ?, ?)",
+        ("Which event should we run next month?", "Pick the one you would help staff.", 1),
+    )
+    conn.executemany(
+        "INSERT INTO staffpoll_options (poll_id, label, display_order) VALUES (1, ?, ?)",
+        [(f"Option {i + 1}", i) for i in range(8)],
+    )
+    conn.executemany(
+        "INSERT INTO staffpoll_votes (poll_id, option_id, user_id) VALUES (1, ?, ?)",
+        [(rng.randrange(1, 9), 10**17 + u) for u in range(voters)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _cpu_per_call(fn: Callable[[], object], calls: int) -> float:
+    """Microseconds of CPU per call."""
+    started = time.process_time()
+    for _ in range(calls):
+        fn()
+    return (time.process_time() - started) / calls * 1e6
+
+
+def _bench_serialisation(tmp: str, per_page: int, calls: int) -> None:
+    from fastapi.encoders import jsonable_encoder
+
+    from dashboard.api.responses import _ORJSON, JSONResponse, RawRows, dumps, json_object_sql
+
+    conn = sqlite3.connect(os.path.join(tmp, "warnings.db"))
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM verbal_warnings ORDER BY id DESC LIMIT ?", (per_page,)).fetchall()
+    row_json = json_object_sql(("id", "createdAt", "userId", "reason", "evidenceLink", "modId"))
+    encoded = [r[0] for r in conn.execute(
+        f"SELECT {row_json} FROM verbal_warnings ORDER BY id DESC LIMIT ?", (per_page,)
+    )]
+    conn.close()
+
+    def page(items) -> dict:
+        return {"total": 20000, "page": 1, "per_page": per_page, "pages": 200, "items": items, "next_cursor": None}
+
+    def stdlib() -> bytes:
+        content = jsonable_encoder(page([dict(r) for r in rows]))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    def fast_dicts() -> bytes:
+        return dumps(page([dict(r) for r in rows]))
+
+    def raw_rows() -> bytes:
+        return JSONResponse(page(RawRows(encoded))).body
+
+    assert json.loads(stdlib()) == json.loads(raw_rows())
+    print(f"-- serialising one page of {per_page} warnings (CPU per call) --")
+    print(f"{'dict(row) + jsonable_encoder + json':<40} {_cpu_per_call(stdlib, calls):8.1f} us")
+    encoder = "orjson" if _ORJSON else "json (orjson not installed)"
+    print(f"{'dict(row) + ' + encoder:<40} {_cpu_per_call(fast_dicts, calls):8.1f} us")
+    print(f"{'json_object rows + RawRows':<40} {_cpu_per_call(raw_rows, calls):8.1f} us")
+    print("  (json_object rows are built by SQLite while stepping the query, not counted here)")
+
+
+async def _bench_requests(per_page: int, requests: int) -> None:
+    import httpx
+
+    from dashboard.api.auth import create_token
+    from dashboard.api.compression import _BROTLI
+    from dashboard.api.main import app
+
+    headers = {"Authorization": f"Bearer {create_token('1', 'bench', None)}"}
+    encodings = ["identity", "gzip"] + (["br"] if _BROTLI else [])
+    paths = (f"/api/warnings?per_page={per_page}", "/api/polls/1/results")
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"\n-- whole requests, {requests} each (in-process) --")
+            for path in paths:
+                print(path)
+                for encoding in encodings:
+                    request_headers = {**headers, "Accept-Encoding": encoding}
+                    # Raw bytes as sent, before httpx decodes them
+                    async with client.stream("GET", path, headers=request_headers) as resp:
+                        wire = b"".join([chunk async for chunk in resp.aiter_raw()])
+                    started = time.process_time()
+                    for _ in range(requests):
+                        await client.get(path, headers=request_headers)
+                    cpu = (time.process_time() - started) / requests * 1000
+                    print(f"  {encoding:<10} {len(wire):8d} bytes  {cpu:7.3f} ms CPU/request")
+    if not _BROTLI:
+        print("(brotli not installed: br not measured)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--voters", type=int, default=300)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("DISCORD_CLIENT_ID", "DISCORD_CLIENT_SECRET", "DISCORD_REDIRECT_URI", "DISCORD_BOT_TOKEN"):
+            os.environ.setdefault(name, "bench")
+        os.environ.setdefault("DISCORD_GUILD_ID", "1")
+        os.environ.setdefault("STAFF_ROLE_ID", "1")
+        os.environ.setdefault("JWT_SECRET", "bench-secret")
+        os.environ["WARNINGS_DB_PATH"] = os.path.join(tmp, "warnings.db")
+        os.environ["POLLS_DB_PATH"] = os.path.join(tmp, "polls.db")
+        os.environ["TEMPLATES_DB_PATH"] = os.path.join(tmp, "templates.db")
+        os.environ["USER_CACHE_DB_PATH"] = os.path.join(tmp, "user_cache.db")
+
+        _create_databases(tmp, args.rows, args.voters)
+        print(f"{args.rows} warnings, poll with 8 options and {args.voters} votes\n")
+        _bench_serialisation(tmp, args.per_page, args.calls)
+        asyncio.run(_bench_requests(args.per_page, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""Local stand-in for the Supabase REST API, for load tests and benchmarks.
+
+Implements the slice of PostgREST that `AuttajaDB` and the dashboard's
+auttaja routes use, backed by SQLite and seeded with synthetic punishments:
+
+- GET/HEAD /rest/v1/punishments  — select, eq/neq/gt/gte/lt/lte/is/in filters,
+  or=(...), order, limit/offset or Range headers, Prefer: count=exact
+- PATCH /rest/v1/punishments     — update with filters, Prefer: return=representation
+- POST /rest/v1/rpc/auttaja_leaderboard and /rpc/auttaja_action_breakdown —
+  same contracts as supabase/auttaja_leaderboard.sql
+
+Usage:
+    python -m tools.postgrest_stub --rows 50000 --latency-ms 40 --jitter-ms 20
+
+Then point the bot or dashboard at it:
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_KEY=stub.stub.stub
+
+Requires aiohttp (installed with discord.py).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import time
+
+from aiohttp import web
+
+TABLE = "punishments"
+
+# column -> SQLite type
+COLUMNS: dict[str, str] = {
+    "id": "INTEGER PRIMARY KEY",
+    "guild_id": "TEXT",
+    "offender": "TEXT",
+    "punisher": "TEXT",
+    "reason": "TEXT",
+    "action": "TEXT",
+    "timestamp": "REAL",
+    "duration": "INTEGER",
+    "deleted": "INTEGER",
+    "removed_by": "TEXT",
+    "removed_reason": "TEXT",
+    "resolve": "TEXT",
+}
+BOOL_COLUMNS = {"deleted"}
+
+_OPS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+# Query parameters that are not column filters
+_RESERVED = {"select", "order", "limit", "offset", "or", "columns", "on_conflict"}
+
+ACTIONS = [("warn", 50), ("mute", 25), ("kick", 10), ("tempban", 7), ("ban", 6), ("softban", 2)]
+
+
+class PostgrestError(Exception):
+    def __init__(self, status: int, code: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+# ===== SEEDING =====
+
+
+def create_database(path: str = ":memory:") -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    columns = ", ".join(f"{name} {kind}" for name, kind in COLUMNS.items())
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} ({columns})")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_stub_offender ON {TABLE}(offender)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_stub_punisher ON {TABLE}(punisher)")
+    return conn
+
+
+def seed(conn: sqlite3.Connection, rows: int, users: int = 5000, punishers: int = 40, rng_seed: int = 0) -> None:
+    """Inserts `rows` synthetic punishments with a long-tailed offender distribution."""
+    rng = random.Random(rng_seed)
+    offenders = [str(10**17 + i) for i in range(users)]
+    # Heavier weight on a few repeat offenders, like real moderation data
+    weights = [1 / (i + 1) ** 0.8 for i in range(users)]
+    staff = [str(2 * 10**17 + i) for i in range(punishers)]
+    actions, action_weights = zip(*ACTIONS)
+    now = time.time()
+
+    batch = []
+    for i in range(1, rows + 1):
+        action = rng.choices(actions, action_weights)[0]
+        deleted = rng.random() < 0.05
+        batch.append((
+            i,
+            "1",
+            rng.choices(offenders, weights)[0],
+            rng.choice(staff),
+            f"Synthetic reason #{i}",
+            action,
+            now - rng.uniform(0, 5 * 365 * 86400),
+            rng.choice([600, 3600, 86400]) if action in ("mute", "tempban") else 0,
+            int(deleted),
+            rng.choice(staff) if deleted else None,
+            "Appealed" if deleted else None,
+            None,
+        ))
+    placeholders = ", ".join("?" for _ in COLUMNS)
+    conn.executemany(f"INSERT OR REPLACE INTO {TABLE} VALUES ({placeholders})", batch)
+    conn.commit()
+
+
+# ===== QUERY TRANSLATION =====
+
+
+def _column(name: str) -> str:
+    if name not in COLUMNS:
+        raise PostgrestError(400, "42703", f"column {TABLE}.{name} does not exist")
+    return name
+
+
+def _coerce(column: str, value: str) -> object:
+    if column in BOOL_COLUMNS and value in ("true", "false"):
+        return int(value == "true")
+    return value
+
+
+def _condition(column: str, expr: str) -> tuple[str, list[object]]:
+    column = _column(column)
+    op, _, value = expr.partition(".")
+    negate = op == "not"
+    if negate:
+        op, _, value = value.partition(".")
+
+    if op in _OPS:
+        sql, params = f"{column} {_OPS[op]} ?", [_coerce(column, value)]
+    elif op == "is":
+        literal = {"null": "NULL", "true": "1", "false": "0"}.get(value)
+        if literal is None:
+            raise PostgrestError(400, "PGRST100", f"invalid is. value: {value}")
+        sql, params = f"{column} IS {literal}", []
+    elif op == "in":
+        items = [v.strip('"') for v in value.strip("()").split(",") if v]
+        sql = f"{column} IN ({', '.join('?' for _ in items)})"
+        params = [_coerce(column, v) for v in items]
+    else:
+        raise PostgrestError(400, "PGRST100", f"unsupported operator: {op}")
+    return (f"NOT ({sql})" if negate else sql), params
+
+
+def _where(query: list[tuple[str, str]]) -> tuple[str, list[object]]:
+    clauses: list[str] = []
+    params: list[object] = []
+    for key, value in query:
+        if key == "or":
+            parts = []
+            for item in value.strip("()").split(","):
+                column, _, expr = item.partition(".")
+                sql, p = _condition(column, expr)
+                parts.append(sql)
+                params.extend(p)
+            clauses.append(f"({' OR '.join(parts)})")
+        elif key not in _RESERVED:
+            sql, p = _condition(key, value)
+            clauses.append(sql)
+            params.extend(p)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _order(query: list[tuple[str, str]]) -> str:
+    terms = []
+    for key, value in query:
+        if key != "order":
+            continue
+        for term in value.split(","):
+            column, *mods = term.split(".")
+            sql = _column(column)
+            if "desc" in mods:
+                sql += " DESC"
+            if "nullsfirst" in mods:
+                sql += " NULLS FIRST"
+            elif "nullslast" in mods:
+                sql += " NULLS LAST"
+            terms.append(sql)
+    return (" ORDER BY " + ", ".join(terms)) if terms else ""
+
+
+def _window(request: web.Request) -> tuple[int | None, int]:
+    """(limit, offset) from query params or a `Range: a-b` header."""
+    limit = request.query.get("limit")
+    offset = int(request.query.get("offset", 0))
+    range_header = request.headers.get("Range")
+    if range_header and "-" in range_header:
+        start, _, end = range_header.partition("-")
+        offset = int(start)
+        if end:
+            limit = str(int(end) - offset + 1)
+    return (int(limit) if limit is not None else None), offset
+
+
+def _prefer(request: web.Request) -> set[str]:
+    return {p.strip() for p in request.headers.get("Prefer", "").split(",") if p.strip()}
+
+
+def _to_json(row: sqlite3.Row) -> dict:
+    out = dict(row)
+    for column in BOOL_COLUMNS & out.keys():
+        if out[column] is not None:
+            out[column] = bool(out[column])
+    return out
+
+
+# ===== SERVER =====
+
+
+class PostgrestStub:
+    """aiohttp app serving the PostgREST subset above. Every request waits `latency` (+ jitter) seconds."""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rpc_enabled: bool = True,
+        max_rows: int = 1000,
+    ) -> None:
+        self.conn = conn
+        self.latency = latency
+        self.jitter = jitter
+        self.rpc_enabled = rpc_enabled
+        self.max_rows = max_rows
+        self.requests = 0
+        self._runner: web.AppRunner | None = None
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_route("GET", f"/rest/v1/{TABLE}", self.select)
+        self.app.router.add_route("HEAD", f"/rest/v1/{TABLE}", self.select)
+        self.app.router.add_route("PATCH", f"/rest/v1/{TABLE}", self.update)
+        self.app.router.add_route("POST", "/rest/v1/rpc/{name}", self.rpc)
+        self.app.router.add_route("GET", "/__stub/stats", self.stats)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if not request.path.startswith("/__stub"):
+            self.requests += 1
+            delay = self.latency + random.uniform(0, self.jitter)
+            if delay:
+                await asyncio.sleep(delay)
+        try:
+            return await handler(request)
+        except PostgrestError as exc:
+            return web.json_response(
+                {"code": exc.code, "message": exc.message, "details": None, "hint": None},
+                status=exc.status,
+            )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 54321) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ---- handlers ----
+
+    async def select(self, request: web.Request) -> web.Response:
+        query = list(request.query.items())
+        columns = request.query.get("select", "*")
+        select_sql = "*" if columns == "*" else ", ".join(_column(c) for c in columns.split(","))
+        where, params = _where(query)
+        limit, offset = _window(request)
+        limit = self.max_rows if limit is None else min(limit, self.max_rows)
+
+        headers = {}
+        if "count=exact" in _prefer(request):
+            (total,) = self.conn.execute(f"SELECT COUNT(*) FROM {TABLE}{where}", params).fetchone()
+        else:
+            total = None
+
+        if request.method == "HEAD":
+            headers["Content-Range"] = f"*/{total if total is not None else '*'}"
+            return web.Response(status=200, headers=headers)
+
+        rows = self.conn.execute(
+            f"SELECT {select_sql} FROM {TABLE}{where}{_order(query)} LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        ).fetchall()
+        end = offset + len(rows) - 1
+        span = f"{offset}-{end}" if rows else "*"
+        headers["Content-Range"] = f"{span}/{total if total is not None else '*'}"
+        return web.json_response([_to_json(r) for r in rows], headers=headers)
+
+    async def update(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        assignments = ", ".join(f"{_column(c)} = ?" for c in body)
+        where, params = _where(list(request.query.items()))
+        if not where:
+            raise PostgrestError(400, "21000", "UPDATE requires a WHERE clause")
+
+        ids = [r["id"] for r in self.conn.execute(f"SELECT id FROM {TABLE}{where}", params)]
+        self.conn.execute(f"UPDATE {TABLE} SET {assignments}{where}", [*body.values(), *params])
+        self.conn.commit()
+
+        if "return=representation" not in _prefer(request):
+            return web.Response(status=204)
+        rows = self.conn.execute(
+            f"SELECT * FROM {TABLE} WHERE id IN ({', '.join('?' for _ in ids)})", ids
+        ).fetchall()
+        return web.json_response([_to_json(r) for r in rows])
+
+    async def rpc(self, request: web.Request) -> web.Response:
+        name = request.match_info["name"]
+        if name not in ("auttaja_leaderboard", "auttaja_action_breakdown") or not self.rpc_enabled:
+            raise PostgrestError(404, "PGRST202", f"Could not find the function public.{name}")
+        args = await request.json()
+        role = args.get("p_role")
+        if role not in ("offender", "punisher"):
+            return web.json_response([])
+        if name == "auttaja_action_breakdown":
+            rows = self.conn.execute(
+                f"SELECT LOWER(COALESCE(NULLIF(action, ''), 'unknown')) AS action, COUNT(*) AS count, "
+                f"SUM(deleted IS 1) AS removed "
+                f"FROM {TABLE} WHERE {role} = ? GROUP BY 1",
+                (str(args.get("p_user_id")),),
+            ).fetchall()
+            return web.json_response([dict(r) for r in rows])
+        removed = "" if args.get("p_include_removed", True) else " AND deleted IS NOT 1"
+        limit = args.get("p_limit")
+        rows = self.conn.execute(
+            f"""
+            SELECT user_id, count, COUNT(*) OVER () AS total_users FROM (
+                SELECT {role} AS user_id, COUNT(*) AS count FROM {TABLE}
+                WHERE {role} IS NOT NULL AND {role} != ''{removed}
+                GROUP BY {role}
+            )
+            ORDER BY count DESC, user_id LIMIT ? OFFSET ?
+            """,
+            (-1 if limit is None else limit, args.get("p_offset", 0)),
+        ).fetchall()
+        return web.json_response([dict(r) for r in rows])
+
+    async def stats(self, request: web.Request) -> web.Response:
+        (rows,) = self.conn.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()
+        return web.json_response({"requests": self.requests, "rows": rows})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--db", default=":memory:", help="SQLite path (default: in-memory)")
+    parser.add_argument("--rows", type=int, default=20000, help="Synthetic punishments to seed")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency, 0..N ms")
+    parser.add_argument("--no-rpc", action="store_true", help="Answer the leaderboard RPC with PGRST202")
+    args = parser.parse_args()
+
+    conn = create_database(args.db)
+    (existing,) = conn.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()
+    if existing < args.rows:
+        seed(conn, args.rows)
+
+    stub = PostgrestStub(
+        conn,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        rpc_enabled=not args.no_rpc,
+    )
+
+    async def run() -> None:
+        url = await stub.start(args.host, args.port)
+        print(f"PostgREST stub on {url} ({max(existing, args.rows)} punishments)")
+        print(f"  SUPABASE_URL={url} SUPABASE_KEY=stub.stub.stub")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()